@@ -1,13 +1,88 @@
 from bs4 import BeautifulSoup
+import time
 import urllib3
 from tabulate import tabulate
+import history_db
 import monitor
+import report
 import argparse
+import sys
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+def select_new_builds(build_list,seen):
+    '''
+    Picks the builds of a listing which were not analysed by an earlier poll.
+
+    Parameter:
+        build_list (list): Finished builds of today on a CI, or the error message of the listing.
+        seen (set): Builds of the CI analysed by the earlier polls, replaced by the builds of build_list.
+
+    Returns:
+        list: Builds to analyse, the error message of the listing as it is.
+    '''
+    if isinstance(build_list,str):
+        return build_list
+    # Pending builds are not listed, a build shows up once it has finished.
+    new_builds = [build for build in build_list if build not in seen]
+    # Only the builds of today are kept, so the state does not grow across days.
+    seen.clear()
+    seen.update(build_list)
+    return new_builds
+
+def get_ci_brief_delta(ci_name,ci_link,zone,job_filter,seen):
+    '''
+    Gets brief information of the builds of today on a CI which finished since the last poll.
+    '''
+    build_list = select_new_builds(monitor.get_jobs(ci_link),seen[ci_name])
+    return monitor.get_brief_job_info(build_list,ci_name,zone=zone,job_filter=job_filter)
+
+def print_ci_detailed_delta(ci_name,ci_link,zone,job_filter,seen):
+    '''
+    Prints detailed information of the builds of today on a CI which finished since the last poll.
+    '''
+    build_list = select_new_builds(monitor.get_jobs(ci_link),seen[ci_name])
+    monitor.get_detailed_job_info(build_list,ci_name,zone=zone,job_filter=job_filter)
+
+def watch(config_data,info_type,zone,job_filter,interval):
+    '''
+    Polls the job history of the CIs every interval seconds and reports the builds which finished since the last poll.
+
+    The first poll reports all the builds of today. Only the listings are fetched again on
+    every poll, the builds reported by an earlier poll are not analysed again. With --listing gcs
+    the listing of a CI also reads prowjob.json of its builds of today, the running ones are
+    fetched again on every poll, the finished ones come from the on-disk artifact cache.
+
+    Parameter:
+        config_data (dict): CI names and links.
+        info_type (string): brief or detailed.
+        zone (list): Zones/leases the builds are filtered with.
+        job_filter (string): Job install status the builds are filtered with.
+        interval (int): Seconds between the start of two polls.
+    '''
+    seen = {ci_name: set() for ci_name in config_data}
+    try:
+        while True:
+            poll_start = time.monotonic()
+            # Listings and running builds change between polls, finished builds are read from the on-disk cache.
+            monitor.clear_run_caches()
+            print("=================== Builds finished as of {} ===================".format(monitor.get_current_date().strftime("%Y-%m-%d %H:%M:%S")))
+            if info_type == "brief":
+                summary_list = []
+                for ci_summary_list in monitor.run_for_each_ci(config_data,get_ci_brief_delta,zone,job_filter,seen):
+                    summary_list.extend(ci_summary_list)
+                if len(summary_list)==0:
+                    print("No new builds")
+                else:
+                    print(tabulate(summary_list, headers='keys', tablefmt="pipe", stralign='left'))
+            elif info_type == "detailed":
+                monitor.run_for_each_ci(config_data,print_ci_detailed_delta,zone,job_filter,seen)
+            sys.stdout.flush()
+            time.sleep(max(0, interval - (time.monotonic() - poll_start)))
+    except KeyboardInterrupt:
+        pass
 
 def main():
     parser = argparse.ArgumentParser(description='Get the daily buid updates')
@@ -15,15 +90,15 @@ def main():
     parser.add_argument('--zone', help='specify the lease/zone', type= lambda arg:arg.split(','))
     parser.add_argument('--job_type', default='p', choices=['p','z','pa'], help='Specify the CI job type (Power(p) or s390x(z) or Power Auxillary(pa)), default is p')
     parser.add_argument('--job_install_status',default='All',choices=['failure','success'],help='Specify the desired job install status to filter the jobs accordingly')
+    parser.add_argument('--workers', type=int, default=1, help='Number of builds to evaluate concurrently, default is 1')
+    parser.add_argument('--async_fetch', action='store_true', help='Fetch the artifacts of all the builds of a CI concurrently on an event loop before evaluating them')
+    parser.add_argument('--listing', default='html', choices=['html','gcs'], help='Source of the build listings, Prow job history pages (html) or GCS build directories (gcs), default is html')
+    parser.add_argument('--history_db', metavar='PATH', help='History database (SQLite file) the lease, nightly image and failed testcases of the analysed builds are kept in, so later runs read them without fetching the artifacts again, off by default')
+    parser.add_argument('--watch', type=int, metavar='INTERVAL', help='Keep running and report the builds which finished since the last poll every INTERVAL seconds')
 
     args = parser.parse_args()
-    if args.job_type == 'p':
-        config_file = 'p_periodic.json'
-    elif args.job_type == 'z':
-        config_file = 'z_periodic.json'
-    elif args.job_type == 'pa':
-        config_file = 'p_auxillary.json' 
-
+    if args.watch is not None and args.watch < 1:
+        parser.error("Watch interval must be at least 1 second")
     if args.job_install_status == 'failure':
         job_install_status = 'failure'
     elif args.job_install_status == 'success':
@@ -32,19 +107,26 @@ def main():
         job_install_status='All'
     
     monitor.PROW_URL = monitor.set_prow_url(args.job_type)
-    config_data = monitor.load_config(config_file)
-    if args.info_type == "brief":
-        summary_list = []
-        for ci_name,ci_link in config_data.items():
-            build_list = monitor.get_jobs(ci_link)
-            summary_list.extend(monitor.get_brief_job_info(build_list,ci_name,zone=args.zone,job_filter=job_install_status))
-        if len(summary_list)==0:
-            print("******************* No builds found ******************************")
-        print(tabulate(summary_list, headers='keys', tablefmt="pipe", stralign='left'))
-    elif args.info_type == "detailed":
-        for ci_name,ci_link in config_data.items():
-            build_list = monitor.get_jobs(ci_link)
-            monitor.get_detailed_job_info(build_list,ci_name,zone=args.zone,job_filter=job_install_status)
+    monitor.set_workers(args.workers)
+    monitor.set_async_fetch(args.async_fetch)
+    store = None
+    if args.history_db:
+        store = history_db.HistoryStore(args.history_db)
+        monitor.TESTCASE_INDEX = store
+        monitor.NIGHTLY_INDEX = store
+    monitor.set_listing_backend(args.listing)
+    try:
+        if args.watch is not None:
+            config_data = monitor.load_config(report.CONFIG_FILES[args.job_type])
+            watch(config_data,args.info_type,args.zone,job_install_status,args.watch)
+        else:
+            daily_report = report.generate_daily_report(args.job_type,args.info_type,args.zone,job_install_status)
+            sys.stdout.write(daily_report.render())
+        if args.async_fetch:
+            monitor.print_probe_counts()
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main()
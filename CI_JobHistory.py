@@ -3,9 +3,13 @@ import urllib3
 from tabulate import tabulate
 import re
 from datetime import datetime,timedelta
+import constants
 import monitor
+import history_db
+import requests
 import argparse
 import configparser
+import sys
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -71,6 +75,34 @@ def get_date_input():
         print("Invalid date format")
         return None
 
+def _check_build_for_node_crash(url, zone):
+    """
+    Check for node crash in a single build
+ 
+    Args:
+        url (string): Build which needs to be checked.
+        zone (list): List of the zones/leases that need to checked.
+    """
+    if monitor.BUILD_STORE is not None:
+        _, output = _stored_node_crash(monitor.BUILD_STORE, url, zone)
+        sys.stdout.write(output)
+        return
+    pattern = r'/(\d+)'   
+    node_status = ''
+    match = re.search(pattern, url)
+    job_id = match.group(1)
+    lease,_ = monitor.get_quota_and_nightly(url)
+    if zone is not None and lease not in zone :
+        return
+    job_status = monitor.check_job_status(url)
+    cluster_deploy_status = monitor.cluster_deploy_status(url)
+    print(job_id)
+    if cluster_deploy_status == 'SUCCESS' and job_status == 'FAILURE':
+        node_status = monitor.get_node_status(url)
+        print(node_status)
+    monitor.check_node_crash(url)
+    print("--------------------------------------------------------------------------------------------------")
+
 def check_for_node_crashes(job_list, zone):
     """
     Check for node crash across all the provided job list
@@ -79,22 +111,40 @@ def check_for_node_crashes(job_list, zone):
         job_list (list): List of jobs which needs to be checked.
         zone (list): List of the zones/leases that need to checked.
     """
-    pattern = r'/(\d+)'   
-    for url in job_list:
-        node_status = ''
-        match = re.search(pattern, url)
-        job_id = match.group(1)
-        lease,_ = monitor.get_quota_and_nightly(url)
-        if zone is not None and lease not in zone :
-            continue
-        job_status = monitor.check_job_status(url)
-        cluster_deploy_status = monitor.cluster_deploy_status(url)
-        print(job_id)
-        if cluster_deploy_status == 'SUCCESS' and job_status == 'FAILURE':
-            node_status = monitor.get_node_status(url)
-            print(node_status)
-        monitor.check_node_crash(url)
-        print("--------------------------------------------------------------------------------------------------")
+    tasks = [monitor.submit_build_task(_check_build_for_node_crash, url, zone) for url in job_list]
+    for task in tasks:
+        _, output = task.result()
+        sys.stdout.write(output)
+
+def _get_build_failed_testcases(spylink, zone):
+    """
+    To get the failed testcases of a single build
+
+    Args:
+        spylink (string): Build which needs to be checked.
+        zone (list): List of the zones/leases that need to checked.
+
+    Returns:
+        string: Failed testcases report of the build, None if the build is skipped.
+    """
+    if monitor.BUILD_STORE is not None:
+        report, output = _stored_failed_testcases(monitor.BUILD_STORE, spylink, zone)
+        sys.stdout.write(output)
+        return report
+    # Only failed builds are reported, the ones the listing reports as passed need no request.
+    if monitor.listed_as_passed(spylink):
+        return None
+    job_type,_ = monitor.job_classifier(spylink)
+    lease,_ = monitor.get_quota_and_nightly(spylink)
+    if zone is not None and lease not in zone :
+        return None
+    job_status=monitor.check_job_status(spylink)
+    if job_status == 'FAILURE':
+        cluster_status=monitor.cluster_deploy_status(spylink)
+        if cluster_status == 'SUCCESS':
+            _, report = monitor.run_captured(monitor.print_all_failed_tc,spylink,job_type)
+            return report
+    return None
 
 def get_failed_testcases(spylinks, zone):
     """
@@ -107,25 +157,21 @@ def get_failed_testcases(spylinks, zone):
 
     pattern = r'/(\d+)'
     j=0
-    for spylink in spylinks:
-        match = re.search(pattern, spylink)
-        job_id = match.group(1)
-        job_type,_ = monitor.job_classifier(spylink)
-        lease,_ = monitor.get_quota_and_nightly(spylink)
-        if zone is not None and lease not in zone :
-            continue
-        job_status=monitor.check_job_status(spylink)
-        if job_status == 'FAILURE':
-            cluster_status=monitor.cluster_deploy_status(spylink)
-            if cluster_status == 'SUCCESS':
-                j=j+1
-                print(str(j)+".",job_id)
-                monitor.print_all_failed_tc(spylink,job_type)
-                print("\n")
+    tasks = [monitor.submit_build_task(_get_build_failed_testcases, spylink, zone) for spylink in spylinks]
+    for spylink, task in zip(spylinks, tasks):
+        report, output = task.result()
+        sys.stdout.write(output)
+        if report is not None:
+            match = re.search(pattern, spylink)
+            job_id = match.group(1)
+            j=j+1
+            print(str(j)+".",job_id)
+            sys.stdout.write(report)
+            print("\n")
     print("--------------------------------------------------------------------------------------------------")
     print("\n")
 
-def print_tc_frequency(spylinks, zone, tc_name = None):
+def print_tc_frequency(spylinks, zone, tc_name = None, ci_name = None, by_zone = False):
     """
     To display the testcases failing with its frequency
 
@@ -133,14 +179,50 @@ def print_tc_frequency(spylinks, zone, tc_name = None):
         spylinks (list): list of builds which needs to be checked.
         zone (list): List of the zones/leases that need to checked.
         tc_name (list): list of testcase name.
+        ci_name (string): CI name of the builds.
+        by_zone (bool): Also display the frequency of the testcases per zone/lease of the builds.
 
     """
 
-    frequency = monitor.get_testcase_frequency(spylinks,zone,tc_name)
+    failure_matrix = monitor.get_failure_matrix(spylinks,zone,ci_name)
+    frequency = failure_matrix.frequency(tc_name)
     table_data = [(key,value) for key, value in frequency.items()]
     print(tabulate(table_data, headers = ['Testcase','Frequency'], tablefmt='grid'))
+    if by_zone:
+        zone_frequency = failure_matrix.frequency_by("zone", list(frequency))
+        table_data = [(key,lease,value) for lease, lease_frequency in zone_frequency.items() for key, value in lease_frequency.items()]
+        print(tabulate(table_data, headers = ['Testcase','Zone','Frequency'], tablefmt='grid'))
 
 
+def _check_build_testcase_failure(spylink, zone, tc_name):
+    """
+    To check if a single build has the particular testcase failure.
+
+    Args:
+        spylink (string): Build which needs to be checked.
+        zone (list): List of the zones/leases that need to checked.
+        tc_name (string): Name of the testcase.
+
+    Returns:
+        bool: True if the testcase failed in the build.
+    """
+    if monitor.BUILD_STORE is not None:
+        failed, output = _stored_testcase_failure(monitor.BUILD_STORE, spylink, zone, tc_name)
+        sys.stdout.write(output)
+        return failed
+    if monitor.listed_as_passed(spylink):
+        return False
+    job_type,_ = monitor.job_classifier(spylink)
+    lease,_ = monitor.get_quota_and_nightly(spylink)
+    if zone is not None and lease not in zone :
+        return False
+    job_status=monitor.check_job_status(spylink)
+    if job_status == 'FAILURE':
+        cluster_status=monitor.cluster_deploy_status(spylink)
+        if cluster_status == 'SUCCESS':
+            return monitor.check_testcase_failure(spylink,job_type,tc_name)
+    return False
+
 def get_testcase_failure(spylinks, zone, tc_name):
     """
     To get all the builds with the particular testcase failure.
@@ -152,22 +234,17 @@ def get_testcase_failure(spylinks, zone, tc_name):
     """
     pattern = r'/(\d+)'
     j=0
-    for spylink in spylinks:
-        match = re.search(pattern, spylink)
-        job_id = match.group(1)
-        job_type,_ = monitor.job_classifier(spylink)
-        lease,_ = monitor.get_quota_and_nightly(spylink)
-        if zone is not None and lease not in zone :
-            continue
-        job_status=monitor.check_job_status(spylink)
-        if job_status == 'FAILURE':
-            cluster_status=monitor.cluster_deploy_status(spylink)
-            if cluster_status == 'SUCCESS':
-                if monitor.check_testcase_failure(spylink,job_type,tc_name):
-                    j=j+1
-                    print(str(j)+"."+"Job_id: "+job_id)
-                    print("https://prow.ci.openshift.org"+ spylink)
-                    print("\n")
+    tasks = [monitor.submit_build_task(_check_build_testcase_failure, spylink, zone, tc_name) for spylink in spylinks]
+    for spylink, task in zip(spylinks, tasks):
+        failed, output = task.result()
+        sys.stdout.write(output)
+        if failed:
+            match = re.search(pattern, spylink)
+            job_id = match.group(1)
+            j=j+1
+            print(str(j)+"."+"Job_id: "+job_id)
+            print("https://prow.ci.openshift.org"+ spylink)
+            print("\n")
     print("--------------------------------------------------------------------------------------------------")
     print("\n")
 
@@ -311,12 +388,231 @@ def get_testcase_names():
 
 
 
+def node_crash_query(ci_name, ci_link, start_date, end_date, zone):
+    """
+    Query option 1, checks for node crash in the builds of a CI run in the date range.
+    """
+    print("-------------------------------------------------------------------------------------------------")
+    print(ci_name)
+    if "sno" in ci_link or "mce" in ci_link:
+        print("Node crash check is not supported in SNO/MCE jobs")
+        return
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    check_for_node_crashes(spy_links,zone=zone)
+
+def brief_info_query(ci_name, ci_link, start_date, end_date, zone, job_filter):
+    """
+    Query option 2, gets brief information of the builds of a CI run in the date range.
+    """
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    return monitor.get_brief_job_info(spy_links,ci_name,zone=zone,job_filter=job_filter)
+
+def detailed_info_query(ci_name, ci_link, start_date, end_date, zone, job_filter="all"):
+    """
+    Query options 3 and 7, prints detailed information of the builds of a CI run in the date range.
+    """
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    monitor.get_detailed_job_info(spy_links,ci_name,zone=zone,job_filter=job_filter)
+
+def failed_testcases_query(ci_name, ci_link, start_date, end_date, zone):
+    """
+    Query option 4, prints the failed testcases of the builds of a CI run in the date range.
+    """
+    print("-------------------------------------------------------------------------------------------------")
+    print(ci_name)
+    if "sno" in ci_link:
+        print("Tests execution is not yet supported in SNO")
+        return
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    get_failed_testcases(spy_links,zone=zone)
+
+def testcase_failure_query(ci_name, ci_link, start_date, end_date, zone, tc_list):
+    """
+    Query option 5, prints the builds of a CI run in the date range which have the testcase failures.
+    """
+    print("-------------------------------------------------------------------------------------------------")
+    print(ci_name)
+    if "sno" in ci_link:
+        print("Tests execution is not yet supported in SNO")
+        return
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    for tc in tc_list:
+        print("TESTCASE NAME: " + tc)
+        get_testcase_failure(spy_links,zone=zone,tc_name=tc)
+
+def tc_frequency_query(ci_name, ci_link, start_date, end_date, zone, tc_list, by_zone=False):
+    """
+    Query option 6, prints the testcase failure frequency of the builds of a CI run in the date range.
+    """
+    print("-------------------------------------------------------------------------------------------------")
+    print(ci_name)
+    if "sno" in ci_link:
+        print("Tests execution is not yet supported in SNO")
+        return
+    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
+    print(len(spy_links),"builds have run in the date range of",start_date,"to",end_date)
+    print_tc_frequency(spy_links,zone=zone,tc_name=tc_list,ci_name=ci_name,by_zone=by_zone)
+
+def _collect_build(spylink, ci_name):
+    """
+    Evaluates a build for the history database, i.e. everything the query options print for it.
+
+    Args:
+        spylink (string): Build which needs to be evaluated.
+        ci_name (string): CI name of the build.
+
+    Returns:
+        dict: Evaluation of the build as stored by HistoryStore.store_build.
+    """
+    lease, nightly = monitor.get_quota_and_nightly(spylink)
+    evaluation = {
+        "lease": lease,
+        "nightly": nightly,
+        "job_status": monitor.check_job_status(spylink),
+        "install_status": monitor.cluster_deploy_status(spylink),
+    }
+    results = {}
+    results["node_crash"] = monitor.run_captured(_check_build_for_node_crash, spylink, None)
+    results["brief"] = monitor.run_captured(monitor.get_brief_build_info, spylink, ci_name)
+    results["detailed"] = monitor.run_captured(monitor.get_detailed_build_info, spylink, ci_name)
+    results["failed_testcases"] = monitor.run_captured(_get_build_failed_testcases, spylink, None)
+    failed_tc, output = monitor.run_captured(monitor.get_build_tc_failures, spylink)
+    results["tc_failures"] = (None, output)
+    evaluation["results"] = results
+    evaluation["failed_testcases"] = failed_tc
+    return evaluation
+
+def sync_ci(store, ci_name, ci_link, since):
+    """
+    Adds the builds of a CI finished since the last sync to the history database.
+
+    Args:
+        store (HistoryStore): History database.
+        ci_name (string): CI name.
+        ci_link (string): CI link.
+        since (datetime): Oldest start time synced when the CI was never synced.
+
+    Returns:
+        int: Number of builds added.
+    """
+    last_build_id = store.get_last_build_id(ci_link)
+    newest_id = None
+    unfinished_ids = []
+    builds = []
+    try:
+        for build in monitor.iter_job_history(ci_link, since if last_build_id is None else None):
+            build_id = int(build.id)
+            if newest_id is None:
+                newest_id = build_id
+            if last_build_id is not None and build_id <= last_build_id:
+                break
+            if last_build_id is None and build.started < since:
+                break
+            if build.result == "PENDING":
+                unfinished_ids.append(build_id)
+            elif not store.has_build(build.spylink):
+                builds.append(build)
+    except (requests.RequestException, ValueError) as e:
+        print("Failed to list the builds of", ci_name, ":", e)
+        return 0
+
+    tasks = [monitor.submit_build_task(_collect_build, build.spylink, ci_name) for build in builds]
+    synced = 0
+    for build, task in zip(builds, tasks):
+        try:
+            evaluation, _ = task.result()
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print("Failed to evaluate", build.spylink, ":", e)
+            unfinished_ids.append(int(build.id))
+            continue
+        store.store_build(build, ci_link, ci_name, evaluation)
+        synced += 1
+
+    #Builds still running or failed to evaluate are picked up again by the next sync.
+    if unfinished_ids:
+        store.set_last_build_id(ci_link, min(unfinished_ids) - 1)
+    elif newest_id is not None:
+        store.set_last_build_id(ci_link, max(newest_id, last_build_id or 0))
+    return synced
+
+def sync_history(store, ci_list, since):
+    """
+    Syncs the history database with the builds of the given CI's.
+
+    Args:
+        store (HistoryStore): History database.
+        ci_list (dict): CI names and links.
+        since (datetime): Oldest start time synced for the CI's never synced.
+    """
+    for ci_name, ci_link in ci_list.items():
+        synced = sync_ci(store, ci_name, ci_link, since)
+        print(ci_name + ":", synced, "builds synced")
+
+def use_history_db(store):
+    """
+    Answers the queries from the history database instead of the Prow CI.
+
+    Args:
+        store (HistoryStore): History database.
+    """
+    monitor.BUILD_STORE = store
+
+def _stored_node_crash(store, url, zone):
+    if store.filter_build(url, zone):
+        return None, ""
+    return store.get_result(url, "node_crash")
+
+def _stored_failed_testcases(store, spylink, zone):
+    if store.filter_build(spylink, zone):
+        return None, ""
+    return store.get_result(spylink, "failed_testcases")
+
+def _stored_testcase_failure(store, spylink, zone, tc_name):
+    build = store.get_build(spylink)
+    if build is None or store.filter_build(spylink, zone):
+        return False, ""
+    if build["job_status"] == 'FAILURE' and build["install_status"] == 'SUCCESS':
+        _, output = store.get_result(spylink, "tc_failures")
+        return store.has_failed_testcase(spylink, tc_name), output
+    return False, ""
+
+def print_indexed_testcase_failures(store, name, match, since):
+    """
+    Prints the builds of all CIs in which a testcase failed, from the testcase index.
+
+    Args:
+        store (HistoryStore): History database holding the testcase index.
+        name (string): Testcase name.
+        match (string): "exact", "prefix" or "substring" match of the testcase name.
+        since (datetime): Oldest build start time.
+    """
+    ci_names = {}
+    for config_file in ('p_periodic.json', 'z_periodic.json', 'p_auxillary.json'):
+        for ci_name, ci_link in monitor.load_config(config_file).items():
+            ci_names.setdefault(ci_link, ci_name)
+    table_data = []
+    for row in store.find_testcase_failures(name, match, since):
+        table_data.append((row["testcase"], row["suite"], ci_names.get(row["job_name"], row["job_name"]),
+                           row["build_id"], row["started"], constants.JOB_LINK_URL + row["spylink"][1:]))
+    print(len(table_data), "testcase failures found in the builds analysed since", since.strftime("%Y-%m-%d"))
+    print(tabulate(table_data, headers=['Testcase','Suite','CI','Build ID','Started','Job link'], tablefmt='grid'))
+
 def main():
     parser = argparse.ArgumentParser(description='Get the job history')
     parser.add_argument('--zone', help='specify the lease/zone', type= lambda arg:arg.split(','))
     parser.add_argument('--job_type', default='p', choices=['p','z','pa'], help= 'Specify the CI job type (Power(p) or s390x(z) or Power Auxillary(pa)), default is p')
     parser.add_argument('--filter',default='All',type= lambda arg:arg.split(','), help='Specify the filter string to fetch jobs (Example heavy build / libvirt / powervs / upgrade / 4.14 / 4.15 / 4.16 / 4.17/ 4.18 )')
     parser.add_argument('--job_install_status',default='All',choices=['failure','success'],help='Specify the desired job install status to filter the jobs accordingly')
+    parser.add_argument('--workers', type=int, default=1, help='Number of CIs and builds to evaluate concurrently, default is 1')
+    parser.add_argument('--async_fetch', action='store_true', help='Fetch the artifacts of all the builds of a CI concurrently on an event loop before evaluating them')
+    parser.add_argument('--listing', default='html', choices=['html','gcs'], help='Source of the build listings, Prow job history pages (html) or GCS build directories (gcs), default is html')
+    parser.add_argument('--by_zone', action='store_true', help='Break the testcase failure frequency of query option 6 down by the zone/lease of the builds')
+    parser.add_argument('--history_db', metavar='PATH', help='History database (SQLite file) the analysed builds are indexed in, off by default. --sync, --use_db and --find_testcase use {} when it is not given'.format(constants.HISTORY_DB_FILE))
+    parser.add_argument('--sync', action='store_true', help='Add the builds finished since the last sync of the CIs to the history database and exit')
+    parser.add_argument('--since', type=lambda arg: datetime.strptime(arg, "%Y-%m-%d"), help='Oldest build date (YYYY-MM-DD) synced for CIs never synced before or searched by --find_testcase, default is 30 days ago')
+    parser.add_argument('--use_db', action='store_true', help='Answer the queries from the history database instead of the Prow CI')
+    parser.add_argument('--find_testcase', help='Search the testcase index for the builds of all CIs in which the testcase failed since --since and exit')
+    parser.add_argument('--match', default='exact', choices=['exact','prefix','substring'], help='Match of the testcase name searched by --find_testcase, default is exact')
     args = parser.parse_args()
     filter=args.filter
 
@@ -335,8 +631,47 @@ def main():
         job_install_status='All'
     
     monitor.PROW_URL = monitor.set_prow_url(args.job_type)
+    monitor.set_workers(args.workers)
+    monitor.set_async_fetch(args.async_fetch)
+    monitor.set_listing_backend(args.listing)
     config_data = monitor.load_config(config_file)
 
+    store = None
+    if args.history_db or args.sync or args.use_db or args.find_testcase:
+        store = history_db.HistoryStore(args.history_db)
+        monitor.TESTCASE_INDEX = store
+        monitor.NIGHTLY_INDEX = store
+    try:
+        return run_queries(args, config_data, store, filter, job_install_status)
+    finally:
+        if store is not None:
+            store.close()
+
+def run_queries(args, config_data, store, filter, job_install_status):
+    """
+    Runs the sync, the testcase search or the query option selected by the command line arguments.
+
+    Args:
+        args (argparse.Namespace): Command line arguments.
+        config_data (dict): CI names and links.
+        store (HistoryStore): History database, None if it is not used.
+        filter (list): Filter strings of the CIs.
+        job_install_status (string): Job install status the builds are filtered with.
+    """
+    since = args.since or datetime.now() - timedelta(days=constants.HISTORY_DB_SYNC_DAYS)
+
+    if args.sync:
+        ci_list = {ci_name: ci_link for ci_name, ci_link in config_data.items() if filter[0] == 'All' or any(w in ci_name for w in filter)}
+        sync_history(store, ci_list, since)
+        return 0
+
+    if args.find_testcase:
+        print_indexed_testcase_failures(store, args.find_testcase, args.match, since)
+        return 0
+
+    if args.use_db:
+        use_history_db(store)
+
     ci_list = display_ci_links(config_data,filter)
     if isinstance(ci_list,dict):
         option = get_query_options()
@@ -350,40 +685,19 @@ def main():
             print("Checking runs from",end_date,"to",start_date)
     
             if option == '1':
-                for ci_name,ci_link in ci_list.items():
-                    print("-------------------------------------------------------------------------------------------------")
-                    print(ci_name)
-                    if "sno" in ci_link or "mce" in ci_link:
-                        print("Node crash check is not supported in SNO/MCE jobs")
-                        continue
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    check_for_node_crashes(spy_links,zone=args.zone)
-                    monitor.final_job_list = []
+                monitor.run_for_each_ci(ci_list,node_crash_query,start_date,end_date,args.zone)
             
             if option == '2':
                 summary_list = []
-                for ci_name,ci_link in ci_list.items():
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    summary_list.extend(monitor.get_brief_job_info(spy_links,ci_name,zone=args.zone,job_filter=job_install_status))
-                    monitor.final_job_list = []
+                for ci_summary_list in monitor.run_for_each_ci(ci_list,brief_info_query,start_date,end_date,args.zone,job_install_status):
+                    summary_list.extend(ci_summary_list)
                 print(tabulate(summary_list, headers='keys', tablefmt="pipe", stralign='left'))
             
             if option == '3':
-                for ci_name,ci_link in ci_list.items():
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    monitor.get_detailed_job_info(spy_links,ci_name,zone=args.zone,job_filter=job_install_status)
-                    monitor.final_job_list = []
+                monitor.run_for_each_ci(ci_list,detailed_info_query,start_date,end_date,args.zone,job_install_status)
             
             if option == '4':
-                for ci_name,ci_link in ci_list.items():
-                    print("-------------------------------------------------------------------------------------------------")
-                    print(ci_name)
-                    if "sno" in ci_link:
-                        print("Tests execution is not yet supported in SNO")
-                        continue
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    get_failed_testcases(spy_links,zone=args.zone)
-                    monitor.final_job_list = []
+                monitor.run_for_each_ci(ci_list,failed_testcases_query,start_date,end_date,args.zone)
             
             if option == '5':
                 tc_list =  get_testcase_names()
@@ -392,36 +706,16 @@ def main():
                     print("Please provide atleast one testcase name:")
                     return 1
 
-                for ci_name,ci_link in ci_list.items():
-                    print("-------------------------------------------------------------------------------------------------")
-                    print(ci_name)
-                    if "sno" in ci_link:
-                        print("Tests execution is not yet supported in SNO")
-                        continue
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    for tc in tc_list:
-                        print("TESTCASE NAME: " + tc)
-                        get_testcase_failure(spy_links,zone=args.zone,tc_name=tc)
-                    monitor.final_job_list = []
+                monitor.run_for_each_ci(ci_list,testcase_failure_query,start_date,end_date,args.zone,tc_list)
 
             if option == '6':
                   tc_list = get_testcase_names()
-                    
-                  for ci_name,ci_link in ci_list.items():
-                    print("-------------------------------------------------------------------------------------------------")
-                    print(ci_name)
-                    if "sno" in ci_link:
-                        print("Tests execution is not yet supported in SNO")
-                        continue
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    print(len(spy_links),"builds have run in the date range of",start_date,"to",end_date)
-                    print_tc_frequency(spy_links,zone=args.zone,tc_name=tc_list)
-                    monitor.final_job_list = []
+                  monitor.run_for_each_ci(ci_list,tc_frequency_query,start_date,end_date,args.zone,tc_list,args.by_zone)
             if option == '7':
-                for ci_name,ci_link in ci_list.items():
-                    spy_links = monitor.get_jobs_with_date(ci_link,start_date,end_date)
-                    monitor.get_detailed_job_info(spy_links,ci_name,zone=args.zone)
-                    monitor.final_job_list = []
+                monitor.run_for_each_ci(ci_list,detailed_info_query,start_date,end_date,args.zone)
+
+            if args.async_fetch:
+                monitor.print_probe_counts()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 from tabulate import tabulate
 import re
 from datetime import datetime
+import history_db
+import job_history
 import monitor
 import configparser
 import argparse
@@ -29,6 +31,7 @@ def get_job_name():
 
     parser = argparse.ArgumentParser(description='Get the job history')
     parser.add_argument('--job_type', default='p', choices=['p','z','pa'], help= 'Specify the CI job type (Power(p) or s390x(z) or Power Auxillary(pa)), default is p')
+    parser.add_argument('--history_db', metavar='PATH', help='History database (SQLite file) the lease and nightly image of the analysed builds are looked up in and kept in, off by default')
 
     args = parser.parse_args()
 
@@ -40,6 +43,8 @@ def get_job_name():
         config_file = 'p_auxillary.json'
     
     monitor.PROW_URL = monitor.set_prow_url(args.job_type)
+    if args.history_db:
+        monitor.NIGHTLY_INDEX = history_db.HistoryStore(args.history_db)
     config_data = monitor.load_config(config_file)
 
     j=0
@@ -81,25 +86,52 @@ def get_job_name():
     return selected_config_data
 
 
+def _nightly_date(nightly):
+    match = re.search(r'\d{4}-\d{2}-\d{2}-\d{6}',nightly)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(),"%Y-%m-%d-%H%M%S")
+
 def get_builds_with_same_nightly(job_name,nightly_image):
+
+    '''
+    Gets the builds of a CI which used a nightly image, i.e. the builds run since the nightly was
+    built up to the first build which used a newer nightly.
+
+    With monitor.NIGHTLY_INDEX the nightlies of the indexed builds are read from the index first:
+    the listing stops before the first indexed build which used a newer nightly and only the build
+    logs of the listed builds which are not indexed yet are fetched.
+
+    Parameter:
+        job_name (string): CI link.
+        nightly_image (string): Nightly image name or pull spec.
+
+    Returns:
+        list: Builds which used the nightly image, oldest first.
+    '''
+
     builds=[]
     agg_builds = []
-    pattern = r'\d{4}-\d{2}-\d{2}-\d{6}'
-    match = re.search(pattern,nightly_image)
-    
-    if match != None:
-        date_str = match.group()
-        nightly_date = datetime.strptime(date_str,"%Y-%m-%d-%H%M%S")
+    nightly_date = _nightly_date(nightly_image)
+
+    if nightly_date != None:
         current_date = datetime.now()
+        indexed = {}
+        if monitor.NIGHTLY_INDEX is not None:
+            for row in monitor.NIGHTLY_INDEX.get_indexed_nightlies(job_name, nightly_date):
+                ng_date = _nightly_date(row["nightly"] or "")
+                if ng_date is not None and ng_date > nightly_date:
+                    # Builds start after they are created, so the listing ends before this build.
+                    current_date = job_history.build_created(row["build_id"])
+                    break
+                indexed[row["spylink"]] = row["nightly"]
         builds=monitor.get_jobs_with_date(job_name,current_date,nightly_date)
         for spylink in reversed(builds):
-            ng = ""
-            _, ng = monitor.get_quota_and_nightly(spylink)
-            pattern_1 = r'\d{4}-\d{2}-\d{2}-\d{6}'
-            match_1 = re.search(pattern_1,ng)
-            if match_1 != None:
-                date_str_1 = match_1.group()
-                ng_date = datetime.strptime(date_str_1,"%Y-%m-%d-%H%M%S")
+            ng = indexed.get(spylink)
+            if ng is None:
+                _, ng = monitor.get_quota_and_nightly(spylink)
+            ng_date = _nightly_date(ng)
+            if ng_date != None:
                 if ng_date > nightly_date:
                     break
                 else:
@@ -119,6 +151,8 @@ def main():
         build_list = []
         build_list = get_builds_with_same_nightly(job_link,nightly_image)
         monitor.get_detailed_job_info(build_list,job_name)
+    if monitor.NIGHTLY_INDEX is not None:
+        monitor.NIGHTLY_INDEX.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,166 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import requests
+import constants
+
+# Directory of the cache, None disables it.
+CACHE_DIR = constants.ARTIFACT_CACHE_DIR
+_size = None
+_size_lock = threading.Lock()
+
+
+def set_cache_dir(cache_dir):
+
+    '''
+    Sets the directory used for the on-disk artifact cache.
+
+    Parameter:
+        cache_dir (string): Cache directory, None disables the cache.
+    '''
+
+    global CACHE_DIR, _size
+    with _size_lock:
+        CACHE_DIR = cache_dir
+        _size = None
+
+
+def _gcs_path(url):
+    if url.startswith(constants.PROW_VIEW_URL):
+        return url[len(constants.PROW_VIEW_URL):]
+    return url
+
+
+def _entry_path(url):
+
+    '''
+    Returns the cache file of a url, named after the hash of its GCS path.
+    '''
+
+    key = hashlib.sha256(_gcs_path(url).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, key[:2], key + ".gz")
+
+
+def _iter_entries():
+    for dir_entry in os.scandir(CACHE_DIR):
+        if dir_entry.is_dir():
+            for entry in os.scandir(dir_entry.path):
+                if entry.name.endswith(".gz"):
+                    yield entry
+
+
+def _current_size():
+    global _size
+    if _size is None:
+        _size = sum(entry.stat().st_size for entry in _iter_entries()) if os.path.isdir(CACHE_DIR) else 0
+    return _size
+
+
+def _evict():
+
+    '''
+    Removes the least recently used entries until the cache fits in constants.ARTIFACT_CACHE_MAX_BYTES.
+    '''
+
+    global _size
+    entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in _iter_entries()))
+    _size = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if _size <= constants.ARTIFACT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            _size -= size
+        except OSError:
+            pass
+
+
+def load(url):
+
+    '''
+    Loads a cached artifact.
+
+    Parameter:
+        url (string): Url of the artifact.
+
+    Returns:
+        requests.Response: Cached response, None if the artifact is not cached.
+    '''
+
+    if CACHE_DIR is None:
+        return None
+    path = _entry_path(url)
+    try:
+        with gzip.open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            body = f.read()
+        # Reads refresh the modification time which orders the eviction.
+        os.utime(path)
+    except (OSError, EOFError, ValueError):
+        return None
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = meta["encoding"]
+    if meta["content_type"]:
+        response.headers["Content-Type"] = meta["content_type"]
+    response._content = body
+    return response
+
+
+def store(url, response):
+
+    '''
+    Stores an artifact compressed in the cache.
+
+    Parameter:
+        url (string): Url of the artifact.
+        response (requests.Response): Response to cache.
+    '''
+
+    global _size
+    if CACHE_DIR is None:
+        return
+    path = _entry_path(url)
+    meta = {"url": _gcs_path(url), "encoding": response.encoding, "content_type": response.headers.get("Content-Type")}
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(response.content)
+        size = os.path.getsize(tmp_path)
+        with _size_lock:
+            # Sized before the entry is replaced: the first scan of the directory must not count the new
+            # entry and a replaced entry only adds the difference.
+            current_size = _current_size()
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            _size = current_size + size - old_size
+            if _size > constants.ARTIFACT_CACHE_MAX_BYTES:
+                _evict()
+    except OSError as e:
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+        print(f"Failed to write the artifact cache: {e}")
+
+
+def clear():
+
+    '''
+    Removes every cached artifact.
+    '''
+
+    global _size
+    if CACHE_DIR is None or not os.path.isdir(CACHE_DIR):
+        return
+    with _size_lock:
+        for entry in list(_iter_entries()):
+            os.remove(entry.path)
+        _size = 0
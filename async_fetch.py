@@ -0,0 +1,174 @@
+import asyncio
+from collections import namedtuple
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import constants
+import fetcher
+
+
+def _to_response(url, response, body):
+
+    '''
+    Converts an aiohttp response to the requests.Response the sync helpers read from the fetcher cache.
+
+    Parameter:
+        url (string): Requested url.
+        response (aiohttp.ClientResponse): Response of the request.
+        body (bytes): Body of the response.
+
+    Returns:
+        requests.Response: Equivalent response.
+    '''
+
+    converted = requests.Response()
+    converted.status_code = response.status
+    converted.reason = response.reason
+    converted.url = str(response.url)
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted._content = body
+    converted._content_consumed = True
+    return converted
+
+
+class _Engine:
+
+    '''
+    Fetches urls into the fetcher cache, each url at most once, with at most max_in_flight requests at a time.
+    '''
+
+    def __init__(self, session, max_in_flight):
+        self._session = session
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._tasks = {}
+
+    def fetch(self, url):
+
+        '''
+        Schedules the fetch of a url, concurrent callers of the same url share one request.
+
+        Returns:
+            asyncio.Task: Task resolving to True if the url is in the fetcher cache once it is done.
+        '''
+
+        task = self._tasks.get(url)
+        if task is None:
+            task = self._tasks[url] = asyncio.ensure_future(self._fetch(url))
+        return task
+
+    async def _fetch(self, url):
+        # Reading and writing the on-disk artifact cache is file work, it runs off the event loop.
+        if await asyncio.to_thread(fetcher.get_cached, url) is not None:
+            return True
+        # Same retry policy as the shared session of fetcher.
+        for retry in range(constants.HTTP_RETRIES + 1):
+            if retry:
+                await asyncio.sleep(constants.HTTP_BACKOFF_FACTOR * 2 ** (retry - 1))
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url) as response:
+                        body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                continue
+            if response.status in constants.HTTP_RETRY_STATUS_CODES and retry < constants.HTTP_RETRIES:
+                continue
+            await asyncio.to_thread(fetcher.put, url, _to_response(url, response, body))
+            return True
+        return False
+
+    async def run(self, func, *args):
+
+        '''
+        Calls a sync function on a worker thread, counted against max_in_flight like a request.
+
+        Returns:
+            object: What func returns.
+        '''
+
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args)
+
+
+class Probe(namedtuple("Probe", ["name", "requires", "when", "urls", "run"], defaults=(None,))):
+
+    '''
+    Node of the probe graph of a build.
+
+    name (string): Name of the probe, reported when it is executed.
+    requires (tuple): Names of the probes which have to be done (executed or skipped) before this one.
+    when (function): Called with the context once the required probes are done, False skips the probe.
+    urls (function): Called with the context, returns the urls the probe fetches concurrently.
+    run (function, optional): Called with the context on a worker thread instead of fetching urls, for
+                              reads the engine does not do, e.g. streaming the head of a log.
+    '''
+
+    __slots__ = ()
+
+
+async def _run_graph(engine, probes, context):
+
+    '''
+    Runs the probes of a build, each one as soon as the probes it requires are done.
+
+    Returns:
+        list: Names of the executed probes in the order they finished.
+    '''
+
+    tasks = {}
+    executed = []
+
+    async def run(probe):
+        await asyncio.gather(*(tasks[name] for name in probe.requires))
+        if not probe.when(context):
+            return
+        if probe.run is not None:
+            await engine.run(probe.run, context)
+        else:
+            await asyncio.gather(*(asyncio.shield(engine.fetch(url)) for url in probe.urls(context)))
+        executed.append(probe.name)
+
+    for probe in probes:
+        tasks[probe.name] = asyncio.ensure_future(run(probe))
+    try:
+        await asyncio.gather(*tasks.values())
+    except Exception:
+        # A probe failing only loses its prefetch, the sync helpers fetch what is missing.
+        for task in tasks.values():
+            task.cancel()
+    return executed
+
+
+async def _prefetch(graphs, max_in_flight, per_host):
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=per_host, ssl=False)
+    timeout = aiohttp.ClientTimeout(sock_connect=constants.HTTP_TIMEOUT, sock_read=constants.HTTP_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        engine = _Engine(session, max_in_flight)
+        return await asyncio.gather(*(_run_graph(engine, probes, context) for probes, context in graphs))
+
+
+def prefetch(graphs, max_in_flight=None, per_host=None):
+
+    '''
+    Runs probe graphs concurrently as coroutines on one thread and fills the fetcher cache with what they fetch.
+
+    A graph is a list of Probe and the context its functions are called with. A probe starts once the
+    probes it requires are done, so its when and urls functions can read what they fetched with
+    fetcher.get_cached. Responses go through fetcher.put, the sync helpers reading them afterwards
+    do not send requests.
+
+    Parameter:
+        graphs (iterable): Tuples of the probes, listed after the probes they require, and their context.
+        max_in_flight (int, optional): Requests in flight at a time, defaults to constants.ASYNC_MAX_IN_FLIGHT.
+        per_host (int, optional): Connections per host, defaults to constants.ASYNC_PER_HOST_LIMIT.
+
+    Returns:
+        list: Names of the executed probes of every graph.
+    '''
+
+    if max_in_flight is None:
+        max_in_flight = constants.ASYNC_MAX_IN_FLIGHT
+    if per_host is None:
+        per_host = constants.ASYNC_PER_HOST_LIMIT
+    return asyncio.run(_prefetch(list(graphs), max_in_flight, per_host))
@@ -0,0 +1,115 @@
+'''
+Micro-benchmark of the job history page parser.
+
+Compares job_history.parse_page with the BeautifulSoup extraction the listing
+functions of monitor.py used before, on a generated page shaped like a Prow
+job history page.
+
+    python3 benchmarks/bench_job_history.py --builds 20 --repeat 200
+'''
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_history
+
+JOB = "periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-e2e-ovn-ppc64le-powervs"
+
+
+def make_page(builds, padding):
+
+    '''
+    Generates a job history page.
+
+    Parameter:
+        builds (int): Number of builds listed on the page.
+        padding (int): Bytes of markup around the script, real pages carry navigation, styles and scripts.
+
+    Returns:
+        bytes: Body of the page.
+    '''
+
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    all_builds = []
+    for i in range(builds):
+        build_id = str(1785000000000000000 - i * 1000)
+        all_builds.append({
+            "SpyglassLink": f"/view/gs/test-platform-results/logs/{JOB}/{build_id}",
+            "ID": build_id,
+            "Started": (start - timedelta(hours=4 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "Duration": 10800000000000,
+            "Result": "SUCCESS" if i % 3 else "FAILURE",
+            "Refs": None,
+        })
+    filler = '<div class="mdl-card"><span class="label">filler</span></div>\n' * (padding // 64)
+    older = f"/job-history/gs/test-platform-results/logs/{JOB}?buildId={all_builds[-1]['ID']}"
+    page = f'''<!DOCTYPE html>
+<html><head><title>Job History: {JOB}</title>
+<script type="text/javascript" src="/static/extensions/script.js"></script>
+<script type="text/javascript">
+var allBuilds = {json.dumps(all_builds)};
+</script></head><body>{filler}
+<table class="mdl-data-table"><tbody><tr><td><a href="{older}">&lt;- Older Runs</a></td><td></td></tr></tbody></table>
+<table id="builds"><tbody></tbody></table>
+</body></html>'''
+    return page.encode()
+
+
+def parse_with_soup(raw):
+
+    '''
+    Extraction used by the listing functions before job_history.parse_page.
+
+    Parameter:
+        raw (bytes): Body of the job history page.
+
+    Returns:
+        tuple: Parsed allBuilds entries and the older runs link.
+    '''
+
+    soup = BeautifulSoup(raw.decode(), 'html.parser')
+    td_element = soup.find_all('td')
+    next_link_match = re.search(r'/job[^>"]*', str(td_element))
+    next_link = next_link_match.group() if next_link_match else ''
+    for script_element in soup.find_all('script'):
+        script_content = script_element.string
+        if script_content and 'allBuilds' in script_content:
+            match = re.search(r'allBuilds\s*=\s*(.*?);', script_content)
+            return json.loads(match.group(1)), next_link
+    return None, next_link
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Job history page parser benchmark')
+    parser.add_argument('--builds', type=int, default=20, help='Builds listed on the page')
+    parser.add_argument('--padding', type=int, default=64 * 1024, help='Bytes of markup around the script')
+    parser.add_argument('--repeat', type=int, default=200, help='Parses timed per parser')
+    args = parser.parse_args()
+
+    raw = make_page(args.builds, args.padding)
+
+    all_builds, older_link = parse_with_soup(raw)
+    page = job_history.parse_page(raw)
+    assert [build.spylink for build in page.builds] == [ele["SpyglassLink"] for ele in all_builds]
+    assert page.older_link == older_link
+
+    soup_time = timeit.timeit(lambda: parse_with_soup(raw), number=args.repeat) / args.repeat
+    direct_time = timeit.timeit(lambda: job_history.parse_page(raw), number=args.repeat) / args.repeat
+
+    print(f"page size: {len(raw)} bytes, builds: {args.builds}")
+    print(f"BeautifulSoup:           {soup_time * 1e3:8.3f} ms/page")
+    print(f"job_history.parse_page:  {direct_time * 1e3:8.3f} ms/page")
+    print(f"speedup:                 {soup_time / direct_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import re
+from collections import namedtuple
+
+# Size of the blocks of lines the scanner evaluates the rules on.
+BLOCK_SIZE = 64 * 1024
+
+
+class Rule(namedtuple("Rule", ["name", "patterns", "group"])):
+
+    '''
+    Extraction rule of the build log scanner.
+
+    name (string): Key of the rule in the scan result.
+    patterns (tuple): Compiled regexes in priority order, a match of an earlier pattern wins over a later one.
+    group (int): Group of the match stored as the result.
+    '''
+
+    __slots__ = ()
+
+
+def make_rule(name, *patterns, group=0, flags=0):
+
+    '''
+    Creates a rule from regex strings.
+
+    Parameter:
+        name (string): Key of the rule in the scan result.
+        patterns (string): Regexes in priority order.
+        group (int, optional): Group of the match stored as the result.
+        flags (int, optional): Regex flags.
+
+    Returns:
+        Rule: Compiled rule.
+    '''
+
+    return Rule(name, tuple(re.compile(pattern, flags) for pattern in patterns), group)
+
+
+# Rules registered with register_rule, they are evaluated on every build log analysed by monitor.py.
+EXTRA_RULES = []
+
+
+def register_rule(name, *patterns, group=0, flags=0):
+
+    '''
+    Adds a rule evaluated on every build log analysed by monitor.py.
+
+    Parameter:
+        name (string): Key of the rule in the analysis result.
+        patterns (string): Regexes in priority order.
+        group (int, optional): Group of the match stored as the result.
+        flags (int, optional): Regex flags.
+    '''
+
+    EXTRA_RULES.append(make_rule(name, *patterns, group=group, flags=flags))
+
+
+def iter_blocks(text, block_size=BLOCK_SIZE):
+
+    '''
+    Splits text in blocks of whole lines.
+
+    Parameter:
+        text (string): Build log.
+        block_size (int, optional): Minimum size of a block.
+
+    Returns:
+        generator: Blocks of the text, each ending at a line end.
+    '''
+
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + block_size)
+        end = len(text) if end == -1 else end + 1
+        yield text[start:end]
+        start = end
+
+
+def iter_line_blocks(chunks):
+
+    '''
+    Regroups text chunks, e.g. of a streamed download, in blocks of whole lines.
+
+    Parameter:
+        chunks (iterable): Text chunks split anywhere.
+
+    Returns:
+        generator: Blocks of the text, each ending at a line end.
+    '''
+
+    partial_line = ""
+    for chunk in chunks:
+        chunk = partial_line + chunk
+        end = chunk.rfind("\n") + 1
+        if end:
+            yield chunk[:end]
+        partial_line = chunk[end:]
+    if partial_line:
+        yield partial_line
+
+
+def scan(blocks, rules, required=None):
+
+    '''
+    Scans a build log once, evaluating every rule on each block of lines and
+    stopping as soon as the highest priority pattern of every required rule
+    has matched.
+
+    Parameter:
+        blocks (iterable): Blocks of whole lines of the build log.
+        rules (iterable): Rules to evaluate.
+        required (iterable, optional): Names of the rules the scan waits for, defaults to all the rules.
+
+    Returns:
+        dict: Rule name and the matched text, None if no pattern of the rule matched.
+        bool: True if the results of all the rules are final, i.e. every rule
+              matched its highest priority pattern or the whole log was read.
+    '''
+
+    results = {}
+    priorities = {}
+    for rule in rules:
+        results[rule.name] = None
+        priorities[rule.name] = len(rule.patterns)
+    required = set(results if required is None else required)
+    pending = list(rules)
+    for block in blocks:
+        for rule in pending:
+            for priority, pattern in enumerate(rule.patterns[:priorities[rule.name]]):
+                match = pattern.search(block)
+                if match:
+                    results[rule.name] = match.group(rule.group)
+                    priorities[rule.name] = priority
+                    break
+        pending = [rule for rule in pending if priorities[rule.name] != 0]
+        if not pending:
+            return results, True
+        if not any(rule.name in required for rule in pending):
+            return results, False
+    return results, True
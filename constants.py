@@ -4,3 +4,29 @@ STABLE_RELEASE_URL = "https://ppc64le.ocp.releases.ci.openshift.org/releasestrea
 DEV_PREVIEW_RELEASE_URL = "https://ppc64le.ocp.releases.ci.openshift.org/releasestream/4-dev-preview-ppc64le/release/"
 HYPERVISOR_CONNECTION_ERROR = "failed to connect to the hypervisor"
 RELEASE_BASE_URL = "https://ppc64le.ocp.releases.ci.openshift.org"
+HTTP_TIMEOUT = 15
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 1
+HTTP_RETRY_STATUS_CODES = (500, 502, 503, 504)
+HTTP_POOL_MAXSIZE = 10
+RESPONSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+ARTIFACT_CACHE_DIR = ".artifact_cache"
+ARTIFACT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+DIRECTORY_LISTING_CACHE_SIZE = 4096
+SPYLINK_CACHE_SIZE = 8192
+BUILD_LOG_CACHE_SIZE = 4096
+GCS_API_URL = "https://storage.googleapis.com/storage/v1/b/"
+GCS_LISTING_BATCH_SIZE = 20
+# Build ids are snowflake ids, (milliseconds since PROW_BUILD_ID_EPOCH_MS) << 22, see job_history.build_id_at.
+PROW_BUILD_ID_EPOCH_MS = 1288834974657
+# Seconds between the creation and the start of a build the GCS listing bounds allow for.
+GCS_LISTING_ID_MARGIN = 3600
+GCS_RECENT_LISTING_DAYS = (1, 7, 30)
+HISTORY_SEEK_MAX_PAGES = 8
+HISTORY_DB_FILE = "ci_history.db"
+HISTORY_DB_SYNC_DAYS = 30
+ASYNC_MAX_IN_FLIGHT = 200
+ASYNC_PER_HOST_LIMIT = 50
+REPORT_SERVER_PORT = 8000
+REPORT_CACHE_TTL = 300
@@ -0,0 +1,366 @@
+import codecs
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import artifact_cache
+import constants
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+_session = None
+_session_lock = threading.Lock()
+_pool_maxsize = constants.HTTP_POOL_MAXSIZE
+
+# Per-run response cache, url -> response, least recently used first.
+_cache = OrderedDict()
+_cache_bytes = 0
+_in_flight = {}
+_cache_lock = threading.Lock()
+
+# GCS path of a periodic or presubmit build, e.g. /origin-ci-test/logs/<job>/<build id>
+_build_root_re = re.compile(r'^(/[^/]+/(?:logs/[^/]+|pr-logs/pull/[^/]+/\d+/[^/]+)/\d+)(?:/.*)?$')
+
+
+def _build_session(pool_maxsize):
+
+    '''
+    Creates a session with keep-alive connection pooling and the retry policy.
+
+    Parameter:
+        pool_maxsize (int): Maximum number of connections kept open per host.
+
+    Returns:
+        requests.Session: Configured session.
+    '''
+
+    retry = Retry(
+        total=constants.HTTP_RETRIES,
+        backoff_factor=constants.HTTP_BACKOFF_FACTOR,
+        status_forcelist=constants.HTTP_RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    # pool_block keeps the number of connections per host capped at pool_maxsize
+    # even when more threads than that are fetching at the same time.
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry, pool_block=True)
+    session = requests.Session()
+    session.verify = False
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+
+    '''
+    Returns the shared session used for every fetch, creating it on first use.
+
+    Returns:
+        requests.Session: Shared session.
+    '''
+
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(_pool_maxsize)
+    return _session
+
+
+def set_pool_size(pool_maxsize):
+
+    '''
+    Sets the per-host connection cap of the shared session.
+
+    Parameter:
+        pool_maxsize (int): Maximum number of connections kept open per host.
+    '''
+
+    global _session, _pool_maxsize
+    with _session_lock:
+        _pool_maxsize = max(1, pool_maxsize)
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _fetch(url, timeout=None, **kwargs):
+
+    '''
+    Sends a GET request through the shared session.
+
+    Parameter:
+        url (string): Url to fetch.
+        timeout (int, optional): Timeout in seconds, defaults to constants.HTTP_TIMEOUT.
+
+    Returns:
+        requests.Response: Response of the request.
+    '''
+
+    if timeout is None:
+        timeout = constants.HTTP_TIMEOUT
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+
+def _build_root(url):
+
+    '''
+    Returns the url of the build directory the artifact url belongs to, None for urls outside a build.
+    '''
+
+    if not url.startswith(constants.PROW_VIEW_URL):
+        return None
+    match = _build_root_re.match(url[len(constants.PROW_VIEW_URL):])
+    if match is None:
+        return None
+    return constants.PROW_VIEW_URL + match.group(1)
+
+
+def _is_finished_build_artifact(url):
+
+    '''
+    Checks if the url is an artifact of a build which has finished.json, such artifacts never change.
+    '''
+
+    build_root = _build_root(url)
+    if build_root is None:
+        return False
+    finished_url = build_root + "/finished.json"
+    if url == finished_url:
+        return True
+    try:
+        return get(finished_url).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def _load_or_fetch(url, timeout=None):
+
+    '''
+    Gets a url from the on-disk artifact cache, fetching and caching it when missing.
+    Only artifacts of finished builds are written to the disk cache.
+    '''
+
+    if _build_root(url) is not None:
+        response = artifact_cache.load(url)
+        if response is not None:
+            return response
+    response = _fetch(url, timeout)
+    if response.status_code == 200 and _is_finished_build_artifact(url):
+        artifact_cache.store(url, response)
+    return response
+
+
+def _is_cacheable(response):
+    return response.status_code < 500
+
+
+def _store(url, response):
+    global _cache_bytes
+    size = len(response.content)
+    if size > constants.RESPONSE_CACHE_MAX_BYTES:
+        return
+    _cache[url] = response
+    _cache_bytes += size
+    while _cache_bytes > constants.RESPONSE_CACHE_MAX_BYTES:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= len(evicted.content)
+
+
+def get(url, timeout=None, cache=True):
+
+    '''
+    Gets a url, each url is fetched at most once per run.
+
+    Artifacts of finished builds are also kept in the on-disk artifact cache
+    and are read from there by later runs. Concurrent callers asking for a
+    url which is being fetched wait for that fetch instead of sending their
+    own request. Server errors and failed requests are not cached.
+
+    Parameter:
+        url (string): Url to fetch.
+        timeout (int, optional): Timeout in seconds, defaults to constants.HTTP_TIMEOUT.
+        cache (bool, optional): Set to False to always send a request.
+
+    Returns:
+        requests.Response: Response of the request.
+    '''
+
+    if not cache:
+        return _fetch(url, timeout)
+    with _cache_lock:
+        response = _cache.get(url)
+        if response is not None:
+            _cache.move_to_end(url)
+            return response
+        in_flight = _in_flight.get(url)
+        if in_flight is None:
+            in_flight = _in_flight[url] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return in_flight.result()
+    try:
+        response = _load_or_fetch(url, timeout)
+    except BaseException as e:
+        with _cache_lock:
+            del _in_flight[url]
+        in_flight.set_exception(e)
+        raise
+    with _cache_lock:
+        if _is_cacheable(response):
+            _store(url, response)
+        del _in_flight[url]
+    in_flight.set_result(response)
+    return response
+
+
+def get_cached(url):
+
+    '''
+    Returns the response of a url from the in-memory or the on-disk cache, None if it is not cached.
+    '''
+
+    with _cache_lock:
+        response = _cache.get(url)
+        if response is not None:
+            _cache.move_to_end(url)
+            return response
+    if _build_root(url) is None:
+        return None
+    response = artifact_cache.load(url)
+    if response is not None:
+        with _cache_lock:
+            _store(url, response)
+    return response
+
+
+def put(url, response):
+
+    '''
+    Adds a response fetched outside of get() to the caches, as if get() had fetched it.
+
+    Parameter:
+        url (string): Url of the response.
+        response (requests.Response): Response with its body read.
+    '''
+
+    if response.status_code == 200 and _is_finished_build_artifact(url):
+        artifact_cache.store(url, response)
+    if _is_cacheable(response):
+        with _cache_lock:
+            if url not in _cache:
+                _store(url, response)
+
+
+def _keep(url, response, chunks):
+
+    '''
+    Caches a streamed response which was read to the end like get() would.
+    '''
+
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    if response.status_code == 200 and _is_finished_build_artifact(url):
+        artifact_cache.store(url, response)
+    if _is_cacheable(response):
+        with _cache_lock:
+            _store(url, response)
+
+
+def iter_text(url, chunk_size=None, timeout=None):
+
+    '''
+    Yields the body of a url as text while it downloads, so a caller which
+    finds what it needs early can stop reading and the rest is never
+    downloaded. A body read to the end is cached like get() would, a body
+    which is already cached is yielded from the cache.
+
+    Use with contextlib.closing so the connection is released when the caller stops early.
+
+    Parameter:
+        url (string): Url to fetch.
+        chunk_size (int, optional): Bytes read at a time, defaults to constants.STREAM_CHUNK_SIZE.
+        timeout (int, optional): Timeout in seconds, defaults to constants.HTTP_TIMEOUT.
+
+    Returns:
+        generator: Decoded chunks of the body.
+    '''
+
+    response = get_cached(url)
+    if response is not None:
+        yield response.text
+        return
+    if chunk_size is None:
+        chunk_size = constants.STREAM_CHUNK_SIZE
+    response = _fetch(url, timeout, stream=True)
+    try:
+        if response.encoding is None:
+            response.encoding = "utf-8"
+        decoder = codecs.getincrementaldecoder(response.encoding)(errors="replace")
+        chunks = []
+        for chunk in response.iter_content(chunk_size):
+            chunks.append(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+    finally:
+        response.close()
+    # The whole body was read, keep it for later get() and iter_text() calls.
+    _keep(url, response, chunks)
+
+
+def iter_content(url, chunk_size=None, timeout=None):
+
+    '''
+    Yields the body of a url as bytes while it downloads, so a caller can
+    parse it incrementally. A body read to the end is cached like get()
+    would, a body which is already cached is yielded from the cache.
+
+    Use with contextlib.closing so the connection is released when the caller stops early.
+
+    Parameter:
+        url (string): Url to fetch.
+        chunk_size (int, optional): Bytes read at a time, defaults to constants.STREAM_CHUNK_SIZE.
+        timeout (int, optional): Timeout in seconds, defaults to constants.HTTP_TIMEOUT.
+
+    Returns:
+        generator: Chunks of the body.
+    '''
+
+    response = get_cached(url)
+    if response is not None:
+        yield response.content
+        return
+    if chunk_size is None:
+        chunk_size = constants.STREAM_CHUNK_SIZE
+    response = _fetch(url, timeout, stream=True)
+    try:
+        chunks = []
+        for chunk in response.iter_content(chunk_size):
+            chunks.append(chunk)
+            yield chunk
+    finally:
+        response.close()
+    _keep(url, response, chunks)
+
+
+def clear_cache():
+
+    '''
+    Drops every cached response.
+    '''
+
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
@@ -0,0 +1,464 @@
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+import constants
+import job_history
+
+_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+_spylink_re = re.compile(r"/([^/]+)/(\d+)/?$")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS builds (
+    spylink TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    ci_name TEXT NOT NULL,
+    build_id INTEGER NOT NULL,
+    started TEXT NOT NULL,
+    result TEXT NOT NULL,
+    job_status TEXT,
+    install_status TEXT,
+    lease TEXT,
+    nightly TEXT
+);
+CREATE INDEX IF NOT EXISTS builds_job_started ON builds (job_name, started);
+CREATE TABLE IF NOT EXISTS build_results (
+    spylink TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    output TEXT NOT NULL,
+    PRIMARY KEY (spylink, name)
+);
+CREATE TABLE IF NOT EXISTS failed_testcases (
+    spylink TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    testcase TEXT NOT NULL,
+    PRIMARY KEY (spylink, suite, position)
+);
+CREATE INDEX IF NOT EXISTS failed_testcases_testcase ON failed_testcases (testcase, spylink);
+CREATE TABLE IF NOT EXISTS indexed_builds (
+    spylink TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    build_id INTEGER NOT NULL,
+    started TEXT
+);
+CREATE TABLE IF NOT EXISTS testcase_index (
+    testcase_key TEXT NOT NULL,
+    testcase TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    spylink TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS testcase_index_key ON testcase_index (testcase_key);
+CREATE INDEX IF NOT EXISTS testcase_index_spylink ON testcase_index (spylink, testcase);
+CREATE TABLE IF NOT EXISTS build_nightlies (
+    spylink TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    build_id INTEGER NOT NULL,
+    lease TEXT,
+    nightly TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS build_nightlies_job ON build_nightlies (job_name, build_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    job_name TEXT PRIMARY KEY,
+    last_build_id INTEGER NOT NULL,
+    synced_at TEXT NOT NULL
+);
+'''
+
+
+def normalize_testcase(name):
+
+    '''
+    Normalizes a testcase name for the testcase index, i.e. case and whitespace insensitive.
+
+    Parameter:
+        name (string): Testcase name.
+
+    Returns:
+        string: Key of the testcase in the index.
+    '''
+
+    return " ".join(name.split()).lower()
+
+
+def format_date(date):
+
+    '''
+    Converts a datetime to the format the build start times are stored in.
+
+    Parameter:
+        date (datetime): Date to convert.
+
+    Returns:
+        string: Date in the %Y-%m-%dT%H:%M:%S format.
+    '''
+
+    return date.strftime(_DATE_FORMAT)
+
+
+class HistoryStore:
+
+    '''
+    SQLite database holding one row per finished build with its status, install status, lease and nightly,
+    the failed testcases of the build and the results the CI_JobHistory.py query options print for it.
+
+    Set as monitor.BUILD_STORE the listings are answered by indexed queries of the database and the build
+    evaluations of monitor (brief_build_info, detailed_build_info and build_tc_failures) are read from it
+    instead of the build artifacts.
+    '''
+
+    def __init__(self, db_file=None):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file or constants.HISTORY_DB_FILE, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_jobs_with_date(self, job_name, start_date, end_date):
+
+        '''
+        Gets the synced builds of a CI run in the given date range.
+
+        Parameter:
+            job_name (string): CI link of the builds.
+            start_date (datetime): Before date(Future)
+            end_date (datetime): After date(Past)
+
+        Returns:
+            list(string): Spylinks of the builds, newest first.
+        '''
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT spylink FROM builds WHERE job_name = ? AND started BETWEEN ? AND ? ORDER BY build_id DESC",
+                (job_name, format_date(end_date), format_date(start_date))).fetchall()
+        return [row["spylink"] for row in rows]
+
+    def get_build(self, spylink):
+
+        '''
+        Gets the row of a synced build.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+
+        Returns:
+            sqlite3.Row: Columns of the builds table, None if the build is not synced.
+        '''
+
+        with self._lock:
+            return self._conn.execute("SELECT * FROM builds WHERE spylink = ?", (spylink,)).fetchone()
+
+    def has_build(self, spylink):
+        return self.get_build(spylink) is not None
+
+    def get_result(self, spylink, name):
+
+        '''
+        Gets a stored result of a build.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+            name (string): Name of the result.
+
+        Returns:
+            tuple: Value and the printed text of the result, (None, "") if it is not stored.
+        '''
+
+        with self._lock:
+            row = self._conn.execute("SELECT value, output FROM build_results WHERE spylink = ? AND name = ?",
+                                     (spylink, name)).fetchone()
+        if row is None:
+            return None, ""
+        return json.loads(row["value"]), row["output"]
+
+    def get_failed_testcases(self, spylink):
+
+        '''
+        Gets the failed testcases of a build.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+
+        Returns:
+            dict: Failed testcases of every testsuite, in the order get_all_failed_tc returned them.
+        '''
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT suite, testcase FROM failed_testcases WHERE spylink = ? ORDER BY rowid", (spylink,)).fetchall()
+        failed_tc = {}
+        for row in rows:
+            failed_tc.setdefault(row["suite"], []).append(row["testcase"])
+        return failed_tc
+
+    def has_failed_testcase(self, spylink, testcase):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM failed_testcases WHERE testcase = ? AND spylink = ?",
+                                     (testcase, spylink)).fetchone()
+        return row is not None
+
+    def store_build(self, build, job_name, ci_name, evaluation):
+
+        '''
+        Inserts or replaces a build.
+
+        Parameter:
+            build (ListedBuild): Listing record of the build.
+            job_name (string): CI link of the build.
+            ci_name (string): CI name of the build.
+            evaluation (dict): lease, nightly, job_status, install_status, results ({name: (value, printed text)})
+                               and failed_testcases ({suite: [testcase]}) of the build.
+        '''
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (build.spylink, job_name, ci_name, int(build.id), format_date(build.started), build.result,
+                 evaluation["job_status"], evaluation["install_status"], evaluation["lease"], evaluation["nightly"]))
+            self._conn.execute("DELETE FROM build_results WHERE spylink = ?", (build.spylink,))
+            self._conn.executemany(
+                "INSERT INTO build_results VALUES (?, ?, ?, ?)",
+                [(build.spylink, name, json.dumps(value), output) for name, (value, output) in evaluation["results"].items()])
+            self._conn.execute("DELETE FROM failed_testcases WHERE spylink = ?", (build.spylink,))
+            self._conn.executemany(
+                "INSERT INTO failed_testcases VALUES (?, ?, ?, ?)",
+                [(build.spylink, suite, position, testcase)
+                 for suite, testcases in evaluation["failed_testcases"].items()
+                 for position, testcase in enumerate(testcases)])
+
+    def get_last_build_id(self, job_name):
+
+        '''
+        Gets the sync cursor of a CI.
+
+        Parameter:
+            job_name (string): CI link.
+
+        Returns:
+            int: Id of the newest build synced with all the older builds, None if the CI was never synced.
+        '''
+
+        with self._lock:
+            row = self._conn.execute("SELECT last_build_id FROM sync_state WHERE job_name = ?", (job_name,)).fetchone()
+        return row["last_build_id"] if row else None
+
+    def set_last_build_id(self, job_name, build_id):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                               (job_name, build_id, format_date(datetime.now())))
+
+    def index_build(self, spylink, failed_tc, started=None):
+
+        '''
+        Adds the failed testcases of an analysed build to the testcase index.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+            failed_tc (dict): Failed testcases of every testsuite as returned by get_all_failed_tc.
+            started (datetime, optional): Start time of the build from its listing, the creation time
+                                          encoded in the build id by default, so indexing costs no request.
+        '''
+
+        match = _spylink_re.search(spylink)
+        if not match:
+            return
+        started = started or job_history.build_created(match.group(2))
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO indexed_builds VALUES (?, ?, ?, ?)",
+                               (spylink, match.group(1), int(match.group(2)), format_date(started)))
+            self._conn.execute("DELETE FROM testcase_index WHERE spylink = ?", (spylink,))
+            self._conn.executemany(
+                "INSERT INTO testcase_index VALUES (?, ?, ?, ?)",
+                [(normalize_testcase(testcase), testcase, suite, spylink)
+                 for suite, testcases in failed_tc.items() for testcase in set(testcases)])
+
+    def is_indexed(self, spylink):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM indexed_builds WHERE spylink = ?", (spylink,)).fetchone()
+        return row is not None
+
+    def has_indexed_failure(self, spylink, testcase):
+
+        '''
+        Checks the testcase index for a testcase failure of an indexed build.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+            testcase (string): Exact testcase name.
+
+        Returns:
+            bool: True if the testcase failed in any testsuite of the build.
+        '''
+
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM testcase_index WHERE spylink = ? AND testcase = ?",
+                                     (spylink, testcase)).fetchone()
+        return row is not None
+
+    def find_testcase_failures(self, name, match="exact", since=None, job_names=None):
+
+        '''
+        Looks up the indexed builds in which a testcase failed.
+
+        Parameter:
+            name (string): Testcase name, normalized with normalize_testcase.
+            match (string, optional): "exact", "prefix" or "substring" match of the normalized name.
+            since (datetime, optional): Oldest build start time.
+            job_names (list, optional): CI links of the builds, all CIs by default.
+
+        Returns:
+            list(sqlite3.Row): testcase, suite, job_name, build_id, spylink and started of the failures, newest first.
+        '''
+
+        key = normalize_testcase(name)
+        if match == "exact":
+            condition, params = "i.testcase_key = ?", [key]
+        elif match == "prefix":
+            condition, params = "i.testcase_key >= ? AND i.testcase_key < ?", [key, key + "\U0010ffff"]
+        elif match == "substring":
+            condition, params = "instr(i.testcase_key, ?) > 0", [key]
+        else:
+            raise ValueError(f"Unknown match {match}, supported values are exact, prefix and substring")
+        if since is not None:
+            condition += " AND b.started >= ?"
+            params.append(format_date(since))
+        if job_names:
+            condition += " AND b.job_name IN (" + ", ".join("?" * len(job_names)) + ")"
+            params.extend(job_names)
+        with self._lock:
+            return self._conn.execute(
+                "SELECT i.testcase, i.suite, b.job_name, b.build_id, b.spylink, b.started FROM testcase_index i "
+                "JOIN indexed_builds b ON b.spylink = i.spylink WHERE " + condition +
+                " ORDER BY b.build_id DESC, i.suite, i.testcase", params).fetchall()
+
+    def index_build_log(self, spylink, lease, nightly):
+
+        '''
+        Adds the lease and the nightly image found in the build log of a build to the nightly index.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+            lease (string): Acquired lease, None if lease is not applicable.
+            nightly (string): Nightly image(s) used, one per line for upgrade jobs.
+        '''
+
+        match = _spylink_re.search(spylink)
+        if not match:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO build_nightlies VALUES (?, ?, ?, ?, ?)",
+                               (spylink, match.group(1), int(match.group(2)), lease, nightly))
+
+    def get_indexed_build_log(self, spylink):
+
+        '''
+        Gets the lease and the nightly image of a build from the nightly index.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+
+        Returns:
+            tuple: Lease and nightly image as found in the build log, None if the build is not indexed.
+        '''
+
+        with self._lock:
+            row = self._conn.execute("SELECT lease, nightly FROM build_nightlies WHERE spylink = ?", (spylink,)).fetchone()
+        if row is None:
+            return None
+        return row["lease"], row["nightly"]
+
+    def get_indexed_nightlies(self, job_name, since=None):
+
+        '''
+        Gets the builds of a CI in the nightly index.
+
+        Parameter:
+            job_name (string): CI link of the builds.
+            since (datetime, optional): Oldest creation time of the builds, compared with the time encoded in the build ids.
+
+        Returns:
+            list(sqlite3.Row): spylink, job_name, build_id, lease and nightly of the builds, oldest first.
+        '''
+
+        condition, params = "job_name = ?", [job_name]
+        if since is not None:
+            condition += " AND build_id >= ?"
+            params.append(job_history.build_id_at(since))
+        with self._lock:
+            return self._conn.execute("SELECT * FROM build_nightlies WHERE " + condition + " ORDER BY build_id",
+                                      params).fetchall()
+
+    def filter_build(self, spylink, zone=None, job_filter="all"):
+
+        '''
+        Applies the job_filter and zone options to a synced build like the live evaluations do, see job_history.filter_build.
+
+        Parameter:
+            spylink (string): SpyglassLink of the build.
+            zone (list, optional): Zones/leases that need to be checked.
+            job_filter (string, optional): 'all', 'success' or 'failure'.
+
+        Returns:
+            string: "filtered" if dropped by job_filter, "zone_mismatch" if dropped by zone, None if it is kept.
+        '''
+
+        build = self.get_build(spylink)
+        return job_history.filter_build(build["result"] if build else None, lambda: build["lease"] if build else None,
+                                        lambda: build["install_status"] if build else None, zone, job_filter)
+
+    def brief_build_info(self, build, prow_ci_name, zone=None, job_filter='All'):
+
+        '''
+        Gets the result of monitor.get_brief_build_info for a synced build.
+
+        Returns:
+            tuple: Brief information of the build (None if it is filtered out) and the text printed for it.
+        '''
+
+        if self.filter_build(build, zone, job_filter):
+            return None, ""
+        job_dict, output = self.get_result(build, "brief")
+        if job_dict is not None:
+            job_dict["Job"] = prow_ci_name
+        return job_dict, output
+
+    def detailed_build_info(self, build, prow_ci_name, zone=None, job_filter="all"):
+
+        '''
+        Gets the result of monitor.get_detailed_build_info for a synced build.
+
+        Returns:
+            tuple: Build information as get_detailed_build_info returns it and the text printed for it.
+        '''
+
+        build_info = {"filtered": False, "zone_mismatch": False, "deploy": 0, "e2e": 0, "output": ""}
+        dropped = self.filter_build(build, zone, job_filter)
+        if dropped:
+            build_info[dropped] = True
+            return build_info, ""
+        stored, output = self.get_result(build, "detailed")
+        return stored or build_info, output
+
+    def build_tc_failures(self, spylink, zone=None):
+
+        '''
+        Gets the result of monitor.get_build_tc_failures for a synced build.
+
+        Returns:
+            tuple: Failed testcases of all testsuites (empty if the build is skipped) and the text printed for it.
+        '''
+
+        if self.filter_build(spylink, zone):
+            return {}, ""
+        build = self.get_build(spylink)
+        if build is None or build["install_status"] != 'SUCCESS':
+            return {}, ""
+        _, output = self.get_result(spylink, "tc_failures")
+        return self.get_failed_testcases(spylink), output
@@ -0,0 +1,196 @@
+import html
+import json
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+import constants
+
+# Assignment of the allBuilds array, other mentions of the name (e.g. in comments or other scripts) are skipped.
+_ALL_BUILDS_re = re.compile(rb"\ballBuilds\s*=\s*(?=\[)")
+_SCRIPT_END = b"</script>"
+_OLDER_RUNS = b"Older Runs"
+_HREF = b'href="'
+
+_decoder = json.JSONDecoder()
+
+
+class ListedBuild(namedtuple("ListedBuild", ["id", "spylink", "started", "result"])):
+
+    '''
+    Build listed on a Prow job history page.
+
+    id (string): Build id.
+    spylink (string): SpyglassLink of the build.
+    started (datetime): Start time of the build.
+    result (string): Result of the build, PENDING while it is running.
+    '''
+
+    __slots__ = ()
+
+
+class JobHistoryPage(namedtuple("JobHistoryPage", ["builds", "older_link"])):
+
+    '''
+    Parsed Prow job history page.
+
+    builds (list): ListedBuild of the page, newest first.
+    older_link (string): Path of the page with the older runs, None on the last page.
+    '''
+
+    __slots__ = ()
+
+
+def parse_started(started):
+
+    '''
+    Converts the Started value of a listed build to datetime.
+
+    Parameter:
+        started (string): Start time in the %Y-%m-%dT%H:%M:%SZ format.
+
+    Returns:
+        datetime: Start time.
+    '''
+
+    return datetime.strptime(started, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_id_at(date):
+
+    '''
+    Gets the lowest build id Prow assigns to a build created at date.
+
+    Prow build ids are snowflake ids, their high bits are the creation time in milliseconds,
+    so build ids sort like the creation time of the builds.
+
+    Parameter:
+        date (datetime): Creation time, naive datetimes are taken as UTC.
+
+    Returns:
+        int: Build id.
+    '''
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    milliseconds = int(date.timestamp() * 1000) - constants.PROW_BUILD_ID_EPOCH_MS
+    return max(milliseconds, 0) << 22
+
+
+def build_created(build_id):
+
+    '''
+    Gets the time Prow created a build at from its build id, see build_id_at.
+
+    Parameter:
+        build_id (int or string): Build id.
+
+    Returns:
+        datetime: Creation time (UTC, naive like the listed start times), a few seconds before the build started.
+    '''
+
+    milliseconds = (int(build_id) >> 22) + constants.PROW_BUILD_ID_EPOCH_MS
+    return datetime.fromtimestamp(milliseconds / 1000, timezone.utc).replace(tzinfo=None)
+
+
+def filter_build(listed_result, lease, install_status, zone=None, job_filter="all"):
+
+    '''
+    Applies the job_filter and zone options to a build, the live evaluations and the history
+    database share it so both keep the same builds. The filters go from the cheapest field to the
+    most expensive one: the listed result costs no request, the lease the head of the build log and
+    the install status the step files.
+
+    Parameter:
+        listed_result (string): Result of the build in its listing, None if it is not known.
+        lease (function): Called without arguments for the lease of the build.
+        install_status (function): Called without arguments for the cluster deployment status of the build.
+        zone (list, optional): Zones/leases that need to be checked.
+        job_filter (string, optional): 'all' (default), 'success' or 'failure'.
+
+    Returns:
+        string: "filtered" if dropped by job_filter, "zone_mismatch" if dropped by zone, None if it is kept.
+    '''
+
+    job_filter = job_filter.lower()
+    # A build which passed had its cluster installed, the failure filter drops it before its lease is read.
+    if job_filter == "failure" and listed_result == "SUCCESS":
+        return "filtered"
+    if zone is not None and lease() not in zone:
+        return "zone_mismatch"
+    if job_filter == "success" and install_status() in ("FAILURE", "ERROR"):
+        return "filtered"
+    if job_filter == "failure" and install_status() == "SUCCESS":
+        return "filtered"
+    return None
+
+
+def _extract_all_builds(raw):
+
+    '''
+    Decodes the allBuilds array of the page.
+
+    Parameter:
+        raw (bytes): Body of the job history page.
+
+    Returns:
+        list: Decoded allBuilds entries, None if the page does not have them.
+    '''
+
+    match = _ALL_BUILDS_re.search(raw)
+    if match is None:
+        return None
+    end = raw.find(_SCRIPT_END, match.end())
+    if end == -1:
+        end = len(raw)
+    all_builds, _ = _decoder.raw_decode(raw[match.end():end].decode("utf-8", errors="replace"))
+    return all_builds
+
+
+def _extract_older_link(raw):
+
+    '''
+    Gets the href of the "Older Runs" link of the page.
+
+    Parameter:
+        raw (bytes): Body of the job history page.
+
+    Returns:
+        string: Path of the older runs page, None if the page does not link one.
+    '''
+
+    label = raw.find(_OLDER_RUNS)
+    if label == -1:
+        return None
+    href = raw.rfind(_HREF, 0, label)
+    if href == -1:
+        return None
+    href += len(_HREF)
+    end = raw.find(b'"', href, label)
+    if end == -1:
+        return None
+    return html.unescape(raw[href:end].decode("utf-8", errors="replace"))
+
+
+def parse_page(raw):
+
+    '''
+    Extracts the builds and the older runs link of a Prow job history page without building a DOM.
+
+    Parameter:
+        raw (bytes): Body of the job history page.
+
+    Returns:
+        JobHistoryPage: Parsed page, None if the page does not list builds.
+
+    Raises:
+        json.JSONDecodeError: If the allBuilds array is malformed.
+    '''
+
+    all_builds = _extract_all_builds(raw)
+    if all_builds is None:
+        return None
+    builds = [
+        ListedBuild(ele.get("ID"), ele["SpyglassLink"], parse_started(ele["Started"]), ele["Result"])
+        for ele in all_builds
+    ]
+    return JobHistoryPage(builds, _extract_older_link(raw))
@@ -0,0 +1,114 @@
+import xml.etree.ElementTree as ET
+
+
+def _iter_events(chunks):
+
+    '''
+    Parses a junit XML document while it downloads.
+
+    Every testcase and every child of the root element is cleared once its end is parsed,
+    so only the elements which are still open are held in memory.
+
+    Parameter:
+        chunks (iterable): Chunks of the body of the junit file as bytes.
+
+    Yields:
+        tuple: ("testcase", depth, name, failed) when a testcase ends, depth 0 being the root,
+               and ("child", name) when a child of the root ends.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is malformed.
+    '''
+
+    parser = ET.XMLPullParser(("start", "end"))
+    root = None
+    depth = -1
+
+    def read_events():
+        nonlocal root, depth
+        for event, elem in parser.read_events():
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == "testcase":
+                yield "testcase", depth, elem.get("name"), elem.find("failure") is not None
+            if depth == 1:
+                yield "child", elem.get("name")
+                # The children of the root are not needed once their end is parsed.
+                root.clear()
+            elif elem.tag == "testcase":
+                elem.clear()
+            depth -= 1
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from read_events()
+    parser.close()
+    yield from read_events()
+
+
+def iter_failed_testcases(chunks):
+
+    '''
+    Yields the names of the failed testcases below the root element of a junit file.
+
+    Parameter:
+        chunks (iterable): Chunks of the body of the junit file as bytes.
+
+    Yields:
+        string: Name of a testcase which has a failure element.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is malformed.
+    '''
+
+    for event in _iter_events(chunks):
+        if event[0] == "testcase" and event[1] > 0 and event[3]:
+            yield event[2]
+
+
+def iter_failed_monitor_testcases(chunks):
+
+    '''
+    Yields the names of the failed testcases of a monitor tests junit file which did not pass on a retry.
+
+    A flaky testcase is reported as a failed and a passed testcase of the same name. The n-th testcase of the
+    document is compared with the children n - 1 and n + 1 of the root element, a failure counts when both
+    exist and neither has the name of the testcase. Only the names of the children which can still be
+    compared are kept while the document is parsed.
+
+    Parameter:
+        chunks (iterable): Chunks of the body of the junit file as bytes.
+
+    Yields:
+        string: Name of a failed testcase.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is malformed.
+    '''
+
+    # Index of a child of the root -> its name.
+    children = {}
+    n_children = 0
+    n_testcases = 0
+    # Failed testcases waiting for their neighbours, in document order: [index, name].
+    pending = []
+
+    for event in _iter_events(chunks):
+        if event[0] == "testcase":
+            if event[3]:
+                pending.append([n_testcases, event[2]])
+            n_testcases += 1
+        else:
+            children[n_children] = event[1]
+            n_children += 1
+        while pending and pending[0][0] + 1 < n_children:
+            index, name = pending.pop(0)
+            if index - 1 in children and children[index - 1] != name and children[index + 1] != name:
+                yield name
+        # Children before the previous neighbour of the oldest testcase which can still fail are never compared again.
+        oldest = pending[0][0] if pending else n_testcases
+        for index in [index for index in children if index < oldest - 1]:
+            del children[index]
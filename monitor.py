@@ -1,17 +1,220 @@
+import collections
+import contextlib
+import functools
+import html
+import io
+import itertools
 import json
 import re
 import sys
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 import urllib3
 import requests
-import time
-from datetime import datetime , timedelta
+from datetime import datetime , timedelta, timezone
 import xml.etree.ElementTree as ET
+import build_log
 import constants
+import fetcher
+import job_history
+import junit
+import tc_frequency
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 PROW_URL = ""
-final_job_list=[]
+# Source of the build listings, "html" scrapes the Prow job history pages, "gcs" reads the build directories in GCS.
+LISTING_BACKEND = "html"
+LISTING_BACKENDS = ("html", "gcs")
+# State of a prowjob.json -> result of the build as the job history pages list it.
+_PROWJOB_STATES = {"success": "SUCCESS", "failure": "FAILURE", "aborted": "ABORTED", "error": "ERROR"}
+WORKERS = 1
+# Fetch the artifacts of a batch of builds with async_fetch before evaluating them, see set_async_fetch.
+ASYNC_FETCH = False
+# Probe name -> number of builds it was executed for by the prefetches of the run, see print_probe_counts.
+PROBE_COUNTS = collections.Counter()
+_probe_counts_lock = threading.Lock()
+# History store answering the listings and build evaluations from the local database, see history_db.py.
+BUILD_STORE = None
+# Testcase index the failed testcases of every analysed build are added to, see history_db.py.
+TESTCASE_INDEX = None
+# Index of the lease and the nightly image of the analysed builds, see history_db.py.
+NIGHTLY_INDEX = None
+# File names looked up in the artifact directory listings of a build.
+_e2e_summary_filename_re = re.compile(r'(test-failures-summary_2[^.]*\.json)')
+_monitor_summary_filename_re = re.compile(r'(test-failures-summary_monitor_2[^.]*\.json)')
+_monitor_junit_filename_re = re.compile(r'(e2e-monitor-tests__2[^.]*\.xml)')
+_kdump_filename_re = re.compile(r'kdump\.tar')
+_href_re = re.compile(r'<a\s[^>]*?href="([^"]*)"')
+# Parts of a SpyglassLink, see job_classifier and job_version.
+_job_type_re = re.compile(r'ocp.*?/')
+_mce_job_type_re = re.compile(r'e2e.*?/')
+_version_re = re.compile(r"(\d+\.\d+)")
+# Parsed directory listings of the run, url -> DirectoryListing, see get_directory_listing.
+_listings = collections.OrderedDict()
+_listings_lock = threading.Lock()
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+class _ThreadOutput:
+
+    '''
+    Stand-in for sys.stdout which sends writes from a thread evaluating a build
+    into that build's buffer, so output of concurrent builds can be replayed in order.
+    '''
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            return self._stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _Deferred:
+
+    '''
+    Runs a call only when its result is requested, used in place of a future when WORKERS is 1.
+    '''
+
+    def __init__(self, func, args):
+        self._func = func
+        self._args = args
+
+    def result(self):
+        return self._func(*self._args)
+
+
+def set_workers(workers):
+
+    '''
+    Sets the number of builds evaluated concurrently.
+
+    Parameter:
+        workers (int): Number of worker threads, 1 evaluates builds serially.
+    '''
+
+    global WORKERS
+    with _executor_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=True)
+        _executors.clear()
+    WORKERS = max(1, workers)
+    fetcher.set_pool_size(max(constants.HTTP_POOL_MAXSIZE, WORKERS))
+
+
+def set_async_fetch(enabled):
+
+    '''
+    Enables fetching the artifacts of all the builds of a batch concurrently on an event loop before they are evaluated.
+
+    Parameter:
+        enabled (bool): True to prefetch with async_fetch.
+    '''
+
+    global ASYNC_FETCH
+    if enabled:
+        # aiohttp is only needed for the prefetch, a missing install fails here rather than mid run.
+        import async_fetch
+    ASYNC_FETCH = enabled
+
+
+def run_captured(func, *args):
+
+    '''
+    Calls func with its printed output captured.
+
+    Returns:
+        tuple: Return value of func and the text it printed.
+    '''
+
+    if not isinstance(sys.stdout, _ThreadOutput):
+        sys.stdout = _ThreadOutput(sys.stdout)
+    buffer = io.StringIO()
+    previous = getattr(sys.stdout._local, "buffer", None)
+    sys.stdout._local.buffer = buffer
+    try:
+        result = func(*args)
+    finally:
+        sys.stdout._local.buffer = previous
+    return result, buffer.getvalue()
+
+
+def _submit(pool, func, *args):
+
+    '''
+    Schedules func(*args) on the named worker pool with its printed output captured.
+
+    Returns:
+        Future like object whose result() is a tuple of the return value and the printed text.
+    '''
+
+    if WORKERS <= 1:
+        return _Deferred(run_captured, (func,) + args)
+    with _executor_lock:
+        if pool not in _executors:
+            _executors[pool] = ThreadPoolExecutor(max_workers=WORKERS)
+        executor = _executors[pool]
+    return executor.submit(run_captured, func, *args)
+
+
+def submit_build_task(func, *args):
+
+    '''
+    Schedules the evaluation of a single build on the shared build pool.
+
+    Returns:
+        Future like object whose result() is a tuple of the return value and the printed text.
+    '''
+
+    return _submit("build", func, *args)
+
+
+def submit_ci_task(func, *args):
+
+    '''
+    Schedules the pipeline of a single CI, i.e. fetching its builds and collecting their results.
+    CI tasks wait on build tasks so they get their own pool, the builds of all CIs share the build pool.
+
+    Returns:
+        Future like object whose result() is a tuple of the return value and the printed text.
+    '''
+
+    return _submit("ci", func, *args)
+
+
+def run_for_each_ci(ci_list, func, *args):
+
+    '''
+    Runs func(ci_name, ci_link, *args) for every CI concurrently and prints their output in ci_list order.
+
+    Parameter:
+        ci_list (dict): CI names and links.
+        func: Pipeline run for a single CI.
+
+    Returns:
+        list: Return values of func in ci_list order.
+    '''
+
+    tasks = [submit_ci_task(func, ci_name, ci_link, *args) for ci_name, ci_link in ci_list.items()]
+    results = []
+    for task in tasks:
+        result, output = task.result()
+        sys.stdout.write(output)
+        results.append(result)
+    return results
 
 
 def fetch_release_date(release):
@@ -21,10 +224,10 @@ def fetch_release_date(release):
 
     try:
         url = constants.STABLE_RELEASE_URL + release
-        response = requests.get(url, verify=False, timeout=15)
+        response = fetcher.get(url)
         if response.status_code == 404:
             url = constants.DEV_PREVIEW_RELEASE_URL + release
-            response = requests.get(url, verify=False, timeout=15)
+            response = fetcher.get(url)
             if response.status_code == 404:
                 print(f"Failed to get the release page.  {response.text}")
                 sys.exit(1)
@@ -42,7 +245,7 @@ def fetch_release_date(release):
                 a_tag = form.find("a", href=True)
                 if a_tag and "changelog" in a_tag["href"]:
                     changelog_url = constants.RELEASE_BASE_URL + a_tag["href"]
-                    changelog_resp = requests.get(changelog_url, verify=False, timeout=15)
+                    changelog_resp = fetcher.get(changelog_url)
                     if changelog_resp.status_code == 200:
                         lines = changelog_resp.text.splitlines()
                         for line in lines:
@@ -66,7 +269,7 @@ def fetch_build_time(url):
     '''
     Returns the created time (HH:MM) and date (YYYY-MM-DD) of the release in IST
     '''
-    response = requests.get(url, verify=False, timeout=15)
+    response = fetcher.get(url)
     response.raise_for_status()
     buildtime = json.loads(response.text)
     timestamp_str = buildtime["metadata"]["creationTimestamp"]    
@@ -132,6 +335,172 @@ def parse_job_date(date):
     return parse_date
 
 
+def set_listing_backend(backend):
+
+    '''
+    Sets the source used by get_jobs, get_n_recent_jobs and get_jobs_with_date to list builds.
+
+    Parameter:
+        backend (string): "html" for the Prow job history pages, "gcs" for the GCS JSON API.
+    '''
+
+    global LISTING_BACKEND
+    if backend not in LISTING_BACKENDS:
+        raise ValueError(f"Unknown listing backend {backend}, supported values are {LISTING_BACKENDS}")
+    LISTING_BACKEND = backend
+
+
+def _gcs_job_location(prow_link):
+
+    '''
+    Gets the bucket and the object prefix of the builds of a CI from PROW_URL.
+
+    Parameter:
+        prow_link (string):  keyword used to generate CI link
+
+    Returns:
+        tuple: Bucket and object prefix of the build directories.
+    '''
+
+    location = PROW_URL.split("job-history/gs/", 1)[1]
+    bucket, path = location.split("/", 1)
+    return bucket, path + prow_link + "/"
+
+
+def _gcs_build_id_offset(prefix, date):
+
+    '''
+    Gets the name of a build directory created at date, to bound the listing of the build directories.
+
+    Parameter:
+        prefix (string): Object prefix of the build directories.
+        date (datetime): Start time (UTC) of the build, constants.GCS_LISTING_ID_MARGIN is added towards the outer side by the caller.
+
+    Returns:
+        string: Object name compared with the build directories, which are ordered by name.
+    '''
+
+    return prefix + str(job_history.build_id_at(date))
+
+
+def _gcs_build_ids(bucket, prefix, since=None, until=None):
+
+    '''
+    Lists the build ids of a CI with the GCS JSON API.
+
+    Build ids grow with the creation time of the builds, so the listing is bounded to the builds created
+    between since and until with startOffset and endOffset instead of listing every build of the CI.
+
+    Parameter:
+        bucket (string): GCS bucket of the builds.
+        prefix (string): Object prefix of the build directories.
+        since (datetime, optional): Oldest start time of the builds, all the older builds by default.
+        until (datetime, optional): Newest start time of the builds, all the newer builds by default.
+
+    Returns:
+        list(string): Build ids, newest first.
+    '''
+
+    url = constants.GCS_API_URL + bucket + "/o"
+    params = {"prefix": prefix, "delimiter": "/", "fields": "prefixes,nextPageToken"}
+    margin = timedelta(seconds=constants.GCS_LISTING_ID_MARGIN)
+    if since is not None:
+        params["startOffset"] = _gcs_build_id_offset(prefix, since - margin)
+    if until is not None:
+        params["endOffset"] = _gcs_build_id_offset(prefix, until + margin)
+    build_ids = []
+    while True:
+        response = fetcher.get(url + "?" + urllib.parse.urlencode(params))
+        response.raise_for_status()
+        listing = response.json()
+        for build_prefix in listing.get("prefixes", []):
+            build_id = build_prefix[len(prefix):].rstrip("/")
+            if build_id.isdigit():
+                build_ids.append(build_id)
+        if "nextPageToken" not in listing:
+            break
+        params["pageToken"] = listing["nextPageToken"]
+    build_ids.sort(key=int, reverse=True)
+    return build_ids
+
+
+def _gcs_listed_build(bucket, prefix, build_id):
+
+    '''
+    Reads the start time and the result of a build from its prowjob.json.
+
+    prowjob.json is also read by the evaluations of the build (fetch_build_time), so listing a build
+    costs no request of its own once it is evaluated, and none at all once it is in the artifact cache.
+
+    Parameter:
+        bucket (string): GCS bucket of the builds.
+        prefix (string): Object prefix of the build directories.
+        build_id (string): Build id.
+
+    Returns:
+        ListedBuild: Listing record of the build, None if the build has not started.
+    '''
+
+    build_path = bucket + "/" + prefix + build_id
+    response = fetcher.get(constants.PROW_VIEW_URL + "/" + build_path + "/prowjob.json")
+    if response.status_code != 200:
+        return None
+    status = response.json().get("status", {})
+    if not status.get("startTime"):
+        return None
+    result = _PROWJOB_STATES.get(status.get("state"), "PENDING")
+    return job_history.ListedBuild(build_id, "/view/gs/" + build_path, job_history.parse_started(status["startTime"]), result)
+
+
+def iter_gcs_builds(prow_link, since=None, until=None):
+
+    '''
+    Lists the builds of a CI from GCS, prowjob.json of the builds is read in batches on the build pool.
+
+    Parameter:
+        prow_link (string):  keyword used to generate CI link
+        since (datetime, optional): Builds started before are not listed, they may still be yielded when created close to it.
+        until (datetime, optional): Builds started after are not listed, they may still be yielded when created close to it.
+
+    Yields:
+        ListedBuild: Builds of the CI, newest first.
+    '''
+
+    bucket, prefix = _gcs_job_location(prow_link)
+    yield from _iter_gcs_listed_builds(bucket, prefix, _gcs_build_ids(bucket, prefix, since, until))
+
+
+def _iter_gcs_listed_builds(bucket, prefix, build_ids):
+    batch_size = constants.GCS_LISTING_BATCH_SIZE
+    for i in range(0, len(build_ids), batch_size):
+        tasks = [submit_build_task(_gcs_listed_build, bucket, prefix, build_id) for build_id in build_ids[i:i + batch_size]]
+        for task in tasks:
+            build, _ = task.result()
+            if build:
+                yield build
+
+
+def _iter_recent_gcs_builds(prow_link, n):
+
+    '''
+    Lists at least the n latest builds of a CI from GCS, the listing is widened over
+    constants.GCS_RECENT_LISTING_DAYS until it holds n builds.
+
+    Yields:
+        ListedBuild: Builds of the CI, newest first.
+    '''
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    bucket, prefix = _gcs_job_location(prow_link)
+    for days in constants.GCS_RECENT_LISTING_DAYS:
+        build_ids = _gcs_build_ids(bucket, prefix, now - timedelta(days=days))
+        if len(build_ids) >= n:
+            break
+    else:
+        build_ids = _gcs_build_ids(bucket, prefix)
+    yield from _iter_gcs_listed_builds(bucket, prefix, build_ids)
+
+
 def get_jobs(prow_link):
     
     '''
@@ -144,39 +513,23 @@ def get_jobs(prow_link):
         list(strings): SpyglassLinks of jobs
     '''
 
+    if LISTING_BACKEND == "gcs":
+        return _get_jobs_gcs(prow_link)
+
     url = PROW_URL + prow_link
 
     try:
-        response = requests.get(url, verify=False, timeout=15)
+        response = fetcher.get(url)
     
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_elements = soup.find_all('script')
-            selected_script_element = None
-
-            for script_element in script_elements:
-                script_content = script_element.string
-                if script_content:
-                    if 'allBuilds' in script_content:
-                        selected_script_element = script_content
-                        break
-        
-            if selected_script_element:
-                var_name = 'allBuilds'
-                pattern = rf'{var_name}\s*=\s*(.*?);'
-
-                match = re.search(pattern, selected_script_element)
-                if match:
-                    all_jobs=match.group(1)
-                    all_jobs_parsed=json.loads(all_jobs)
-                    current_date=get_current_date().date()
-                    jobs_run_today = []
-                    for ele in all_jobs_parsed:
-                        job_time=parse_job_date(ele["Started"]).date()
-                        if job_time == current_date and ele["Result"] != "PENDING":
-                            job_log_path = ele["SpyglassLink"]
-                            jobs_run_today.append(job_log_path)
-                    return jobs_run_today                    
+            page = job_history.parse_page(response.content)
+            if page:
+                current_date=get_current_date().date()
+                jobs_run_today = []
+                for build in page.builds:
+                    if build.started.date() == current_date and build.result != "PENDING":
+                        jobs_run_today.append(listed_record(build))
+                return jobs_run_today
         else:
             return "Failed to get the prowCI response"
         
@@ -200,38 +553,18 @@ def get_n_recent_jobs(prow_link,n):
         list(strings): SpyglassLinks of jobs
     '''
 
-    url = PROW_URL + prow_link
+    if LISTING_BACKEND == "gcs":
+        return _get_n_recent_jobs_gcs(prow_link, n)
 
     try:
-        response = requests.get(url, verify=False, timeout=15)
-    
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_elements = soup.find_all('script')
-            selected_script_element = None
-
-            for script_element in script_elements:
-                script_content = script_element.string
-                if script_content:
-                    if 'allBuilds' in script_content:
-                        selected_script_element = script_content
-                        break
-        
-            if selected_script_element:
-                var_name = 'allBuilds'
-                pattern = rf'{var_name}\s*=\s*(.*?);'
-
-                match = re.search(pattern, selected_script_element)
-                if match:
-                    all_jobs=match.group(1)
-                    all_jobs_parsed=json.loads(all_jobs)
-                    n_jobs=[]
-                    for ele in all_jobs_parsed[:n]:
-                        if ele["Result"] != "PENDING":
-                            n_jobs.append(ele["SpyglassLink"])
-                    return n_jobs                   
-        else:
-            return "Failed to get the prowCI response"
+        n_jobs=[]
+        # The first page lists about 20 builds, older pages are only fetched when n needs them.
+        for build in itertools.islice(iter_job_history(prow_link), n):
+            if build.result != "PENDING":
+                n_jobs.append(listed_record(build))
+        return n_jobs
+    except requests.HTTPError as e:
+        return "Failed to get the prowCI response"
     except requests.Timeout as e:
         return "Request timed out"
     except requests.RequestException as e:
@@ -240,6 +573,75 @@ def get_n_recent_jobs(prow_link,n):
         return "Failed to extract the spy-links"
 
 
+def _get_jobs_gcs(prow_link):
+
+    '''
+    get_jobs with the builds listed from GCS.
+    '''
+
+    try:
+        current_date=get_current_date().date()
+        jobs_run_today = []
+        for build in iter_gcs_builds(prow_link, datetime.combine(current_date, datetime.min.time())):
+            job_date = build.started.date()
+            if job_date < current_date:
+                break
+            if job_date == current_date and build.result != "PENDING":
+                jobs_run_today.append(listed_record(build))
+        return jobs_run_today
+    except requests.Timeout as e:
+        return "Request timed out"
+    except requests.RequestException as e:
+        return "Error while sending request to url"
+    except (ValueError, KeyError) as e:
+        return "Failed to extract the spy-links"
+
+
+def _get_n_recent_jobs_gcs(prow_link, n):
+
+    '''
+    get_n_recent_jobs with the builds listed from GCS.
+    '''
+
+    try:
+        n_jobs=[]
+        for i, build in enumerate(_iter_recent_gcs_builds(prow_link, n)):
+            if i >= n:
+                break
+            if build.result != "PENDING":
+                n_jobs.append(listed_record(build))
+        return n_jobs
+    except requests.Timeout as e:
+        return "Request timed out"
+    except requests.RequestException as e:
+        return "Error while sending request to url"
+    except (ValueError, KeyError) as e:
+        return "Failed to extract the spy-links"
+
+
+def _get_jobs_with_date_gcs(prowci_url, start_date, end_date):
+
+    """
+    get_jobs_with_date with the builds listed from GCS.
+    """
+
+    try:
+        job_list = []
+        for build in iter_gcs_builds(prowci_url, end_date, start_date):
+            if build.started < end_date:
+                break
+            if build.started <= start_date and build.result != "PENDING":
+                job_list.append(listed_record(build))
+        return job_list
+    except requests.Timeout:
+        return "Request timed out"
+    except requests.RequestException:
+        return "Error while sending request to url"
+    except (ValueError, KeyError) as e:
+        print("Failed to extract the builds from the GCS listing")
+        return "ERROR"
+
+
 def check_job_status(spy_link):
     '''
     Gets the status of the job if it was a success or failure
@@ -252,7 +654,7 @@ def check_job_status(spy_link):
     '''
     job_status_url = constants.PROW_VIEW_URL + spy_link[8:] + '/finished.json'
     try:
-        response = requests.get(job_status_url, verify=False, timeout=15)
+        response = fetcher.get(job_status_url)
         if response.status_code == 200:
             cluster_status = json.loads(response.text)
             return cluster_status["result"]
@@ -265,6 +667,20 @@ def check_job_status(spy_link):
     except json.JSONDecodeError as e:
         return 'Error while parsing finished.json'
 
+def _install_finished_url(spy_link):
+
+    '''
+    Gets the url of finished.json of the cluster installation step of a job which is not a mce job.
+
+    Parameter:
+        spy_link (string):  SpyglassLink used to generate url to access logs of a job.
+
+    Returns:
+        string: Url of finished.json of the installation step.
+    '''
+
+    return constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + artifact_paths(spy_link).install_finished
+
 def cluster_deploy_status(spy_link):
 
     '''
@@ -277,19 +693,19 @@ def cluster_deploy_status(spy_link):
         string: Cluster Deployment Status 
     '''
 
-    job_type,job_platform = job_classifier(spy_link)
     if "mce" in spy_link:
-        mce_install_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + job_type + '/hypershift-mce-install/finished.json'
+        paths = artifact_paths(spy_link)
+        mce_install_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + paths.mce_install_finished
 
         try:
-            response = requests.get(mce_install_log_url, verify=False, timeout=15)
+            response = fetcher.get(mce_install_log_url)
             if response.status_code == 200:                
                 cluster_status = json.loads(response.text)
                 cluster_result = "MCE-INSTALL "+ cluster_status["result"]
                 if cluster_status["result"] == "SUCCESS":
                         # check mce-power-create status also
-                    mce_power_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + job_type + '/hypershift-mce-power-create-nodepool/finished.json'
-                    response = requests.get(mce_power_log_url, verify=False, timeout=15)
+                    mce_power_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + paths.mce_power_create_finished
+                    response = fetcher.get(mce_power_log_url)
                     if response.status_code == 200:
                         cluster_status = json.loads(response.text)
                         cluster_result += "\nMCE-POWER-CREATE "+ cluster_status["result"]
@@ -307,21 +723,10 @@ def cluster_deploy_status(spy_link):
         except json.JSONDecodeError as e:
             return 'ERROR'
     else:
-        pattern=r"(\d+\.\d+)"
-        match=re.search(pattern,spy_link[8:])
-        version=float(match.group(0))
-        if "upgrade" in spy_link:
-            version=version-0.01 
-
-        job_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + job_type + '/ipi-install-' + job_platform +'-install/finished.json'
-        if "sno" in spy_link:
-            job_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + job_type + '/upi-install-powervs-sno/finished.json'
-        #Only 4.17 and above libvirt uses upi-installation.
-        if version>=4.16 and job_platform != "powervs":
-            job_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/artifacts/' + job_type + '/upi-install-' + job_platform +'/finished.json'
+        job_log_url = _install_finished_url(spy_link)
 
         try:
-            response = requests.get(job_log_url, verify=False, timeout=15)
+            response = fetcher.get(job_log_url)
             if response.status_code == 200:
                 
                 cluster_status = json.loads(response.text)
@@ -344,11 +749,11 @@ def cluster_creation_error_analysis(spylink):
         spylink (string):  SpyglassLink used to generate url to access logs of a job.
     '''
 
-    job_type,job_platform = job_classifier(spylink)
-    job_log_url = constants.PROW_VIEW_URL + spylink[8:] + '/artifacts/' + job_type + '/ipi-install-' + job_platform +'-install/build-log.txt'
+    _,job_platform = job_classifier(spylink)
+    job_log_url = constants.PROW_VIEW_URL + spylink[8:] + '/artifacts/' + artifact_paths(spylink).install_log
     
     try:
-        response = requests.get(job_log_url,verify=False)
+        response = fetcher.get(job_log_url)
 
         if response.status_code == 200:
 
@@ -386,20 +791,137 @@ def cluster_creation_error_analysis(spylink):
     except requests.RequestException:
         return "Error while sending request to url"
 
+class DirectoryListing:
+
+    '''
+    Entries of a gcsweb directory page, the names of the directories end with "/".
+    '''
+
+    __slots__ = ("entries", "_names")
+
+    def __init__(self, entries):
+        self.entries = tuple(entries)
+        self._names = frozenset(self.entries)
+
+    @classmethod
+    def parse(cls, url, text):
+
+        '''
+        Parses the entries of a gcsweb directory page from the links to its children.
+
+        Parameter:
+            url (string): Url of the directory page.
+            text (string): Html of the page.
+
+        Returns:
+            DirectoryListing: Entries in the order of the page.
+        '''
+
+        prefix = urllib.parse.urlsplit(url).path.rstrip("/") + "/"
+        entries = []
+        for href in _href_re.findall(text):
+            href = html.unescape(href)
+            if "://" in href:
+                # Files may link to the object in the bucket itself, e.g. https://storage.googleapis.com/<bucket>/<path>.
+                path = urllib.parse.urlsplit(href).path
+                parent = path.rstrip("/").rsplit("/", 1)[0] + "/"
+                if parent.count("/") < 3 or not prefix.endswith(parent):
+                    continue
+                href = path[len(parent):]
+            elif href.startswith(prefix):
+                href = href[len(prefix):]
+            elif href.startswith("/"):
+                # The parent directory and the links of the page header.
+                continue
+            name = href.rstrip("/")
+            if name and name != ".." and "/" not in name:
+                entries.append(href)
+        return cls(entries)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def search(self, pattern):
+
+        '''
+        Searches the entries for a pattern.
+
+        Parameter:
+            pattern (re.Pattern): Compiled pattern.
+
+        Returns:
+            re.Match: Match of the first entry matching the pattern, None if no entry does.
+        '''
+
+        for entry in self.entries:
+            match = pattern.search(entry)
+            if match is not None:
+                return match
+        return None
+
+
+def _remember_listing(url, listing):
+    with _listings_lock:
+        listing = _listings.setdefault(url, listing)
+        _listings.move_to_end(url)
+        while len(_listings) > constants.DIRECTORY_LISTING_CACHE_SIZE:
+            _listings.popitem(last=False)
+    return listing
+
+
+def get_directory_listing(url):
+
+    '''
+    Gets the entries of a gcsweb directory, each listing is fetched and parsed once per run.
+
+    The page itself goes through fetcher, so the listings of finished builds are also kept in the
+    on-disk artifact cache across runs.
+
+    Parameter:
+        url (string): Url of the directory.
+
+    Returns:
+        DirectoryListing: Entries of the directory, None if the directory page could not be fetched.
+
+    Raises:
+        requests.RequestException: If the request fails.
+    '''
+
+    with _listings_lock:
+        listing = _listings.get(url)
+    if listing is not None:
+        return listing
+    response = fetcher.get(url)
+    if response.status_code != 200:
+        return None
+    return _remember_listing(url, DirectoryListing.parse(url, response.text))
+
+
+def clear_run_caches():
+
+    '''
+    Forgets the responses, the parsed directory listings and the build log analyses of the run,
+    see fetcher.clear_cache. Artifacts of finished builds are read again from the on-disk artifact cache.
+    '''
+
+    fetcher.clear_cache()
+    with _listings_lock:
+        _listings.clear()
+    with _build_log_lock:
+        _build_log_results.clear()
+
+
 #This is a temporary fix to check node details for older jobs.
 def check_if_gather_libvirt_dir_exists(spy_link,job_type):
     
     base_artifacts_dir_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type
 
     try:
-        response = requests.get(base_artifacts_dir_url, verify=False, timeout=15)
-        gather_libvirt_dir_re = re.compile('gather-libvirt')
-        gather_libvirt_dir_re_match = gather_libvirt_dir_re.search(response.text, re.MULTILINE|re.DOTALL)
-        
-        if gather_libvirt_dir_re_match is not None:
-            return True
-        else:
-            return False
+        listing = get_directory_listing(base_artifacts_dir_url)
+        return listing is not None and "gather-libvirt/" in listing
     except requests.Timeout:
         return "Request timed out"
     except requests.RequestException:
@@ -407,15 +929,8 @@ def check_if_gather_libvirt_dir_exists(spy_link,job_type):
     
 #This is to check for hypervisor error
 def check_hypervisor_error(spy_link):
-    build_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/build-log.txt'
     try:
-        response = requests.get(build_log_url, verify=False, timeout=15)
-        hypervisor_re = re.compile(constants.HYPERVISOR_CONNECTION_ERROR)
-        hypervisor_re_match = hypervisor_re.search(response.text)
-        if hypervisor_re_match is not None:
-            return True
-        else:
-            return False
+        return analyze_build_log(spy_link)["hypervisor_error"]
     except requests.Timeout:
         return "Request timed out"
     except requests.RequestException:
@@ -425,15 +940,8 @@ def check_hypervisor_error(spy_link):
 #This is a fix to check for sensitive information expose error.
 def check_if_sensitive_info_exposed(spy_link):
     
-    build_log_url = constants.PROW_VIEW_URL + spy_link[8:] + '/build-log.txt'
     try:
-        response = requests.get(build_log_url, verify=False, timeout=15)
-        senstive_info_re = re.compile('This file contained potentially sensitive information and has been removed.')
-        senstive_info_re_match = senstive_info_re.search(response.text)
-        if senstive_info_re_match is not None:
-            return True
-        else:
-            return False
+        return analyze_build_log(spy_link)["sensitive_info_exposed"]
     except requests.Timeout:
         return "Request timed out"
     except requests.RequestException:
@@ -454,23 +962,13 @@ def get_node_status(spy_link):
     
     check_for_gather_libvirt_dir = check_if_gather_libvirt_dir_exists(spy_link,job_type)
     
-    if check_for_gather_libvirt_dir == True:
-        job_type += "/gather-libvirt"
-    else:
-        job_type += "/gather-extra"
-    
     node_log_url = constants.PROW_VIEW_URL + spy_link[8:] + \
-        "/artifacts/" + job_type +"/artifacts/oc_cmds/nodes"
+        "/artifacts/" + artifact_paths(spy_link).nodes(check_for_gather_libvirt_dir == True)
     
-    pattern=r"(\d+\.\d+)"
-    match=re.search(pattern,spy_link[8:])
-    version=float(match.group(1))
-    if "upgrade" in spy_link:
-        version=version-0.01
-    
- 
+    version=job_version(spy_link)
+
     try:
-        node_log_response = requests.get(node_log_url, verify=False, timeout=15)
+        node_log_response = fetcher.get(node_log_url)
         if "NAME" in node_log_response.text:
             if version > 4.15 and job_platform == "libvirt":
                 workers="compute-"   
@@ -502,12 +1000,11 @@ def check_node_crash(spy_link):
     '''
 
     if "mce" not in spy_link and "sno" not in spy_link:
-        job_type,_ = job_classifier(spy_link)
-        crash_log_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" +job_type + "/ipi-conf-debug-kdump-gather-logs/artifacts/"
+        crash_log_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + artifact_paths(spy_link).kdump_dir
         
         try:
-            crash_log_response = requests.get(crash_log_url, verify=False, timeout=15)
-            if "kdump.tar" in crash_log_response.text:
+            crash_log_listing = get_directory_listing(crash_log_url)
+            if crash_log_listing is not None and crash_log_listing.search(_kdump_filename_re) is not None:
                 print("*********************************")
                 print ("ERROR- Crash observed in the job")
                 print("*********************************")
@@ -518,6 +1015,42 @@ def check_node_crash(spy_link):
         except requests.RequestException:
             return "Error while sending request to url"
 
+@functools.lru_cache(maxsize=None)
+def _lease_rule(job_platform):
+    return build_log.make_rule("lease", r'(Acquired 1 lease\(s\) for {}-quota-slice: \[)([^]]+)(\])'.format(job_platform), group=2, flags=re.MULTILINE|re.DOTALL)
+
+@functools.lru_cache(maxsize=None)
+def _nightly_rules(job_platform, upgrade):
+    phases = ["initial", "latest"] if upgrade else ["latest"]
+    rules = []
+    for phase in phases:
+        patterns = [
+            rf"Resolved release {job_platform}-{phase} to (\S+)",
+            rf"Using explicitly provided pull-spec for release {job_platform}-{phase} \((\S+)\)"] if job_platform != "multi" else[
+            rf"Resolved release {phase} to (\S+)",
+            rf"Using explicitly provided pull-spec for release {phase} \((\S+)\)"
+        ]
+        rules.append(build_log.make_rule("nightly-" + phase, *patterns, group=1, flags=re.MULTILINE | re.DOTALL))
+    return tuple(rules)
+
+_hypervisor_error_rule = build_log.make_rule("hypervisor_error", constants.HYPERVISOR_CONNECTION_ERROR)
+_sensitive_info_rule = build_log.make_rule("sensitive_info_exposed", 'This file contained potentially sensitive information and has been removed.')
+
+def _format_lease(results):
+    if results["lease"] is None:
+        return "Failed to fetch lease information"
+    return results["lease"]
+
+def _format_nightly(results, job_platform, upgrade):
+    nightly = []
+    for rule in _nightly_rules(job_platform, upgrade):
+        if results[rule.name] is None:
+            phase = rule.name[len("nightly-"):]
+            nightly.append(f"Unable to fetch nightly {job_platform}-{phase} information - No match found")
+        else:
+            nightly.append(results[rule.name])
+    return "\n".join(nightly)
+
 def get_lease(build_log_response,job_platform):
 
     '''
@@ -529,14 +1062,8 @@ def get_lease(build_log_response,job_platform):
         lease(string): Acquired lease/region
     '''
 
-    lease = ""
-    zone_log_re = re.compile(r'(Acquired 1 lease\(s\) for {}-quota-slice: \[)([^]]+)(\])'.format(job_platform), re.MULTILINE|re.DOTALL)
-    zone_log_match = zone_log_re.search(build_log_response.text)
-    if zone_log_match is None:
-        lease = "Failed to fetch lease information"
-    else:
-        lease = zone_log_match.group(2)
-    return lease
+    results, _ = build_log.scan(build_log.iter_blocks(build_log_response.text), [_lease_rule(job_platform)])
+    return _format_lease(results)
 
 def get_nightly(build_log_url,build_log_response, job_platform):
 
@@ -549,29 +1076,111 @@ def get_nightly(build_log_url,build_log_response, job_platform):
     Returns:
         string : Nightly image used.
     '''
-    phases = ["initial", "latest"] if "upgrade" in build_log_url else ["latest"]
-    results = []
+    upgrade = "upgrade" in build_log_url
+    results, _ = build_log.scan(build_log.iter_blocks(build_log_response.text), _nightly_rules(job_platform, upgrade))
+    return _format_nightly(results, job_platform, upgrade)
 
-    for phase in phases:
-        patterns = [
-            rf"Resolved release {job_platform}-{phase} to (\S+)",
-            rf"Using explicitly provided pull-spec for release {job_platform}-{phase} \((\S+)\)"] if job_platform != "multi" else[
-            rf"Resolved release {phase} to (\S+)",
-            rf"Using explicitly provided pull-spec for release {phase} \((\S+)\)"
-        ]
+def _build_log_platforms(spy_link):
 
-        found = False
-        for pattern in patterns:
-            match = re.search(pattern, build_log_response.text, re.MULTILINE | re.DOTALL)
-            if match:
-                results.append(match.group(1))
-                found = True
-                break
+    '''
+    Gets the platforms used to look up the lease and the nightly in the build log.
+
+    Parameter:
+        spy_link (string):  SpyglassLink of the job.
+
+    Returns:
+        string: Platform of the lease quota slice, None if lease is not applicable.
+        string: Architecture of the nightly (ppc64le or s390x or multi).
+    '''
+
+    _,job_platform = job_classifier(spy_link)
+    if 'ppc64le' in spy_link:
+        if job_platform == "libvirt":
+            job_platform += "-ppc64le-s2s"
+        elif job_platform == "powervs":
+            job_platform += "-[1-9]"
+        return job_platform, 'ppc64le'
+    elif 's390x' in spy_link:
+        return job_platform + "-s390x", 's390x'
+    elif "multi" in spy_link:
+        if "powervs" in spy_link:
+            return "powervs-[1-9]", "multi"
+        return 'libvirt-ppc64le-s2s', "multi"
+    elif "mce" in spy_link:
+        return "aws", "multi"
+    # lease is not applicable for SNO
+    return None, "multi"
+
+# Build log analyses of the run, spylink -> analysis, least recently used first, see analyze_build_log.
+_build_log_results = collections.OrderedDict()
+_build_log_lock = threading.Lock()
+
+
+def _remember_build_log(spy_link, entry, replace=True):
+    with _build_log_lock:
+        if replace or spy_link not in _build_log_results:
+            _build_log_results[spy_link] = entry
+        _build_log_results.move_to_end(spy_link)
+        while len(_build_log_results) > constants.BUILD_LOG_CACHE_SIZE:
+            _build_log_results.popitem(last=False)
+
+def analyze_build_log(spy_link, full=True):
+
+    '''
+    Scans build-log.txt of a job once for the lease, the nightly image, the hypervisor
+    connection error, the sensitive information marker and the rules registered with
+    build_log.register_rule. The results of the last constants.BUILD_LOG_CACHE_SIZE builds
+    analysed are kept for the run.
+
+    The lease and the nightly are logged near the top, so with full set to False the
+    log is streamed and the download stops as soon as both are found.
 
-        if not found:
-            results.append(f"Unable to fetch nightly {job_platform}-{phase} information - No match found")
+    Parameter:
+        spy_link (string):  SpyglassLink used to generate url to access logs of a job.
+        full (bool, optional): Set to False when only the lease and the nightly are needed.
+
+    Returns:
+        dict: lease (None if not applicable), nightly and, unless only those were
+              needed, hypervisor_error, sensitive_info_exposed and the results of the registered rules.
+    '''
 
-    return "\n".join(results)
+    with _build_log_lock:
+        cached = _build_log_results.get(spy_link)
+        if cached is not None:
+            _build_log_results.move_to_end(spy_link)
+    if cached is not None and (cached["complete"] or not full):
+        return cached["analysis"]
+    if not full and NIGHTLY_INDEX is not None:
+        indexed = NIGHTLY_INDEX.get_indexed_build_log(spy_link)
+        if indexed is not None:
+            analysis = {"lease": indexed[0], "nightly": indexed[1]}
+            _remember_build_log(spy_link, {"analysis": analysis, "complete": False}, replace=False)
+            return analysis
+    lease_platform, nightly_platform = _build_log_platforms(spy_link)
+    upgrade = "upgrade" in spy_link
+    head_rules = list(_nightly_rules(nightly_platform, upgrade))
+    if lease_platform is not None:
+        head_rules.append(_lease_rule(lease_platform))
+    rules = head_rules + [_hypervisor_error_rule, _sensitive_info_rule] + build_log.EXTRA_RULES
+    build_log_url = constants.PROW_VIEW_URL + spy_link[8:] + "/build-log.txt"
+    if full:
+        results, complete = build_log.scan(build_log.iter_blocks(fetcher.get(build_log_url).text), rules)
+    else:
+        with contextlib.closing(fetcher.iter_text(build_log_url)) as chunks:
+            results, complete = build_log.scan(build_log.iter_line_blocks(chunks), rules, [rule.name for rule in head_rules])
+    analysis = {}
+    analysis["lease"] = _format_lease(results) if lease_platform is not None else None
+    analysis["nightly"] = _format_nightly(results, nightly_platform, upgrade)
+    if complete:
+        analysis["hypervisor_error"] = results["hypervisor_error"] is not None
+        analysis["sensitive_info_exposed"] = results["sensitive_info_exposed"] is not None
+        for rule in build_log.EXTRA_RULES:
+            analysis[rule.name] = results[rule.name]
+    _remember_build_log(spy_link, {"analysis": analysis, "complete": complete})
+    # The lease and the nightly never change once logged, builds missing one are analysed again.
+    if NIGHTLY_INDEX is not None and all(results[rule.name] is not None for rule in head_rules):
+        NIGHTLY_INDEX.index_build_log(spy_link, analysis["lease"], analysis["nightly"])
+    return analysis
 
 def get_quota_and_nightly(spy_link):
 
@@ -586,95 +1195,633 @@ def get_quota_and_nightly(spy_link):
         nightly(string): Nighlty image used.
     '''
 
-    _,job_platform = job_classifier(spy_link)
     lease = None
     nightly = None
-    max_retries = 3
-    delay = 5  # seconds
-    build_log_url = constants.PROW_VIEW_URL + spy_link[8:] + "/build-log.txt"
-    for attempt in range(1, max_retries + 1):
+    # Retries with backoff are handled by the shared session in fetcher.
+    try:
+        build_log_analysis = analyze_build_log(spy_link, full=False)
+        lease = build_log_analysis["lease"]
+        nightly = build_log_analysis["nightly"]
+    except requests.RequestException as e:
+        print(f"Request failed after {constants.HTTP_RETRIES} retries: {e}")
+
+    return lease, nightly
+
+def job_classifier(spy_link):
+
+    '''
+    Extracts the job type and platform information from SpyglassLink.
+
+    Parameter:
+        spy_link (string):  SpyglassLink used to filter the job_type and job_platform.
+
+    Returns:
+        job_type(string): It is a important keyword used while constructing url to access the artifacts.
+        job_platform(string): The infrastructure where the cluster is deployed (ex: libvirt, powervs etc).
+    '''
+    if isinstance(spy_link, BuildRecord):
+        return spy_link.classification
+    return _classify(spy_link)
+
+
+# Builds of the same job are classified alike, but a history query classifies thousands of
+# spylinks, so the classification of every spylink is kept in a bounded LRU cache.
+@functools.lru_cache(maxsize=constants.SPYLINK_CACHE_SIZE)
+def _classify(spy_link):
+    #Artifact link for libvirt: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-ocp-e2e-ovn-remote-libvirt-ppc64le/1847061335720857600/artifacts/ocp-e2e-ovn-remote-libvirt-ppc64le/
+    #Artifact link for powervs: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-ocp-e2e-ovn-ppc64le-powervs-capi/1820746900182142976/artifacts/ocp-e2e-ovn-ppc64le-powervs-capi/
+    #Artifact link for upgrade: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-upgrade-from-nightly-4.16-ocp-ovn-remote-libvirt-multi-p-p/1846295088968241152/artifacts/ocp-ovn-remote-libvirt-multi-p-p/
+    #Artifact link for heavybuild: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-heavy-build-ovn-remote-libvirt-ppc64le/1846642613847855104/artifacts/ocp-heavy-build-ovn-remote-libvirt-ppc64le/
+    #Artifact directory for all libvirt,powervs,heavybuild and upgrade jobs starts with "ocp", so to identify the job_type used the regex 'ocp.*?/'
+    pattern = _job_type_re
+
+    #Artifact link for mce /test-platform-results/logs/periodic-ci-openshift-hypershift-release-4.14-periodics-mce-e2e-mce-power-conformance/1847155042210025472/artifacts/e2e-mce-power-conformance/
+    #mce jobs artifact directory is e2e-mce-power-conformance, so to identify the job_type used the regex 'e2e.*?/'
+    if "mce" in spy_link:
+        pattern = _mce_job_type_re
+    match = pattern.search(spy_link)
+
+    if match:
+        job_type = match.group(0)
+        job_type = job_type.rstrip('/')
+
+    
+    job_platform = "mce"
+    if spy_link.find("powervs") != -1:
+        job_platform = "powervs"
+    elif spy_link.find("libvirt") != -1:
+        job_platform = "libvirt"
+    elif spy_link.find("sno") != -1:
+        job_platform = "sno"
+    
+    return job_type,job_platform
+
+
+def job_version(spy_link):
+
+    '''
+    Gets the OCP version of the job from SpyglassLink, upgrade jobs count as slightly older than the version they upgrade to.
+
+    Parameter:
+        spy_link (string):  SpyglassLink of the job.
+
+    Returns:
+        float: Version (ex: 4.16, 4.15 for upgrade to 4.16).
+    '''
+
+    if isinstance(spy_link, BuildRecord):
+        return spy_link.version
+    return _version(spy_link)
+
+
+@functools.lru_cache(maxsize=constants.SPYLINK_CACHE_SIZE)
+def _version(spy_link):
+    match=_version_re.search(spy_link, 8)
+    version=float(match.group(1))
+    if "upgrade" in spy_link:
+        version=version-0.01
+    return version
+
+
+class ArtifactPaths(collections.namedtuple("ArtifactPaths", ["install_finished", "install_log", "mce_install_finished",
+                                                             "mce_power_create_finished", "test_dir", "kdump_dir",
+                                                             "gather_libvirt_dir", "gather_extra_dir"])):
+
+    '''
+    Paths of the step artifacts of a job, relative to the artifacts directory of its builds ("<job_type>/...").
+
+    install_finished (string): finished.json of the cluster installation step of a job which is not a mce job.
+    install_log (string): build-log.txt of the ipi installation step.
+    mce_install_finished (string): finished.json of the mce installation step.
+    mce_power_create_finished (string): finished.json of the mce nodepool creation step.
+    test_dir (string): Directory of the e2e test step.
+    kdump_dir (string): Artifacts directory of the kdump gathering step.
+    gather_libvirt_dir (string): Directory of the gather-libvirt step, which replaces gather-extra when it exists.
+    gather_extra_dir (string): Directory of the gather-extra step.
+    '''
+
+    __slots__ = ()
+
+    def gather_dir(self, gather_libvirt):
+        return self.gather_libvirt_dir if gather_libvirt else self.gather_extra_dir
+
+    def nodes(self, gather_libvirt):
+        '''Path of the node status gathered with oc (string).'''
+        return self.gather_dir(gather_libvirt) + "/artifacts/oc_cmds/nodes"
+
+
+@functools.lru_cache(maxsize=None)
+def _artifact_paths(job_type, job_platform, version, sno, mce):
+    install_finished = job_type + '/ipi-install-' + job_platform + '-install/finished.json'
+    if sno:
+        install_finished = job_type + '/upi-install-powervs-sno/finished.json'
+    #Only 4.17 and above libvirt uses upi-installation.
+    if version>=4.16 and job_platform != "powervs":
+        install_finished = job_type + '/upi-install-' + job_platform + '/finished.json'
+    return ArtifactPaths(
+        install_finished=install_finished,
+        install_log=job_type + '/ipi-install-' + job_platform + '-install/build-log.txt',
+        mce_install_finished=job_type + '/hypershift-mce-install/finished.json',
+        mce_power_create_finished=job_type + '/hypershift-mce-power-create-nodepool/finished.json',
+        test_dir=job_type + ("/conformance-tests" if mce else "/openshift-e2e-libvirt-test"),
+        kdump_dir=job_type + "/ipi-conf-debug-kdump-gather-logs/artifacts/",
+        gather_libvirt_dir=job_type + "/gather-libvirt",
+        gather_extra_dir=job_type + "/gather-extra")
+
+
+def artifact_paths(spy_link):
+
+    '''
+    Gets the paths of the step artifacts of a job, computed once per job type, platform and version.
+
+    Parameter:
+        spy_link (string):  SpyglassLink or BuildRecord of the job.
+
+    Returns:
+        ArtifactPaths: Paths relative to the artifacts directory of the build.
+    '''
+
+    job_type,job_platform = job_classifier(spy_link)
+    return _artifact_paths(job_type, job_platform, job_version(spy_link), "sno" in spy_link, "mce" in spy_link)
+
+
+def _lazy(func):
+
+    '''
+    Turns a method of BuildRecord into a property computed on first access and kept in the slot "_<name>".
+    '''
+
+    slot = "_" + func.__name__
+
+    def getter(self):
         try:
-            build_log_response = requests.get(build_log_url, verify=False, timeout=15)
-            if 'ppc64le' in spy_link:      
-                if job_platform == "libvirt":
-                    job_platform += "-ppc64le-s2s"
-                elif job_platform == "powervs":
-                    job_platform += "-[1-9]"
-                lease = get_lease(build_log_response, job_platform)
-                nightly = get_nightly(build_log_url, build_log_response, 'ppc64le')
-
-            elif 's390x' in spy_link:     
-                job_platform += "-s390x"
-                lease = get_lease(build_log_response, job_platform)
-                nightly = get_nightly(build_log_url, build_log_response, 's390x')
-
-            elif "multi" in spy_link:
-                if "powervs" in spy_link:
-                    job_platform = "powervs-[1-9]"
-                    lease = get_lease(build_log_response, job_platform)
-                else:
-                    job_platform = "multi"
-                    lease = get_lease(build_log_response, 'libvirt-ppc64le-s2s')
-                nightly = get_nightly(build_log_url, build_log_response, "multi") 
+            return getattr(self, slot)
+        except AttributeError:
+            value = func(self)
+            setattr(self, slot, value)
+            return value
+
+    return property(getter, doc=func.__doc__)
+
+
+class BuildRecord(str):
+
+    '''
+    SpyglassLink of a build together with what is derived from it.
+
+    A BuildRecord is the SpyglassLink string itself, so it can be passed wherever a spylink is expected.
+    The fields parsed from the link and the results fetched from the artifacts are computed on first
+    access and kept for the lifetime of the record, the artifacts themselves are cached by fetcher.
+
+    Parameter:
+        spy_link (string): SpyglassLink of the build.
+        ci_name (string, optional): Name of the CI the build belongs to.
+        listed_result (string, optional): Result of the build in the listing it was found in.
+        listed_started (datetime, optional): Start time of the build in the listing it was found in.
+    '''
+
+    __slots__ = ("ci_name", "listed_result", "listed_started", "_classification", "_version", "_status", "_install_status",
+                 "_quota_and_nightly", "_failed_testcases", "_node_status")
+
+    def __new__(cls, spy_link, ci_name=None, listed_result=None, listed_started=None):
+        record = super().__new__(cls, spy_link)
+        record.ci_name = ci_name
+        record.listed_result = listed_result
+        record.listed_started = listed_started
+        return record
+
+    def __reduce__(self):
+        return BuildRecord, (str(self), self.ci_name, self.listed_result, self.listed_started)
+
+    @property
+    def spylink(self):
+        return str(self)
+
+    @property
+    def build_id(self):
+        '''Prow build id (string).'''
+        return self.rstrip("/").rsplit("/", 1)[-1]
+
+    @property
+    def job_name(self):
+        '''Name of the Prow job (string).'''
+        return self.rstrip("/").rsplit("/", 2)[-2]
+
+    @property
+    def gcs_path(self):
+        '''Path of the build in the GCS bucket (string).'''
+        return self[8:]
+
+    @property
+    def build_url(self):
+        '''Url of the build directory (string).'''
+        return constants.PROW_VIEW_URL + self.gcs_path
+
+    @property
+    def artifacts_url(self):
+        '''Url of the artifacts directory of the job steps (string).'''
+        return self.build_url + "/artifacts/" + self.job_type
+
+    @property
+    def artifact_paths(self):
+        '''Paths of the step artifacts below the artifacts directory (ArtifactPaths), see artifact_paths.'''
+        return artifact_paths(self)
+
+    @property
+    def build_log_url(self):
+        '''Url of build-log.txt (string).'''
+        return self.build_url + "/build-log.txt"
+
+    @_lazy
+    def classification(self):
+        '''Job type and job platform (tuple), see job_classifier.'''
+        return job_classifier(str(self))
+
+    @property
+    def job_type(self):
+        return self.classification[0]
+
+    @property
+    def job_platform(self):
+        return self.classification[1]
+
+    @_lazy
+    def version(self):
+        '''OCP version (float), see job_version.'''
+        return job_version(str(self))
+
+    @_lazy
+    def status(self):
+        '''Result of the build (string), see check_job_status.'''
+        return check_job_status(self)
+
+    @_lazy
+    def install_status(self):
+        '''Cluster deployment status (string), see cluster_deploy_status.'''
+        return cluster_deploy_status(self)
+
+    @_lazy
+    def quota_and_nightly(self):
+        '''Lease and nightly image (tuple), see get_quota_and_nightly.'''
+        return get_quota_and_nightly(self)
+
+    @property
+    def lease(self):
+        return self.quota_and_nightly[0]
+
+    @property
+    def nightly(self):
+        return self.quota_and_nightly[1]
+
+    @_lazy
+    def failed_testcases(self):
+        '''Failed testcases of all testsuites, their count and the error messages (tuple), see get_all_failed_tc.'''
+        return get_all_failed_tc(self, self.job_type)
+
+    @_lazy
+    def node_status(self):
+        '''Node status (string), see get_node_status.'''
+        return get_node_status(self)
+
+
+def as_build_record(build, ci_name=None):
+
+    '''
+    Wraps a spylink in a BuildRecord, records are returned as they are.
+
+    Parameter:
+        build (string): SpyglassLink or BuildRecord of the build.
+        ci_name (string, optional): Name of the CI the build belongs to.
+
+    Returns:
+        BuildRecord: Record of the build.
+    '''
+
+    if isinstance(build, BuildRecord):
+        if build.ci_name is None:
+            build.ci_name = ci_name
+        return build
+    return BuildRecord(build, ci_name)
+
+
+def listed_record(build):
+
+    '''
+    Creates the BuildRecord of a listed build, keeping the result and the start time the listing reports for it.
+
+    Parameter:
+        build (ListedBuild): Build of a job history page or of the GCS listing.
+
+    Returns:
+        BuildRecord: Record of the build.
+    '''
+
+    return BuildRecord(build.spylink, listed_result=build.result, listed_started=build.started)
+
+
+def listed_as_passed(build):
+
+    '''
+    Checks the result the listing reports for a build, the cheapest field to filter on as it costs no request.
+
+    A build which passed had its cluster installed and no failed step, so the builds the failure
+    filters keep are ruled out before any of their artifacts is fetched.
+
+    Parameter:
+        build (string): SpyglassLink or BuildRecord of the build, only records of a listing carry its result.
+
+    Returns:
+        bool: True if the listing reports the build passed, False if it did not or the result is not known.
+    '''
+
+    return getattr(build, "listed_result", None) == "SUCCESS"
+
+
+def _cached_text(url):
+    response = fetcher.get_cached(url)
+    return response.text if response is not None else ""
+
+
+def _cached_listing(url):
+    with _listings_lock:
+        listing = _listings.get(url)
+    if listing is not None:
+        return listing
+    response = fetcher.get_cached(url)
+    if response is None or response.status_code != 200:
+        return DirectoryListing(())
+    return _remember_listing(url, DirectoryListing.parse(url, response.text))
+
+
+def _cached_result(url):
+    try:
+        return json.loads(_cached_text(url))["result"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class _ProbeContext:
+
+    '''
+    What the probes of a build know about it, derived from the artifacts already in the fetcher cache.
+
+    The decisions follow the helpers of this module, so a probe is executed only when the evaluation
+    of the build reads its artifacts. A decision which depends on an artifact that could not be
+    fetched keeps the probe, the helper fetches what the prefetch missed.
+    '''
+
+    def __init__(self, build, evaluation, zone=None, job_filter="all"):
+        self.build = as_build_record(build)
+        self.evaluation = evaluation
+        self.zone = zone
+        self.job_filter = job_filter.lower()
+        self.mce = "mce" in self.build
+        self.sno = "sno" in self.build
+        artifacts_url = self.build.build_url + "/artifacts/"
+        paths = self.build.artifact_paths
+        self.finished_url = self.build.build_url + "/finished.json"
+        self.install_url = artifacts_url + (paths.mce_install_finished if self.mce else paths.install_finished)
+        self.power_create_url = artifacts_url + paths.mce_power_create_finished
+        self.test_finished_url = artifacts_url + paths.test_dir + "/finished.json"
+        self.junit_dir_url = artifacts_url + paths.test_dir + "/artifacts/junit/"
+        self.kdump_dir_url = artifacts_url + paths.kdump_dir
+        self._install_status = None
+
+    def install_status(self):
+
+        '''
+        Gets cluster_deploy_status of the build once the finished.json files it reads are cached.
+
+        Returns:
+            string: Cluster deployment status, None while it is not known.
+        '''
+
+        if self._install_status is None and fetcher.get_cached(self.install_url) is not None:
+            if not (self.mce and _cached_result(self.install_url) == "SUCCESS" and fetcher.get_cached(self.power_create_url) is None):
+                self._install_status = cluster_deploy_status(self.build)
+        return self._install_status
+
+    def lease_indexed(self):
+        return NIGHTLY_INDEX is not None and NIGHTLY_INDEX.get_indexed_build_log(self.build) is not None
+
+    def lease_read(self):
+        with _build_log_lock:
+            return self.build in _build_log_results
+
+    def read_lease(self):
+        # Streams the head of the build log like get_quota_and_nightly, the log is downloaded
+        # in full only by the build_log probe of the evaluations which scan all of it.
+        try:
+            analyze_build_log(self.build, full=False)
+        except requests.RequestException:
+            pass
+
+    def listed(self):
+        # The failure filters rule out the builds the listing reports as passed before anything is fetched.
+        return not (self.job_filter == "failure" and listed_as_passed(self.build))
+
+    def in_zone(self):
+
+        '''
+        Checks the lease of the build against zone, the first filter the evaluations apply after the listing.
+
+        Returns:
+            bool: False if the build is filtered out, True if it is not or its lease is not known yet.
+        '''
+
+        if not self.listed():
+            return False
+        if self.zone is not None and (self.lease_indexed() or self.lease_read() or fetcher.get_cached(self.build.build_log_url) is not None):
+            lease, _ = get_quota_and_nightly(self.build)
+            return lease in self.zone
+        return True
+
+    def passes_job_filter(self):
+        if not self.listed():
+            return False
+        install_status = self.install_status()
+        if self.job_filter == "success" and install_status in ("FAILURE", "ERROR"):
+            return False
+        if self.job_filter == "failure" and install_status == "SUCCESS":
+            return False
+        return True
+
+    def selected(self):
+
+        '''
+        Checks the build against job_filter and zone, the test results of a build they rule out are never read.
+
+        Returns:
+            bool: False if the build is filtered out, True if it is not or it is not known yet.
+        '''
+
+        return self.in_zone() and self.passes_job_filter()
+
+    def result(self):
+        return _cached_result(self.finished_url)
+
+    def needs_lease(self):
+        return self.zone is not None and self.listed() and not (self.lease_indexed() or self.lease_read())
+
+    def needs_mce_power_create(self):
+        return self.mce and _cached_result(self.install_url) == "SUCCESS"
+
+    def needs_build_log(self):
+        # get_build_tc_failures only reads the lease from the log, the lease probe streamed it.
+        if self.evaluation == "testcases":
+            return False
+        # get_brief_build_info applies job_filter before it scans the log.
+        return self.in_zone() and (self.evaluation == "detailed" or self.passes_job_filter())
+
+    def needs_prowjob(self):
+        return self.evaluation != "testcases" and self.selected()
+
+    def needs_testcases(self):
+        if not self.selected() or self.install_status() != "SUCCESS":
+            return False
+        if self.evaluation == "testcases":
+            return True
+        return self.result() == "FAILURE" and not self.sno
+
+    def needs_test_status(self):
+        return self.evaluation == "detailed" and self.needs_testcases()
+
+    def needs_node_status(self):
+        return self.evaluation == "detailed" and self.result() == "FAILURE" and not self.sno and self.selected()
+
+    def needs_kdump_dir(self):
+        if self.evaluation != "detailed" or self.mce or self.sno or not self.selected():
+            return False
+        # check_node_crash is skipped for failed builds which lost the connection to the hypervisor.
+        if self.result() == "FAILURE":
+            return fetcher.get_cached(self.build.build_log_url) is None or check_hypervisor_error(self.build) is not True
+        return self.result() == "SUCCESS"
+
+    def needs_artifacts_dir(self):
+        return self.needs_testcases() or self.needs_node_status()
+
+    def needs_failure_summaries(self):
+        # print_all_failed_tc reads the summaries only when the test step failed.
+        return self.needs_testcases() and (self.evaluation != "detailed" or _cached_result(self.test_finished_url) == "FAILURE")
+
+    def needs_symptoms(self):
+        return self.needs_testcases() and "junit_symptoms.xml" in _cached_listing(self.gather_url() + "/artifacts/junit/")
+
+    def gather_libvirt(self):
+        return "gather-libvirt/" in _cached_listing(self.build.artifacts_url)
+
+    def gather_url(self):
+        return self.build.build_url + "/artifacts/" + self.build.artifact_paths.gather_dir(self.gather_libvirt())
+
+    def nodes_url(self):
+        return self.build.build_url + "/artifacts/" + self.build.artifact_paths.nodes(self.gather_libvirt())
+
+    def failure_summary_urls(self):
+        junit_dir = _cached_listing(self.junit_dir_url)
+        # Same choice of the monitor test results as get_all_failed_tc.
+        if ("4.14" not in self.build and "4.13" not in self.build) and not self.mce:
+            monitor_filename_re = _monitor_summary_filename_re
+        else:
+            monitor_filename_re = _monitor_junit_filename_re
+        urls = []
+        for filename_re in (_e2e_summary_filename_re, monitor_filename_re):
+            match = junit_dir.search(filename_re)
+            if match is not None:
+                urls.append(self.junit_dir_url + match.group(1))
+        return urls
+
+
+_filters = ("install", "mce_power_create", "build_log")
+
+
+@functools.lru_cache(maxsize=None)
+def _build_probes():
+
+    '''
+    Probes of a build, listed after the probes they require. Artifacts are written to the
+    on-disk cache once finished.json of their build is known, so every probe requires it.
+    The lease is read before the install steps from the streamed head of the build log, a build
+    outside zone costs that head only.
+
+    async_fetch (and aiohttp) is imported on the first prefetch only, the scripts run without it.
+    '''
+
+    import async_fetch
+    return (
+        async_fetch.Probe("finished", (), _ProbeContext.listed, lambda context: [context.finished_url]),
+        async_fetch.Probe("lease", ("finished",), _ProbeContext.needs_lease, None, _ProbeContext.read_lease),
+        async_fetch.Probe("install", ("lease",), _ProbeContext.in_zone, lambda context: [context.install_url]),
+        async_fetch.Probe("mce_power_create", ("install",), _ProbeContext.needs_mce_power_create, lambda context: [context.power_create_url]),
+        async_fetch.Probe("build_log", ("install", "mce_power_create"), _ProbeContext.needs_build_log, lambda context: [context.build.build_log_url]),
+        async_fetch.Probe("prowjob", _filters, _ProbeContext.needs_prowjob, lambda context: [context.build.build_url + "/prowjob.json"]),
+        async_fetch.Probe("kdump_dir", _filters, _ProbeContext.needs_kdump_dir, lambda context: [context.kdump_dir_url]),
+        async_fetch.Probe("artifacts_dir", _filters, _ProbeContext.needs_artifacts_dir, lambda context: [context.build.artifacts_url]),
+        async_fetch.Probe("junit_dir", _filters, _ProbeContext.needs_testcases, lambda context: [context.junit_dir_url]),
+        async_fetch.Probe("test_status", _filters, _ProbeContext.needs_test_status, lambda context: [context.test_finished_url]),
+        async_fetch.Probe("nodes", ("artifacts_dir",), _ProbeContext.needs_node_status,
+                          lambda context: [context.nodes_url()]),
+        async_fetch.Probe("gather_junit_dir", ("artifacts_dir",), _ProbeContext.needs_testcases,
+                          lambda context: [context.gather_url() + "/artifacts/junit/"]),
+        async_fetch.Probe("failure_summaries", ("junit_dir", "test_status"), _ProbeContext.needs_failure_summaries,
+                          _ProbeContext.failure_summary_urls),
+        async_fetch.Probe("symptoms", ("gather_junit_dir",), _ProbeContext.needs_symptoms,
+                          lambda context: [context.gather_url() + "/artifacts/junit/junit_symptoms.xml"]),
+    )
+
+
+def prefetch_builds(builds, evaluation="brief", zone=None, job_filter="all"):
+
+    '''
+    Fetches the artifacts of the builds concurrently as coroutines on one thread, so evaluating the builds reads them from the fetcher cache.
 
-            elif "mce" in spy_link:
-                job_platform = "aws"
-                lease = get_lease(build_log_response, job_platform)
-                nightly = get_nightly(build_log_url, build_log_response, "multi")
+    The probes of every build form a small dependency graph, independent probes run in parallel and
+    the probes of the steps an evaluation does not read, e.g. the test results of builds ruled out
+    by job_filter or zone, are skipped.
 
-            else:
-                # lease is not applicable for SNO
-                nightly = get_nightly(build_log_url, build_log_response, "multi")
+    Parameter:
+        builds (list): SpyglassLinks or BuildRecords of the builds.
+        evaluation (string, optional): Evaluation the builds are prefetched for, "brief" (get_brief_build_info),
+                                       "detailed" (get_detailed_build_info) or "testcases" (get_build_tc_failures).
+        zone (list, optional): Zones/leases the builds are filtered with.
+        job_filter (string, optional): 'all' (default), 'success', or 'failure'.
 
-            break  # If successful, break out of retry loop
+    Returns:
+        dict: Build and the names of its executed probes.
+    '''
 
-        except (requests.Timeout, requests.RequestException) as e:
-            if attempt == max_retries - 1:
-                print(f"Request failed after {max_retries} attempts: {e}")
-            else:
-                time.sleep(delay)
+    import async_fetch
+    probes = _build_probes()
+    contexts = [_ProbeContext(build, evaluation, zone, job_filter) for build in builds]
+    executed = async_fetch.prefetch((probes, context) for context in contexts)
+    return dict(zip(builds, executed))
 
-    return lease, nightly
 
-def job_classifier(spy_link):
+def _prefetch_for(func, builds, evaluation, zone=None, job_filter="all"):
 
     '''
-    Extracts the job type and platform information from SpyglassLink.
+    Prefetches the builds evaluated with func when ASYNC_FETCH is set, the evaluations read from BUILD_STORE fetch nothing.
+    '''
 
-    Parameter:
-        spy_link (string):  SpyglassLink used to filter the job_type and job_platform.
+    if ASYNC_FETCH and BUILD_STORE is None:
+        executed = prefetch_builds(builds, evaluation, zone, job_filter)
+        with _probe_counts_lock:
+            for probes in executed.values():
+                PROBE_COUNTS.update(probes)
 
-    Returns:
-        job_type(string): It is a important keyword used while constructing url to access the artifacts.
-        job_platform(string): The infrastructure where the cluster is deployed (ex: libvirt, powervs etc).
-    '''
-    #Artifact link for libvirt: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-ocp-e2e-ovn-remote-libvirt-ppc64le/1847061335720857600/artifacts/ocp-e2e-ovn-remote-libvirt-ppc64le/
-    #Artifact link for powervs: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-ocp-e2e-ovn-ppc64le-powervs-capi/1820746900182142976/artifacts/ocp-e2e-ovn-ppc64le-powervs-capi/
-    #Artifact link for upgrade: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.17-upgrade-from-nightly-4.16-ocp-ovn-remote-libvirt-multi-p-p/1846295088968241152/artifacts/ocp-ovn-remote-libvirt-multi-p-p/
-    #Artifact link for heavybuild: test-platform-results/logs/periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-heavy-build-ovn-remote-libvirt-ppc64le/1846642613847855104/artifacts/ocp-heavy-build-ovn-remote-libvirt-ppc64le/
-    #Artifact directory for all libvirt,powervs,heavybuild and upgrade jobs starts with "ocp", so to identify the job_type used the regex 'ocp.*?/'
-    pattern = r'ocp.*?/'
 
-    #Artifact link for mce /test-platform-results/logs/periodic-ci-openshift-hypershift-release-4.14-periodics-mce-e2e-mce-power-conformance/1847155042210025472/artifacts/e2e-mce-power-conformance/
-    #mce jobs artifact directory is e2e-mce-power-conformance, so to identify the job_type used the regex 'e2e.*?/'
-    if "mce" in spy_link:
-        pattern = r'e2e.*?/'
-    match = re.search(pattern,spy_link)
+def print_probe_counts(file=None):
 
-    if match:
-        job_type = match.group(0)
-        job_type = job_type.rstrip('/')
+    '''
+    Prints the number of builds every probe of the prefetches was executed for, to stderr by default
+    so the reports printed on stdout are unchanged.
 
-    
-    job_platform = "mce"
-    if spy_link.find("powervs") != -1:
-        job_platform = "powervs"
-    elif spy_link.find("libvirt") != -1:
-        job_platform = "libvirt"
-    elif spy_link.find("sno") != -1:
-        job_platform = "sno"
-    
-    return job_type,job_platform
+    Parameter:
+        file (file, optional): Stream to print to.
+    '''
+
+    with _probe_counts_lock:
+        counts = ["{}={}".format(probe.name, PROBE_COUNTS[probe.name]) for probe in _build_probes()]
+    print("Builds the prefetch probes were executed for:", " ".join(counts), file=file or sys.stderr)
 
 
 def get_failed_monitor_testcases(spy_link,job_type):
@@ -695,16 +1842,15 @@ def get_failed_monitor_testcases(spy_link,job_type):
     test_log_junit_dir_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/openshift-e2e-libvirt-test/artifacts/junit/"
 
     try:
-        response = requests.get(test_log_junit_dir_url, verify=False, timeout=15)
+        junit_dir_listing = get_directory_listing(test_log_junit_dir_url)
 
-        if response.status_code == 200:
-            monitor_test_failure_summary_filename_re = re.compile(r'(test-failures-summary_monitor_2[^.]*\.json)')
-            monitor_test_failure_summary_filename_match = monitor_test_failure_summary_filename_re.search(response.text, re.MULTILINE|re.DOTALL)
+        if junit_dir_listing is not None:
+            monitor_test_failure_summary_filename_match = junit_dir_listing.search(_monitor_summary_filename_re)
         
             if monitor_test_failure_summary_filename_match is not None:
                 monitor_test_failure_summary_filename_str = monitor_test_failure_summary_filename_match.group(1)
                 test_log_url=constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/openshift-e2e-libvirt-test/artifacts/junit/" + monitor_test_failure_summary_filename_str
-                response_2 = requests.get(test_log_url,verify=False, timeout=15)
+                response_2 = fetcher.get(test_log_url)
                 if response_2.status_code == 200:
                     data = response_2.json()
                     for tc in data['Tests']:
@@ -745,26 +1891,18 @@ def get_failed_monitor_testcases_from_xml(spy_link,job_type):
         test_type = "openshift-e2e-libvirt-test"
     test_log_junit_dir_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/" + test_type + "/artifacts/junit/"
     try:
-        response = requests.get(test_log_junit_dir_url, verify=False, timeout=15)
+        junit_dir_listing = get_directory_listing(test_log_junit_dir_url)
 
-        if response.status_code == 200:
-            test_failure_summary_filename_re = re.compile(r'(e2e-monitor-tests__2[^.]*\.xml)')
-            test_failure_summary_filename_match = test_failure_summary_filename_re.search(response.text, re.MULTILINE|re.DOTALL)
+        if junit_dir_listing is not None:
+            test_failure_summary_filename_match = junit_dir_listing.search(_monitor_junit_filename_re)
         
             if test_failure_summary_filename_match is not None:
                 test_failure_summary_filename_str = test_failure_summary_filename_match.group(1)
                 test_log_url=constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/"+ test_type +"/artifacts/junit/" + test_failure_summary_filename_str
-                response = requests.get(test_log_url,verify=False,timeout=15)
-                if response.status_code == 200:
-                    root = ET.fromstring(response.content)
-                    for idx,testcase in enumerate(root.iter('testcase')):
-                        if testcase.find('failure') is not None:
-                            current_name = testcase.get('name')
-                            next_testcase = root[idx+1] if idx+1 < len(root) else None
-                            prev_testcase = root[idx-1] if idx-1 >= 0 else None
-                            if next_testcase is not None and next_testcase.get('name') != current_name and prev_testcase is not None and prev_testcase.get('name') != current_name:
-                                monitor_failed_testcase.append(current_name)
-                    return monitor_failed_testcase, None
+                # e2e junit files can be tens of MB, the failures are picked while the file downloads.
+                with contextlib.closing(fetcher.iter_content(test_log_url)) as chunks:
+                    monitor_failed_testcase = list(junit.iter_failed_monitor_testcases(chunks))
+                return monitor_failed_testcase, None
             else:
                 return monitor_failed_testcase, "Monitor test file not found"
         else:
@@ -777,6 +1915,66 @@ def get_failed_monitor_testcases_from_xml(spy_link,job_type):
         return monitor_failed_testcase, "Failed to parse junit e2e log file!"
 
 
+def get_build_tc_failures(spylink, zone=None):
+    """
+    To get the failed testcases of a build for get_testcase_frequency
+
+    Args:
+        spylink (string): Build which needs to be checked, spylink or BuildRecord.
+        zone (list): List of the zones/leases that need to checked.
+
+    Returns:
+        dict: Failed testcases of all testsuites, empty if the build is skipped.
+    """
+    if BUILD_STORE is not None:
+        tc_failures, output = BUILD_STORE.build_tc_failures(spylink, zone)
+        sys.stdout.write(output)
+        return tc_failures
+    spylink = as_build_record(spylink)
+    job_type,_ = job_classifier(spylink)
+    lease,_ = get_quota_and_nightly(spylink)
+    if zone is not None and lease not in zone :
+        return {}
+    cluster_status=cluster_deploy_status(spylink)
+    if cluster_status == 'SUCCESS':
+        tc_failures,_,_ = get_all_failed_tc(spylink,job_type)
+        return tc_failures
+    return {}
+
+def _build_lease(spylink):
+    if BUILD_STORE is not None:
+        build = BUILD_STORE.get_build(spylink)
+        return build["lease"] if build else None
+    lease, _ = get_quota_and_nightly(spylink)
+    return lease
+
+def get_failure_matrix(spylinks, zone=None, ci_name=None):
+    """
+    To collect the failed testcases of the builds into a sparse builds x testcases matrix
+
+    Args:
+        spylinks (list): list of builds which needs to be checked.
+        zone (list): List of the zones/leases that need to checked.
+        ci_name (string, optional): CI name of the builds, the job name of every build by default.
+
+    Returns:
+        FailureMatrix: Failures of the builds, builds skipped by zone have no failures. The builds are
+                       labelled with their CI ("ci") and their lease ("zone") for FailureMatrix.frequency_by.
+    """
+    _prefetch_for(get_build_tc_failures, spylinks, "testcases", zone)
+    tasks = [submit_build_task(get_build_tc_failures, spylink, zone) for spylink in spylinks]
+    failures = []
+    labels = {"ci": [], "zone": []}
+    for spylink, task in zip(spylinks, tasks):
+        tc_failures, output = task.result()
+        sys.stdout.write(output)
+        failures.append((spylink, tc_failures))
+        build = as_build_record(spylink, ci_name)
+        labels["ci"].append(build.ci_name or build.job_name)
+        # get_build_tc_failures read the lease already, it is memoized with the build log analysis.
+        labels["zone"].append(_build_lease(spylink))
+    return tc_frequency.FailureMatrix.from_failures(failures, labels)
+
 def get_testcase_frequency(spylinks, zone=None, tc_name = None):
     """
     To get the testcases failing with its frequency
@@ -790,31 +1988,7 @@ def get_testcase_frequency(spylinks, zone=None, tc_name = None):
         dict: Dict with testcase as key and its frequency as value
 
     """
-    frequency = {}
-    for spylink in spylinks:
-        job_type,_ = job_classifier(spylink)
-        lease,_ = get_quota_and_nightly(spylink)
-        if zone is not None and lease not in zone :
-            continue
-        cluster_status=cluster_deploy_status(spylink)
-        if cluster_status == 'SUCCESS':
-            tc_failures,_,_ = get_all_failed_tc(spylink,job_type)
-            for _,value in tc_failures.items():
-                if len(value) !=0:
-                    for tc in value:
-                        if tc in frequency:
-                            frequency[tc]+= 1
-                        else:
-                            frequency[tc] = 1
-    sorted_frequency = dict(sorted(frequency.items(),key = lambda item: item[1], reverse=True))
-    frequency = {}
-    if tc_name is not None:
-        for tc in tc_name:
-            if tc in sorted_frequency:
-                frequency[tc] = sorted_frequency[tc]
-        return frequency
-
-    return sorted_frequency
+    return get_failure_matrix(spylinks, zone).frequency(tc_name)
 
 def get_failed_e2e_testcases(spy_link,job_type):
 
@@ -838,16 +2012,15 @@ def get_failed_e2e_testcases(spy_link,job_type):
         test_type = "openshift-e2e-libvirt-test"
     test_log_junit_dir_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/" + test_type + "/artifacts/junit/"
     try:
-        response = requests.get(test_log_junit_dir_url, verify=False, timeout=15)
+        junit_dir_listing = get_directory_listing(test_log_junit_dir_url)
 
-        if response.status_code == 200:
-            test_failure_summary_filename_re = re.compile(r'(test-failures-summary_2[^.]*\.json)')
-            test_failure_summary_filename_match = test_failure_summary_filename_re.search(response.text, re.MULTILINE|re.DOTALL)
+        if junit_dir_listing is not None:
+            test_failure_summary_filename_match = junit_dir_listing.search(_e2e_summary_filename_re)
         
             if test_failure_summary_filename_match is not None:
                 test_failure_summary_filename_str = test_failure_summary_filename_match.group(1)
                 test_log_url=constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/"+ test_type +"/artifacts/junit/" + test_failure_summary_filename_str
-                response_2 = requests.get(test_log_url,verify=False, timeout=15)
+                response_2 = fetcher.get(test_log_url)
                 if response_2.status_code == 200:
                     data = response_2.json()
                     for tc in data['Tests']:
@@ -893,18 +2066,12 @@ def get_junit_symptom_detection_testcase_failures(spy_link,job_type):
     test_log_junit_dir_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/artifacts/junit/"
     symptom_detection_failed_testcase = []
     try:
-        response = requests.get(test_log_junit_dir_url,verify=False,timeout=15)
-        if response.status_code == 200:
-            junit_failure_summary_filename_re = re.compile('junit_symptoms.xml')
-            junit_failure_summary_filename_match = junit_failure_summary_filename_re.search(response.text, re.MULTILINE|re.DOTALL)
-            if junit_failure_summary_filename_match is not None:
+        junit_dir_listing = get_directory_listing(test_log_junit_dir_url)
+        if junit_dir_listing is not None:
+            if "junit_symptoms.xml" in junit_dir_listing:
                 test_log_junit_url = constants.PROW_VIEW_URL + spy_link[8:] + "/artifacts/" + job_type + "/artifacts/junit/junit_symptoms.xml"
-                response_2 = requests.get(test_log_junit_url,verify=False,timeout=15)
-                root = ET.fromstring(response_2.content)
-                for testcase in root.findall('.//testcase'):
-                    testcase_name = testcase.get('name')
-                    if testcase.find('failure') is not None:
-                        symptom_detection_failed_testcase.append(testcase_name)
+                with contextlib.closing(fetcher.iter_content(test_log_junit_url)) as chunks:
+                    symptom_detection_failed_testcase = list(junit.iter_failed_testcases(chunks))
                 return symptom_detection_failed_testcase, None
             else:
                 return symptom_detection_failed_testcase, "Junit test summary file not found"
@@ -961,6 +2128,9 @@ def get_all_failed_tc(spylink,jobtype):
     failed_tc_count=conformance_failed_tc_count+symptom_failed_tc_count+monitor_failed_tc_count
     error_object = {"conformance": conformance_error_obj, "monitor": monitor_err_obj, "symptom_detection": symptom_error_obj}
 
+    if TESTCASE_INDEX is not None and all(value == None for value in error_object.values()):
+        TESTCASE_INDEX.index_build(spylink, failed_tc, getattr(spylink, "listed_started", None))
+
     return failed_tc,failed_tc_count,error_object
 
 def check_ts_exe_status(spylink,jobtype):
@@ -982,7 +2152,7 @@ def check_ts_exe_status(spylink,jobtype):
         test_type = "openshift-e2e-libvirt-test"
     test_exe_status_url = constants.PROW_VIEW_URL + spylink[8:] + "/artifacts/" + jobtype + "/" + test_type + "/finished.json"
     try:
-        response = requests.get(test_exe_status_url, verify=False, timeout=15)
+        response = fetcher.get(test_exe_status_url)
         if response.status_code == 200:
             cluster_status = json.loads(response.text)
             return cluster_status["result"]
@@ -1077,6 +2247,9 @@ def check_testcase_failure(spylink,job_type,testcase_name):
     Return:
         return True if testcase failed in this particular build else return False.
     """
+    if TESTCASE_INDEX is not None and TESTCASE_INDEX.is_indexed(spylink):
+        return TESTCASE_INDEX.has_indexed_failure(spylink, testcase_name)
+
     failed_tcs,_,_ = get_all_failed_tc(spylink,job_type)
 
     for _,values in failed_tcs.items():
@@ -1085,80 +2258,194 @@ def check_testcase_failure(spylink,job_type,testcase_name):
     return False
 
 
-def get_jobs_with_date(prowci_url,start_date,end_date):
+_next_page_re = re.compile(r"/([^/?]+)\?.+")
+
+
+def _next_page_link(older_link):
 
     """
-    Gets all the jobs/builds run in the given date range.
+    Converts the older runs link of a job history page to a CI url relative to PROW_URL.
+
+    Args:
+        older_link (string): Path of the older runs page.
+    Return:
+        string: CI url of the older runs page, None if there is no older page.
+    """
+
+    if not older_link:
+        return None
+    #build match extracts the next page spylink
+    build_match = _next_page_re.search(older_link)
+    if build_match != None:
+        return build_match.group()
+    return None
+
+
+def _get_job_history_page(page_link):
+
+    """
+    Fetches and parses a job history page.
+
+    Args:
+        page_link (string): CI url of the page relative to PROW_URL.
+    Return:
+        JobHistoryPage: Parsed page, None if the page does not list builds.
+    """
+
+    response = fetcher.get(PROW_URL + page_link)
+    response.raise_for_status()
+    return job_history.parse_page(response.content)
+
+
+def _seek_job_history(prowci_url, start_date):
+
+    """
+    Finds the job history page holding the newest build started before start_date.
+
+    Build ids grow with the start time of the builds and the history pages list the builds older than
+    their buildId cursor, so the cursor is searched between the oldest known build started after start_date
+    and the newest known build started before it, interpolating on the Started timestamps of the fetched pages.
 
     Args:
         prowci_url (string): CI url used to fetch the jobs.
-        start_date (string): Before date(Future)
-        end_date (string): After date(Past)
+        start_date (datetime): Before date(Future)
     Return:
-        List(string): List of spylinks of the jobs.
+        string: CI url of the page to walk from, all the builds newer than its cursor started after start_date.
     """
 
+    page = _get_job_history_page(prowci_url)
+    if not page or not page.builds or page.builds[-1].started <= start_date:
+        return prowci_url
 
-    url = PROW_URL + prowci_url
+    newest = page.builds[0]
+    hi = page.builds[-1]
+    lo_id, lo_started = None, None
+    id_gap = (int(newest.id) - int(hi.id)) / max(len(page.builds) - 1, 1)
+    half_page = int(id_gap * len(page.builds) / 2)
 
     try:
-        response = requests.get(url, verify=False, timeout=15)
+        for _ in range(constants.HISTORY_SEEK_MAX_PAGES):
+            hi_id = int(hi.id)
+            if lo_id is None:
+                rate = (int(newest.id) - hi_id) / max((newest.started - hi.started).total_seconds(), 1)
+                estimate = hi_id - rate * (hi.started - start_date).total_seconds()
+            elif lo_started is None:
+                estimate = (lo_id + hi_id) / 2
+            else:
+                fraction = (start_date - lo_started).total_seconds() / max((hi.started - lo_started).total_seconds(), 1)
+                estimate = lo_id + fraction * (hi_id - lo_id)
+            cursor = max(int(estimate) + half_page, 1 if lo_id is None else lo_id + 1)
+            if cursor >= hi_id:
+                break
 
+            page_link = f"{prowci_url}?buildId={cursor}"
+            page = _get_job_history_page(page_link)
+            if not page or not page.builds:
+                lo_id, lo_started = cursor, None
+                continue
+            if page.builds[0].started <= start_date:
+                lo_id, lo_started = int(page.builds[0].id), page.builds[0].started
+                continue
+            if page.builds[-1].started <= start_date:
+                return page_link
+            newest, hi = page.builds[0], page.builds[-1]
+    except (requests.RequestException, json.JSONDecodeError):
+        return prowci_url
 
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+    return f"{prowci_url}?buildId={hi.id}"
 
-            td_element = soup.find_all('td')
-            td_element2 = str(td_element)
-            next_link_pattern = r'/job[^>"]*'
-            next_link_match = re.search(next_link_pattern,td_element2)
-            next_link = ''
-            if next_link_match != None:
-                next_link = next_link_match.group()
 
-            script_elements = soup.find_all('script')
-            selected_script_element = None
+def iter_job_history(prowci_url, since=None):
 
+    """
+    Lists all the builds of a CI from the newest with the selected listing backend.
 
-            for script_element in script_elements:
-                script_content = script_element.string
-                if script_content:
-                    if 'allBuilds' in script_content:
-                        selected_script_element = script_content
-                        break
-        
+    Args:
+        prowci_url (string): CI url used to fetch the jobs.
+        since (datetime, optional): Oldest start time the caller reads, bounds the GCS listing. The job
+                                    history pages are read lazily, the caller stops the walk.
+    Yields:
+        ListedBuild: Builds of the CI, newest first.
+    Raises:
+        requests.RequestException, json.JSONDecodeError: If a listing can not be read.
+    """
 
-            if selected_script_element:
-                var_name = 'allBuilds'
-                pattern = rf'{var_name}\s*=\s*(.*?);'
+    if LISTING_BACKEND == "gcs":
+        yield from iter_gcs_builds(prowci_url, since)
+        return
+    page_link = prowci_url
+    while page_link:
+        page = _get_job_history_page(page_link)
+        if not page:
+            return
+        yield from page.builds
+        page_link = _next_page_link(page.older_link)
 
-                match = re.search(pattern, selected_script_element)
-            
-                if match:
-                    all_jobs=match.group(1)
-                    all_jobs_parsed=json.loads(all_jobs)
-                    for ele in all_jobs_parsed:
-                        job_time=parse_job_date(ele["Started"])
-                        
-                        if end_date <= job_time <= start_date and ele["Result"] != "PENDING" :
-                            job_log_path = ele["SpyglassLink"]
-                            final_job_list.append(job_log_path)
-
-                    #build match extracts the next page spylink
-                    build_regex = r"/([^/?]+)\?.+"
-                    build_match = re.search(build_regex,next_link)
-                    if build_match != None:
-                        next_page_spylink=build_match.group()
-                        check=get_next_page_first_build_date(next_page_spylink,end_date)
-                    
-                        if check == True:
-                            get_jobs_with_date(next_page_spylink,start_date,end_date)
-                        elif check == 'ERROR':
-                            print("Error while fetching the job-links please check the UI")
-                    return final_job_list
-        else:
-            print("Failed to get response from the prowCI link")
-            return 'ERROR'
+
+def iter_jobs_with_date(prowci_url,start_date,end_date,seek=True):
+
+    """
+    Walks the job history pages of a CI from start_date backwards and yields the builds run in the given date range.
+    Every page is fetched once and the walk stops at the first page reaching a build older than end_date.
+
+    Args:
+        prowci_url (string): CI url used to fetch the jobs.
+        start_date (string): Before date(Future)
+        end_date (string): After date(Past)
+        seek (bool, optional): Jumps to the page holding start_date by build id instead of walking from the newest page.
+    Yields:
+        string: Spylinks of the jobs, newest first.
+    Raises:
+        requests.RequestException, json.JSONDecodeError: If the first page can not be read, a failure on an
+        older page ends the walk with a message.
+    """
+
+    page_link = _seek_job_history(prowci_url, start_date) if seek else prowci_url
+    first_page = True
+    while page_link:
+        try:
+            page = _get_job_history_page(page_link)
+        except (requests.RequestException, json.JSONDecodeError):
+            if first_page:
+                raise
+            print("Error while fetching the job-links please check the UI")
+            return
+        first_page = False
+        if not page:
+            return
+
+        for build in page.builds:
+            if end_date <= build.started <= start_date and build.result != "PENDING" :
+                yield listed_record(build)
+
+        if page.builds and page.builds[-1].started < end_date:
+            return
+        page_link = _next_page_link(page.older_link)
+
+
+def get_jobs_with_date(prowci_url,start_date,end_date):
+
+    """
+    Gets all the jobs/builds run in the given date range.
+
+    Args:
+        prowci_url (string): CI url used to fetch the jobs.
+        start_date (string): Before date(Future)
+        end_date (string): After date(Past)
+    Return:
+        List(string): List of spylinks of the jobs.
+    """
+
+    if BUILD_STORE is not None:
+        return BUILD_STORE.get_jobs_with_date(prowci_url, start_date, end_date)
+    if LISTING_BACKEND == "gcs":
+        return _get_jobs_with_date_gcs(prowci_url, start_date, end_date)
+
+    try:
+        return list(iter_jobs_with_date(prowci_url,start_date,end_date))
+    except requests.HTTPError:
+        print("Failed to get response from the prowCI link")
+        return 'ERROR'
     except requests.Timeout:
         return "Request timed out"
     except requests.RequestException:
@@ -1168,60 +2455,71 @@ def get_jobs_with_date(prowci_url,start_date,end_date):
         return "ERROR"
 
  
-def get_next_page_first_build_date(ci_next_page_spylink,end_date):
+def _filter_build(build, zone, job_filter):
+    # Same filters as HistoryStore.filter_build, see job_history.filter_build.
+    return job_history.filter_build(getattr(build, "listed_result", None), lambda: build.quota_and_nightly[0],
+                                    lambda: cluster_deploy_status(build), zone, job_filter)
+
+def get_brief_build_info(build,prow_ci_name,zone=None,job_filter='All'):
 
     """
-    Checks if the date of first build run in the next page of CI is older than end_date.
+    Gets brief information of a single build.
 
     Args:
-        ci_next_page_spylink (string): CI url used to fetch the jobs.
-        end_date (string): After Date.
+        build: spylink or BuildRecord of the build
+        prow_ci_name: CI name
+        zone(string, optional): Cluster deployment zone
     Return:
-        Boolean: Returns True if end_date is older than first build date else returns False.
+        dict: Brief information of the build, None if the build is filtered out.
     """
 
-    ci_next_page_link = PROW_URL + ci_next_page_spylink
-
+    if BUILD_STORE is not None:
+        job_dict, output = BUILD_STORE.brief_build_info(build, prow_ci_name, zone, job_filter)
+        sys.stdout.write(output)
+        return job_dict
+    build = as_build_record(build, prow_ci_name)
+    if _filter_build(build, zone, job_filter):
+        return None
+    lease, _ = build.quota_and_nightly
     try:
-        response = requests.get(ci_next_page_link, verify=False, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_elements = soup.find_all('script')
-            selected_script_element = None
-
-            for script_element in script_elements:
-                script_content = script_element.string
-                if script_content:
-                    if 'allBuilds' in script_content:
-                        selected_script_element = script_content
-                        break
-        
-            if selected_script_element:
-                var_name = 'allBuilds'
-                pattern = rf'{var_name}\s*=\s*(.*?);'
-
-                match = re.search(pattern, selected_script_element)
-                if match:
-                    all_jobs=match.group(1)
-                    all_jobs_parsed=json.loads(all_jobs)
-                    job_date=all_jobs_parsed[0]["Started"]
-                    parsed_job_date = parse_job_date(job_date)
-                    if end_date <= parsed_job_date:
-                        return True
-                    elif end_date > parsed_job_date:
-                        return False
-                    
+        url = constants.PROW_VIEW_URL + build[8:] + '/prowjob.json'
+        time=fetch_build_time(url)
+    except:
+        time=None
+    build_status = check_job_status(build)
+    cluster_status=cluster_deploy_status(build)
+    sensitive_info_expose_status=check_if_sensitive_info_exposed(build)
+    job_dict = {}
+    job_dict["Job"] = prow_ci_name
+    job_dict["Prow Build ID"] = build.build_id
+    if time:
+        job_dict["Time"]=time[11:]
+    else:
+        job_dict["Time"]="Failed to fetch time"
+    job_dict["Install Status"] = cluster_status
+    if sensitive_info_expose_status == True:
+        job_dict["Lease"]="Build log removed"
+    else:
+        job_dict["Lease"]=lease
+    if build_status == 'SUCCESS' and "sno" not in prow_ci_name:
+        job_dict["Test result"] = "PASS"
+    elif build_status == 'FAILURE' and "sno" not in prow_ci_name:
+        if cluster_status == 'SUCCESS':
+            job_type,_ = job_classifier(build)
+            _, e2e_fail_test_count, error_object = get_all_failed_tc(build,job_type)
+            if all(value == None for value in error_object.values()):
+                if e2e_fail_test_count == 0:
+                    job_dict["Test result"] = "PASS"   
+                elif e2e_fail_test_count > 0:
+                    job_dict["Test result"] = str(e2e_fail_test_count) + " testcases failed"   
+            else:
+                job_dict["Test result"] = "Failed to get Test summary"
         else:
-            print("Failed to get the prowCI response")
-            return 'ERROR'
-    except requests.Timeout:
-        return "Request timed out"
-    except requests.RequestException:
-        return "Error while sending request to url"
-    except json.JSONDecodeError as e:
-        print("Failed to extract the spy-links from spylink please check the UI!")
-        return "ERROR"
-    
+            hypervisor_error_status = check_hypervisor_error(build)
+            if hypervisor_error_status:
+                job_dict["Test result"] = constants.HYPERVISOR_CONNECTION_ERROR
+    return job_dict
+
 def get_brief_job_info(build_list,prow_ci_name,zone=None,job_filter='All'):
 
     """
@@ -1239,157 +2537,222 @@ def get_brief_job_info(build_list,prow_ci_name,zone=None,job_filter='All'):
         print(build_list)
         return []
     summary_list = []   
-    
-    i=0
 
-    pattern_build_id =  r'/(\d+)'
+    _prefetch_for(get_brief_build_info, build_list, "brief", zone, job_filter)
+    tasks = [submit_build_task(get_brief_build_info, build, prow_ci_name, zone, job_filter) for build in build_list]
+    for task in tasks:
+        job_dict, output = task.result()
+        sys.stdout.write(output)
+        if job_dict is not None:
+            summary_list.append(job_dict)
+    return summary_list
 
-    for build in build_list:
-        match = re.search(pattern_build_id, build)
-        build_id = match.group(1)
-        cluster_status = cluster_deploy_status(build)
-        if job_filter == "success" and (cluster_status == "FAILURE" or cluster_status =="ERROR"):
-                continue
-        elif job_filter == "failure" and cluster_status =='SUCCESS':
-                continue
-        try:
-            url = constants.PROW_VIEW_URL + build[8:] + '/prowjob.json'
-            time=fetch_build_time(url)
-        except:
-            time=None
-        lease, _ = get_quota_and_nightly(build)
-        if zone is not None and lease not in zone :
-            continue
-        build_status = check_job_status(build)
-        cluster_status=cluster_deploy_status(build)
-        sensitive_info_expose_status=check_if_sensitive_info_exposed(build)
-        i=i+1
-        job_dict = {}
-        job_dict["Job"] = prow_ci_name
-        job_dict["Prow Build ID"] = build_id
-        if time:
-            job_dict["Time"]=time[11:]
-        else:
-            job_dict["Time"]="Failed to fetch time"
-        job_dict["Install Status"] = cluster_status
-        if sensitive_info_expose_status == True:
-            job_dict["Lease"]="Build log removed"
+def _print_detailed_build_info(build, prow_ci_name, lease, nightly, cluster_status):
+    """
+    Prints detailed information of a single build.
+
+    Args:
+        build: spylink of the build
+        prow_ci_name: CI name
+        lease (string): Lease acquired by the build
+        nightly (string): Nightly image used by the build
+        cluster_status (string): Cluster deployment status of the build
+    Return:
+        int: 1 if the cluster deployment succeeded else 0
+        int: 1 if the e2e tests succeeded else 0
+    """
+
+    deploy_count = 0
+    e2e_count = 0
+    try:
+        url = constants.PROW_VIEW_URL + build[8:] + '/prowjob.json'
+        time = fetch_build_time(url)
+        print("Build start time:", time)
+    except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+        print("Error fetching build time:", e)
+    
+    build_status = check_job_status(build)
+    sensitive_info_expose_status = check_if_sensitive_info_exposed(build)
+    
+    if sensitive_info_expose_status:
+        print("*********************************")
+        print("Build log removed")
+        print("*********************************")
+
+    print("Nightly info-", nightly)
+    if build_status == 'SUCCESS':
+
+        deploy_count += 1
+        e2e_count += 1
+        if "sno" not in build:
+            print("Lease Quota-", lease)
+        check_node_crash(build)
+        print("Build Passed")
+
+    elif build_status == 'FAILURE':
+        if "sno" not in build:
+            print("Lease Quota-", lease)    
+            node_status = get_node_status(build)
+            print(node_status)
+        hypervisor_error_status = check_hypervisor_error(build)
+        if hypervisor_error_status:
+            print("Cluster Creation Failed." + constants.HYPERVISOR_CONNECTION_ERROR)
         else:
-            job_dict["Lease"]=lease
-        if build_status == 'SUCCESS' and "sno" not in prow_ci_name:
-            job_dict["Test result"] = "PASS"
-        elif build_status == 'FAILURE' and "sno" not in prow_ci_name:
-            if cluster_status == 'SUCCESS':
-                job_type,_ = job_classifier(build)
-                _, e2e_fail_test_count, error_object = get_all_failed_tc(build,job_type)
-                if all(value == None for value in error_object.values()):
-                    if e2e_fail_test_count == 0:
-                        job_dict["Test result"] = "PASS"   
-                    elif e2e_fail_test_count > 0:
-                        job_dict["Test result"] = str(e2e_fail_test_count) + " testcases failed"   
-                else:
-                    job_dict["Test result"] = "Failed to get Test summary"
-            else:
-                hypervisor_error_status = check_hypervisor_error(build)
-                if hypervisor_error_status:
-                    job_dict["Test result"] = constants.HYPERVISOR_CONNECTION_ERROR
-        summary_list.append(job_dict)
-    return summary_list
+            check_node_crash(build)
 
-def get_detailed_job_info(build_list, prow_ci_name, zone=None, job_filter="all"):
+        if cluster_status == 'SUCCESS':
+            deploy_count += 1
+            if "sno" not in prow_ci_name:
+                job_type, _ = job_classifier(build)
+                tc_exe_status = print_all_failed_tc(build, job_type)
+                if tc_exe_status == "SUCCESS":
+                    e2e_count += 1
+
+        elif cluster_status == 'FAILURE':
+            print("Cluster Creation Failed")
+
+        elif cluster_status == 'ERROR' and not hypervisor_error_status:
+            print('Unable to get cluster status please check prowCI UI ')
+    else:
+        print(build_status)
+
+    print("\n")
+    return deploy_count, e2e_count
+
+def get_detailed_build_info(build, prow_ci_name, zone=None, job_filter="all"):
     """
-    Prints detailed information of all the jobs.
+    Evaluates a single build for get_detailed_job_info.
+
+    Args:
+        build: spylink or BuildRecord of the build
+        prow_ci_name: CI name
+        zone (string, optional): Cluster deployment zone
+        job_filter (string, optional): 'all' (default), 'success', or 'failure'
+    Return:
+        dict: Whether the build is dropped by job_filter or zone, its deploy and e2e
+              success counts and the detailed information printed for it.
+    """
+
+    if BUILD_STORE is not None:
+        build_info, output = BUILD_STORE.detailed_build_info(build, prow_ci_name, zone, job_filter)
+        sys.stdout.write(output)
+        return build_info
+    build = as_build_record(build, prow_ci_name)
+    build_info = {"filtered": False, "zone_mismatch": False, "deploy": 0, "e2e": 0, "output": ""}
+    dropped = _filter_build(build, zone, job_filter)
+    if dropped:
+        build_info[dropped] = True
+        return build_info
+    lease, nightly = build.quota_and_nightly
+    (build_info["deploy"], build_info["e2e"]), build_info["output"] = run_captured(
+        _print_detailed_build_info, build, prow_ci_name, lease, nightly, cluster_deploy_status(build))
+    return build_info
+
+def iter_detailed_build_info(build_list, prow_ci_name, zone=None, job_filter="all"):
+    """
+    Evaluates the builds with get_detailed_build_info concurrently and yields their results in build_list order.
 
     Args:
         build_list: list of builds
         prow_ci_name: CI name
         zone (string, optional): Cluster deployment zone
-        install_status_filter (string, optional): 'all' (default), 'success', or 'failure'
-            - 'failure' → show only cluster installs that failed or error
-            - 'success' → show only cluster installs that 
-            - 'all'     → show all builds
+        job_filter (string, optional): 'all' (default), 'success', or 'failure'
+    Yields:
+        tuple: Build, the dict get_detailed_build_info returned for it and the text the
+               evaluation printed outside of the build report.
+    """
 
-    """    
+    _prefetch_for(get_detailed_build_info, build_list, "detailed", zone, job_filter)
+    tasks = [submit_build_task(get_detailed_build_info, build, prow_ci_name, zone, job_filter) for build in build_list]
+    for build, task in zip(build_list, tasks):
+        build_info, output = task.result()
+        yield build, build_info, output
 
-    if isinstance(build_list, str):
-        print(build_list)
-        return 1
-        
-    deploy_count = 0
-    e2e_count = 0
-    i = 0
+def detailed_ci_summary(ci_name, build_list, zone=None, job_filter="all"):
 
-    builds_to_deleted = []
-    for build in build_list:
-        lease, nightly = get_quota_and_nightly(build)
-        cluster_status = cluster_deploy_status(build)
-        if job_filter == "success" and (cluster_status == "FAILURE" or cluster_status =="ERROR"):
-                continue
-        elif job_filter == "failure" and cluster_status =='SUCCESS':
-                continue
-        print("--------------------------------------------------------------------------------------------------")
-        print(prow_ci_name)
-        if zone is not None and lease not in zone:
-            builds_to_deleted.append(build)
-            continue
-        i += 1
-        print(i, "Job link:" + constants.JOB_LINK_URL + build)
-        try:
-            url = constants.PROW_VIEW_URL + build[8:] + '/prowjob.json'
-            time = fetch_build_time(url)
-            print("Build start time:", time)
-        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
-            print("Error fetching build time:", e)
-        
-        build_status = check_job_status(build)
-        sensitive_info_expose_status = check_if_sensitive_info_exposed(build)
-        
-        if sensitive_info_expose_status:
-            print("*********************************")
-            print("Build log removed")
-            print("*********************************")
+    """
+    Evaluates the builds of a CI with get_detailed_build_info and counts the deploys and e2e tests which succeeded.
 
-        print("Nightly info-", nightly)
-        if build_status == 'SUCCESS':
+    Args:
+        ci_name (string): CI name.
+        build_list (list): Builds of the CI, or the error message of the listing.
+        zone (list, optional): Zones/leases the builds are filtered with.
+        job_filter (string, optional): Job install status the builds are filtered with.
 
-            deploy_count += 1
-            e2e_count += 1
-            if "sno" not in build:
-                print("Lease Quota-", lease)
-            check_node_crash(build)
-            print("Build Passed")
+    Returns:
+        dict: CI name, error message of the listing (None if it was read), the builds with their
+              report and the deploy and e2e success counts of the builds which are not out of zone.
+    """
 
-        elif build_status == 'FAILURE':
-            if "sno" not in build:
-                print("Lease Quota-", lease)    
-                node_status = get_node_status(build)
-                print(node_status)
-            hypervisor_error_status = check_hypervisor_error(build)
-            if hypervisor_error_status:
-                print("Cluster Creation Failed." + constants.HYPERVISOR_CONNECTION_ERROR)
-            else:
-                check_node_crash(build)
+    ci_summary = {"ci": ci_name, "messages": "", "error": None, "builds": [], "deploys_succeeded": 0, "e2e_succeeded": 0, "total": 0}
+    if isinstance(build_list, str):
+        ci_summary["error"] = build_list
+        return ci_summary
+    for build, build_info, output in iter_detailed_build_info(build_list, ci_name, zone, job_filter):
+        ci_summary["builds"].append({
+            "build_id": as_build_record(build).build_id,
+            "job_link": constants.JOB_LINK_URL + build,
+            "filtered": build_info["filtered"],
+            "zone_mismatch": build_info["zone_mismatch"],
+            "deploy_succeeded": build_info["deploy"] == 1,
+            "e2e_succeeded": build_info["e2e"] == 1,
+            "report": build_info["output"],
+            "messages": output,
+        })
+        if not build_info["zone_mismatch"]:
+            ci_summary["total"] += 1
+            ci_summary["deploys_succeeded"] += build_info["deploy"]
+            ci_summary["e2e_succeeded"] += build_info["e2e"]
+    return ci_summary
+
+def render_detailed_ci_summary(ci_summary):
 
-            if cluster_status == 'SUCCESS':
-                deploy_count += 1
-                if "sno" not in prow_ci_name:
-                    job_type, _ = job_classifier(build)
-                    tc_exe_status = print_all_failed_tc(build, job_type)
-                    if tc_exe_status == "SUCCESS":
-                        e2e_count += 1
+    """
+    Renders the summary of a CI, see detailed_ci_summary, as get_detailed_job_info prints it.
 
-            elif cluster_status == 'FAILURE':
-                print("Cluster Creation Failed")
+    Args:
+        ci_summary (dict): Summary of the CI.
+    Return:
+        string: Text of the summary.
+    """
 
-            elif cluster_status == 'ERROR' and not hypervisor_error_status:
-                print('Unable to get cluster status please check prowCI UI ')
-        else:
-            print(build_status)
+    out = io.StringIO()
+    out.write(ci_summary["messages"])
+    if ci_summary["error"] is not None:
+        out.write(ci_summary["error"] + "\n")
+        return out.getvalue()
+    i = 0
+    for build in ci_summary["builds"]:
+        out.write(build["messages"])
+        if build["zone_mismatch"] or build["filtered"]:
+            continue
+        i += 1
+        out.write("--------------------------------------------------------------------------------------------------\n")
+        out.write(ci_summary["ci"] + "\n")
+        out.write("{} Job link:{}\n".format(i, build["job_link"]))
+        out.write(build["report"])
+    if ci_summary["total"] != 0 and i != 0:
+        out.write("\n{}/{} deploys succeeded\n".format(ci_summary["deploys_succeeded"], ci_summary["total"]))
+        out.write("{}/{} e2e tests succeeded\n".format(ci_summary["e2e_succeeded"], ci_summary["total"]))
+        out.write("--------------------------------------------------------------------------------------------------\n")
+    return out.getvalue()
+
+def get_detailed_job_info(build_list, prow_ci_name, zone=None, job_filter="all"):
+    """
+    Prints detailed information of all the jobs.
+
+    Args:
+        build_list: list of builds
+        prow_ci_name: CI name
+        zone (string, optional): Cluster deployment zone
+        install_status_filter (string, optional): 'all' (default), 'success', or 'failure'
+            - 'failure' → show only cluster installs that failed or error
+            - 'success' → show only cluster installs that 
+            - 'all'     → show all builds
 
-        print("\n")
+    """    
 
-    build_list = list(set(build_list) - set(builds_to_deleted))
-    if len(build_list) != 0 and i!=0:
-        print ("\n{}/{} deploys succeeded".format(deploy_count, len(build_list)))
-        print ("{}/{} e2e tests succeeded".format(e2e_count, len(build_list)))
-        print("--------------------------------------------------------------------------------------------------")
\ No newline at end of file
+    ci_summary = detailed_ci_summary(prow_ci_name, build_list, zone, job_filter)
+    sys.stdout.write(render_detailed_ci_summary(ci_summary))
+    if ci_summary["error"] is not None:
+        return 1
@@ -0,0 +1,87 @@
+import io
+from collections import namedtuple
+from tabulate import tabulate
+import monitor
+
+# Config file of the CIs of every job type.
+CONFIG_FILES = {"p": "p_periodic.json", "z": "z_periodic.json", "pa": "p_auxillary.json"}
+
+
+class Report(namedtuple("Report", ["job_type", "info_type", "rows", "messages"])):
+
+    '''
+    Daily report of the CIs of a job type, see generate_daily_report.
+
+    job_type (string): Job type of the CIs (p, z or pa).
+    info_type (string): brief or detailed.
+    rows (list): For brief, the summary of every build as CI_DailyBuildUpdates.py tabulates it.
+                 For detailed, one dict per CI with its builds, see monitor.detailed_ci_summary.
+    messages (string): Text printed while the report was generated which is not part of a row.
+    '''
+
+    __slots__ = ()
+
+    def render(self):
+
+        '''
+        Renders the report as the text CI_DailyBuildUpdates.py prints for it.
+
+        Returns:
+            string: Text of the report.
+        '''
+
+        out = io.StringIO()
+        out.write(self.messages)
+        if self.info_type == "brief":
+            if len(self.rows)==0:
+                out.write("******************* No builds found ******************************\n")
+            out.write(tabulate(self.rows, headers='keys', tablefmt="pipe", stralign='left') + "\n")
+            return out.getvalue()
+        for ci_summary in self.rows:
+            out.write(monitor.render_detailed_ci_summary(ci_summary))
+        return out.getvalue()
+
+
+def _ci_brief(ci_name, ci_link, zone, job_filter):
+    build_list = monitor.get_jobs(ci_link)
+    return monitor.get_brief_job_info(build_list, ci_name, zone=zone, job_filter=job_filter)
+
+
+def _ci_detailed(ci_name, ci_link, zone, job_filter):
+    build_list, messages = monitor.run_captured(monitor.get_jobs, ci_link)
+    ci_summary = monitor.detailed_ci_summary(ci_name, build_list, zone, job_filter)
+    ci_summary["messages"] = messages
+    return ci_summary
+
+
+def generate_daily_report(job_type="p", info_type="brief", zone=None, job_filter="All"):
+
+    '''
+    Generates the report of the builds which ran today on the CIs of a job type, in process.
+
+    The builds are evaluated with the settings of monitor (workers, async fetch, listing backend and
+    the history indexes), responses are cached by fetcher, so every report generated in the same
+    process shares the fetched artifacts.
+
+    Parameter:
+        job_type (string, optional): p (default), z or pa.
+        info_type (string, optional): brief (default) or detailed.
+        zone (list, optional): Zones/leases to report, all by default.
+        job_filter (string, optional): 'All' (default), 'success' or 'failure' install status of the builds to report.
+
+    Returns:
+        Report: Rows of the report, render() gives the text CI_DailyBuildUpdates.py prints.
+    '''
+
+    if job_type not in CONFIG_FILES:
+        raise ValueError("Unknown job type " + job_type)
+    if info_type not in ("brief", "detailed"):
+        raise ValueError("Unknown info type " + info_type)
+    monitor.PROW_URL = monitor.set_prow_url(job_type)
+    config_data = monitor.load_config(CONFIG_FILES[job_type])
+    if info_type == "brief":
+        ci_summary_lists, messages = monitor.run_captured(monitor.run_for_each_ci, config_data, _ci_brief, zone, job_filter)
+        rows = [job_dict for ci_summary_list in ci_summary_lists for job_dict in ci_summary_list]
+    else:
+        rows, messages = monitor.run_captured(monitor.run_for_each_ci, config_data, _ci_detailed, zone, job_filter)
+    return Report(job_type, info_type, rows, messages)
@@ -0,0 +1,241 @@
+import argparse
+import email.utils
+import hashlib
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import aggregate
+import constants
+import history_db
+import monitor
+import report
+
+# CIs of the job type the server reports on, see main.
+CONFIG_DATA = {}
+JOB_TYPE = "p"
+REPORTS = None
+
+
+class ReportCache:
+
+    '''
+    Reports served by the endpoints, computed once and kept until the cache expires.
+
+    Every ttl seconds the reports are dropped together with the responses, directory listings and
+    build log analyses of the run (monitor.clear_run_caches), so the next requests see the builds
+    which finished since. Artifacts of finished builds are read back from the on-disk artifact cache.
+
+    Parameter:
+        ttl (int): Seconds a report is served from the cache.
+    '''
+
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._reports = {}
+        self._expires = time.monotonic() + ttl
+
+    def get(self, key, build):
+
+        '''
+        Gets a report, concurrent requests of a report which is being computed wait for it.
+
+        Parameter:
+            key (tuple): Endpoint and its normalized arguments.
+            build: Called without arguments to compute the report when it is not cached, returns a JSON serializable object.
+
+        Returns:
+            tuple: ETag, body (bytes) and time (seconds since the epoch) of the report.
+        '''
+
+        with self._lock:
+            if time.monotonic() >= self._expires:
+                self._reports.clear()
+                monitor.clear_run_caches()
+                self._expires = time.monotonic() + self._ttl
+            report = self._reports.get(key)
+            owner = report is None
+            if owner:
+                report = self._reports[key] = Future()
+        if not owner:
+            return report.result()
+        try:
+            body = json.dumps(build(), indent=1).encode("utf-8")
+        except BaseException as e:
+            with self._lock:
+                if self._reports.get(key) is report:
+                    del self._reports[key]
+            report.set_exception(e)
+            raise
+        report.set_result(('"' + hashlib.sha1(body).hexdigest() + '"', body, time.time()))
+        return report.result()
+
+
+def _ci_frequency(ci_name, ci_link, n_builds, zone):
+    build_list = monitor.get_n_recent_jobs(ci_link, n_builds)
+    if isinstance(build_list, str):
+        print(build_list)
+        return {}
+    return monitor.get_testcase_frequency(build_list, zone)
+
+
+def _ci_nightly(ci_name, ci_link, nightly_image):
+    build_list = aggregate.get_builds_with_same_nightly(ci_link, nightly_image) or []
+    return monitor.detailed_ci_summary(ci_name, build_list)
+
+
+def brief_report(zone, job_filter):
+    daily_report = report.generate_daily_report(JOB_TYPE, "brief", zone, job_filter)
+    sys.stdout.write(daily_report.messages)
+    return daily_report.rows
+
+
+def detailed_report(zone, job_filter):
+    daily_report = report.generate_daily_report(JOB_TYPE, "detailed", zone, job_filter)
+    sys.stdout.write(daily_report.messages)
+    return daily_report.rows
+
+
+def frequency_report(n_builds, zone):
+    return dict(zip(CONFIG_DATA, monitor.run_for_each_ci(CONFIG_DATA, _ci_frequency, n_builds, zone)))
+
+
+def nightly_report(nightly_image):
+    return monitor.run_for_each_ci(CONFIG_DATA, _ci_nightly, nightly_image)
+
+
+def _zone_arg(query):
+    zone = query.get("zone")
+    return tuple(zone.split(",")) if zone else None
+
+
+def _job_filter_arg(query):
+    job_filter = query.get("job_install_status")
+    return job_filter if job_filter in ("failure", "success") else "All"
+
+
+def _builds_arg(query):
+    try:
+        n_builds = int(query.get("builds", 10))
+    except ValueError:
+        raise ValueError("builds must be an integer") from None
+    if n_builds < 1:
+        raise ValueError("builds must be at least 1")
+    return n_builds
+
+
+def _image_arg(query):
+    nightly_image = query.get("image")
+    if not nightly_image:
+        raise ValueError("image is required")
+    return nightly_image
+
+
+# Endpoint -> (function reading its arguments from the query, function computing the report from them).
+ENDPOINTS = {
+    "/brief": (lambda query: (_zone_arg(query), _job_filter_arg(query)), brief_report),
+    "/detailed": (lambda query: (_zone_arg(query), _job_filter_arg(query)), detailed_report),
+    "/frequency": (lambda query: (_builds_arg(query), _zone_arg(query)), frequency_report),
+    "/nightly": (lambda query: (_image_arg(query),), nightly_report),
+}
+
+
+def _build_report(path, args):
+    results, output = monitor.run_captured(ENDPOINTS[path][1], *args)
+    return {"report": path[1:], "job_type": JOB_TYPE, "results": results, "messages": output.splitlines()}
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+
+    '''
+    Serves the reports of ENDPOINTS as JSON with an ETag, a request whose If-None-Match holds it gets 304 Not Modified.
+    '''
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == "/":
+            self._send_json(200, {"job_type": JOB_TYPE, "endpoints": sorted(ENDPOINTS), "probes": dict(monitor.PROBE_COUNTS)})
+            return
+        if url.path not in ENDPOINTS:
+            self._send_json(404, {"error": "Unknown endpoint " + url.path})
+            return
+        query = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            args = ENDPOINTS[url.path][0](query)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        try:
+            etag, body, created = REPORTS.get((url.path,) + args, lambda: _build_report(url.path, args))
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        if etag in [tag.strip().replace("W/", "", 1) for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", email.utils.formatdate(created, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    global CONFIG_DATA, JOB_TYPE, REPORTS
+    parser = argparse.ArgumentParser(description='Serve the daily build updates, testcase frequencies and nightly aggregates as JSON')
+    parser.add_argument('--job_type', default='p', choices=['p','z','pa'], help='Specify the CI job type (Power(p) or s390x(z) or Power Auxillary(pa)), default is p')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on, default is 127.0.0.1')
+    parser.add_argument('--port', type=int, default=constants.REPORT_SERVER_PORT, help='Port to listen on, default is {}'.format(constants.REPORT_SERVER_PORT))
+    parser.add_argument('--ttl', type=int, default=constants.REPORT_CACHE_TTL, help='Seconds a report is served from the cache, default is {}'.format(constants.REPORT_CACHE_TTL))
+    parser.add_argument('--workers', type=int, default=1, help='Number of builds to evaluate concurrently, default is 1')
+    parser.add_argument('--async_fetch', action='store_true', help='Fetch the artifacts of all the builds of a CI concurrently on an event loop before evaluating them')
+    parser.add_argument('--history_db', metavar='PATH', help='History database (SQLite file) the lease, nightly image and failed testcases of the analysed builds are kept in, so later runs read them without fetching the artifacts again, off by default')
+    parser.add_argument('--listing', default='html', choices=['html','gcs'], help='Source of the build listings, Prow job history pages (html) or GCS build directories (gcs), default is html')
+    args = parser.parse_args()
+    if args.ttl < 1:
+        parser.error("Cache ttl must be at least 1 second")
+
+    JOB_TYPE = args.job_type
+    monitor.PROW_URL = monitor.set_prow_url(args.job_type)
+    monitor.set_workers(args.workers)
+    monitor.set_async_fetch(args.async_fetch)
+    store = None
+    if args.history_db:
+        store = history_db.HistoryStore(args.history_db)
+        monitor.TESTCASE_INDEX = store
+        monitor.NIGHTLY_INDEX = store
+    monitor.set_listing_backend(args.listing)
+    CONFIG_DATA = monitor.load_config(report.CONFIG_FILES[args.job_type])
+    REPORTS = ReportCache(args.ttl)
+
+    server = ThreadingHTTPServer((args.host, args.port), ReportHandler)
+    print("Serving the {} reports on http://{}:{}/".format(args.job_type, args.host, server.server_address[1]))
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if store is not None:
+            store.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-import subprocess
+import report
 
 def capture_output():
-    result = subprocess.run(['python3', 'CI_DailyBuildUpdates.py'],capture_output=True, text=True)
-    print(result.stdout)
-    return result.stdout
+    daily_report = report.generate_daily_report("p", "brief")
+    text = daily_report.render()
+    print(text)
+    return text
 
 capture_output()
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class FailureMatrix:
+
+    '''
+    Sparse builds x testcases matrix of testcase failures.
+
+    Row i holds the failures of builds[i] in compressed sparse row form, indptr[i]:indptr[i+1] slices
+    indices (testcase column) and counts (number of testsuites the testcase failed in for the build).
+    Testcase columns are numbered in the order the testcases are first seen, so ties in the frequency
+    keep the order the dict loop of get_testcase_frequency produced.
+    '''
+
+    def __init__(self, builds, testcases, indptr, indices, counts, labels=None):
+        self.builds = builds
+        self.testcases = testcases
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+        self.labels = labels or {}
+        self._testcase_array = np.array(testcases, dtype=object)
+
+    @classmethod
+    def from_failures(cls, failures, labels=None):
+
+        '''
+        Builds the matrix from the failed testcases of the builds.
+
+        Parameter:
+            failures (iterable): Tuples of a build and its failed testcases of all testsuites ({suite: [testcase]}).
+            labels (dict, optional): Per build labels used for breakdowns, e.g. {"ci": [...], "zone": [...]} in build order.
+
+        Returns:
+            FailureMatrix: Matrix of the failures.
+        '''
+
+        builds = []
+        testcase_ids = {}
+        indptr = [0]
+        indices = []
+        for build, failed_tc in failures:
+            builds.append(build)
+            for testcases in failed_tc.values():
+                for tc in testcases:
+                    indices.append(testcase_ids.setdefault(tc, len(testcase_ids)))
+            indptr.append(len(indices))
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = np.repeat(np.arange(len(builds), dtype=np.int64), np.diff(indptr))
+        # Merge the repeated (build, testcase) entries into counts.
+        keys, counts = np.unique(rows * max(len(testcase_ids), 1) + indices, return_counts=True)
+        merged_rows = keys // max(len(testcase_ids), 1)
+        indices = keys % max(len(testcase_ids), 1)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(merged_rows, minlength=len(builds)))))
+        return cls(builds, list(testcase_ids), indptr, indices, counts, labels)
+
+    def _rows(self):
+        return np.repeat(np.arange(len(self.builds), dtype=np.int64), np.diff(self.indptr))
+
+    def _sorted(self, totals, tc_name=None, min_count=1):
+        min_count = max(min_count, 1)
+        if tc_name is not None:
+            columns = {tc: i for i, tc in enumerate(self.testcases)}
+            return {tc: int(totals[columns[tc]]) for tc in tc_name if tc in columns and totals[columns[tc]] >= min_count}
+        order = np.argsort(-totals, kind="stable")
+        order = order[totals[order] >= min_count]
+        return dict(zip(self._testcase_array[order].tolist(), totals[order].tolist()))
+
+    def frequency(self, tc_name=None, distinct=False, min_count=1):
+
+        '''
+        Counts the failures of every testcase.
+
+        Parameter:
+            tc_name (list, optional): Testcases to report, all by default.
+            distinct (bool, optional): Counts builds instead of testsuite failures.
+            min_count (int, optional): Lowest frequency reported, testcases failing less often are left out.
+
+        Returns:
+            dict: Testcase and its frequency, highest first unless tc_name gives the order.
+        '''
+
+        weights = np.ones_like(self.counts) if distinct else self.counts
+        totals = np.bincount(self.indices, weights=weights, minlength=len(self.testcases)).astype(np.int64)
+        return self._sorted(totals, tc_name, min_count)
+
+    def frequency_by(self, label, tc_name=None, distinct=False):
+
+        '''
+        Counts the failures of every testcase per value of a build label, e.g. per CI or per zone.
+
+        Parameter:
+            label (string): Name of the label given to from_failures.
+            tc_name (list, optional): Testcases to report, all by default.
+            distinct (bool, optional): Counts builds instead of testsuite failures.
+
+        Returns:
+            dict: Label value and the frequency dict of its builds, in the order the values are first seen.
+        '''
+
+        values, first_index, groups = np.unique(np.asarray([str(value) for value in self.labels[label]]),
+                                                return_index=True, return_inverse=True)
+        n_tc = len(self.testcases)
+        weights = np.ones_like(self.counts) if distinct else self.counts
+        cells = groups[self._rows()] * n_tc + self.indices
+        totals = np.bincount(cells, weights=weights, minlength=len(values) * n_tc).astype(np.int64)
+        totals = totals.reshape(len(values), n_tc)
+        return {str(values[group]): self._sorted(totals[group], tc_name) for group in np.argsort(first_index)}
+
+    def window_counts(self, tc_name, window):
+
+        '''
+        Counts the builds failing each testcase in every window of consecutive builds.
+
+        Parameter:
+            tc_name (list): Testcases to count.
+            window (int): Number of consecutive builds in a window.
+
+        Returns:
+            numpy.ndarray: Array of shape (number of windows, len(tc_name)), row i counts builds[i:i+window].
+        '''
+
+        columns = {tc: i for i, tc in enumerate(self.testcases)}
+        failed = np.zeros((len(self.builds), len(tc_name)), dtype=np.int64)
+        rows = self._rows()
+        for j, tc in enumerate(tc_name):
+            if tc in columns:
+                failed[rows[self.indices == columns[tc]], j] = 1
+        cumulative = np.vstack((np.zeros((1, len(tc_name)), dtype=np.int64), np.cumsum(failed, axis=0)))
+        if window > len(self.builds):
+            return cumulative[-1:] - cumulative[:1]
+        return cumulative[window:] - cumulative[:-window]
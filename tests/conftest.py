@@ -0,0 +1,55 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+# Start time of the newest builds of the fake Prow, today for the daily listings.
+PROW_NOW = datetime(2024, 10, 18, 12)
+
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, TESTS_DIR)
+
+
+@pytest.fixture
+def read_fixture():
+
+    '''
+    Returns a function reading a file of tests/fixtures as bytes.
+    '''
+
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as fixture:
+            return fixture.read()
+
+    return read
+
+
+@pytest.fixture(scope="module")
+def prow():
+
+    '''
+    Serves tests/fake_prow.py and points the scripts at it, without the on-disk artifact cache.
+    '''
+
+    import artifact_cache
+    import constants
+    import fake_prow
+    import monitor
+
+    server = fake_prow.serve(now=PROW_NOW, n_builds=30, log_lines=200)
+    base = "http://127.0.0.1:{}".format(server.server_address[1])
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(constants, "PROW_VIEW_URL", base + "/gcs")
+        patch.setattr(constants, "JOB_LINK_URL", base + "/")
+        patch.setattr(constants, "GCS_API_URL", base + "/storage/v1/b/")
+        patch.setattr(monitor, "PROW_URL", base + "/job-history/gs/origin-ci-test/logs/")
+        patch.setattr(monitor, "get_current_date", lambda: PROW_NOW)
+        patch.setattr(artifact_cache, "CACHE_DIR", None)
+        monitor.clear_run_caches()
+        yield server
+        monitor.clear_run_caches()
+    server.shutdown()
+    server.server_close()
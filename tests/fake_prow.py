@@ -0,0 +1,289 @@
+'''
+Local stand-in of the Prow job history pages, the gcsweb artifact pages and the GCS JSON API.
+
+The builds of JOBS are generated from a fixed seed: build ids are snowflake ids of their creation
+time, every build has started.json, prowjob.json, finished.json (unless it is still pending), a
+build log with the lease and the nightly image, the install and test steps with their junit files
+and the gather directory with the node status. Requests are counted per path in STATS.
+
+    python3 tests/fake_prow.py 8765
+'''
+
+import json
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BUCKET = "origin-ci-test"
+# Job name -> platform and version of its builds.
+JOBS = {
+    "periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-e2e-ovn-remote-libvirt-ppc64le": ("libvirt", "4.16"),
+    "periodic-ci-openshift-multiarch-master-nightly-4.15-ocp-e2e-ovn-ppc64le-powervs-original": ("powervs", "4.15"),
+    "periodic-ci-openshift-multiarch-master-nightly-4.14-ocp-e2e-ovn-remote-s2s-libvirt-ppc64le": ("libvirt", "4.14"),
+}
+PROW_BUILD_ID_EPOCH_MS = 1288834974657
+PAGE_SIZE = 20
+
+FILES = {}
+BUILDS = {}
+STATS = {"requests": 0, "paths": {}}
+_stats_lock = threading.Lock()
+
+
+def _build_id(created, sequence):
+    milliseconds = int(created.replace(tzinfo=timezone.utc).timestamp() * 1000) - PROW_BUILD_ID_EPOCH_MS
+    return str((milliseconds << 22) + sequence)
+
+
+def _add(path, data):
+    FILES[path] = data.encode() if isinstance(data, str) else data
+
+
+def _add_build(rnd, job, platform, version, started, sequence, result, log_lines):
+    created = started - timedelta(seconds=10)
+    build_id = _build_id(created, sequence)
+    base = "/gcs/{}/logs/{}/{}".format(BUCKET, job, build_id)
+    job_type = re.search(r"ocp.*", job).group(0)
+    artifacts = base + "/artifacts/" + job_type
+    started_text = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+    state = "pending" if result == "PENDING" else result.lower()
+
+    _add(base + "/started.json", json.dumps({"timestamp": int(started.replace(tzinfo=timezone.utc).timestamp())}))
+    _add(base + "/prowjob.json", json.dumps({"metadata": {"creationTimestamp": created.strftime("%Y-%m-%dT%H:%M:%SZ")},
+                                             "status": {"startTime": started_text, "state": state}}))
+    if result != "PENDING":
+        _add(base + "/finished.json", json.dumps({"timestamp": 0, "passed": result == "SUCCESS", "result": result}))
+
+    if platform == "powervs":
+        lease = rnd.choice(["syd04", "syd05", "mad02"])
+        quota = "powervs-1"
+        install = artifacts + "/ipi-install-powervs-install"
+    else:
+        lease = rnd.choice(["libvirt-ppc64le-s2s-0-1", "libvirt-ppc64le-s2s-1-0"])
+        quota = "libvirt-ppc64le-s2s"
+        install = artifacts + ("/upi-install-libvirt" if float(version) >= 4.16 else "/ipi-install-libvirt-install")
+    nightly = "registry.ci.openshift.org/ocp-ppc64le/release-ppc64le:{}.0-0.nightly-ppc64le-{}".format(
+        version, (started - timedelta(hours=5)).strftime("%Y-%m-%d-%H%M%S"))
+    lines = ["INFO[2024] ci-operator version v2024",
+             "INFO Acquired 1 lease(s) for {}-quota-slice: [{}]".format(quota, lease),
+             "INFO Resolved release ppc64le-latest to " + nightly]
+    lines += ["INFO step line {} ".format(i) + "x" * 80 for i in range(log_lines)]
+    install_ok = result == "SUCCESS" or rnd.random() < 0.6
+    if not install_ok and rnd.random() < 0.3:
+        lines.append("ERROR failed to connect to the hypervisor")
+    _add(base + "/build-log.txt", "\n".join(lines) + "\n")
+
+    if result != "PENDING":
+        _add(install + "/finished.json", json.dumps({"result": "SUCCESS" if install_ok else "FAILURE"}))
+        _add(install + "/build-log.txt", "level=fatal msg=boom\nline2\nline3\n")
+    gather = "/gather-libvirt" if platform == "libvirt" and rnd.random() < 0.7 else "/gather-extra"
+    worker = "compute-" if float(version) > 4.15 and platform == "libvirt" else "worker-"
+    nodes = "NAME STATUS ROLES\n" + "".join("m{} Ready control-plane,master\n".format(i) for i in range(3))
+    nodes += "{0}0 Ready worker\n{0}1 {1} worker\n".format(worker, "NotReady" if rnd.random() < 0.2 else "Ready")
+    _add(artifacts + gather + "/artifacts/oc_cmds/nodes", nodes)
+    symptoms = "".join('<testcase name="sym{}">'.format(i) + ("<failure>x</failure>" if rnd.random() < 0.1 else "") + "</testcase>"
+                       for i in range(5))
+    _add(artifacts + gather + "/artifacts/junit/junit_symptoms.xml", "<testsuite>" + symptoms + "</testsuite>")
+
+    tests = artifacts + "/openshift-e2e-libvirt-test"
+    test_status = "SUCCESS" if result == "SUCCESS" else rnd.choice(["FAILURE", "FAILURE", "SUCCESS", "ABORTED"])
+    if install_ok and result != "PENDING":
+        _add(tests + "/finished.json", json.dumps({"result": test_status}))
+        failed = 0 if test_status == "SUCCESS" else rnd.choice([1, 2, 3, 8])
+        names = ["[sig-{}] test {}".format(rnd.choice(["network", "storage", "node"]), rnd.randint(0, 12)) for _ in range(failed)]
+        _add(tests + "/artifacts/junit/test-failures-summary_20240101-101010.json",
+             json.dumps({"Tests": [{"Test": {"Name": name}} for name in names]}))
+        _add(tests + "/artifacts/junit/test-failures-summary_monitor_20240101-101010.json",
+             json.dumps({"Tests": [{"Test": {"Name": "monitor-x"}}] if rnd.random() < 0.2 else []}))
+        monitor_tests = "".join('<testcase name="mon{}">'.format(i) + ("<failure>x</failure>" if rnd.random() < 0.15 else "") + "</testcase>"
+                                for i in range(8))
+        _add(tests + "/artifacts/junit/e2e-monitor-tests__20240101-101010.xml", "<testsuite>" + monitor_tests + "</testsuite>")
+    kdump = "/kdump.tar" if rnd.random() < 0.1 else "/other.txt"
+    _add(artifacts + "/ipi-conf-debug-kdump-gather-logs/artifacts" + kdump, "x")
+
+    return {"SpyglassLink": "/view/gs/{}/logs/{}/{}".format(BUCKET, job, build_id), "ID": build_id,
+            "Started": started_text, "Duration": 3600000000000, "Result": result, "Refs": None}
+
+
+def generate(now, n_builds=70, log_lines=2000, seed=42):
+
+    '''
+    Generates the builds of JOBS, one every 40 minutes before now, the newest one is still pending.
+
+    Parameter:
+        now (datetime): Time (UTC, naive) the newest builds started at.
+        n_builds (int, optional): Number of builds of every job.
+        log_lines (int, optional): Filler lines of every build log after the lease and the nightly image.
+        seed (int, optional): Seed of the results, leases and failed testcases.
+    '''
+
+    rnd = random.Random(seed)
+    FILES.clear()
+    BUILDS.clear()
+    for sequence, (job, (platform, version)) in enumerate(JOBS.items()):
+        builds = []
+        for k in range(n_builds):
+            started = now - timedelta(minutes=40 * k + 7 * sequence + 3)
+            r = rnd.random()
+            if k == 0:
+                result = "PENDING"
+            elif r < 0.35:
+                result = "SUCCESS"
+            elif r < 0.9:
+                result = "FAILURE"
+            else:
+                result = "ABORTED" if r < 0.95 else "ERROR"
+            builds.append(_add_build(rnd, job, platform, version, started, sequence, result, log_lines))
+        BUILDS[job] = builds
+
+
+def _listing_page(path):
+    prefix = path.rstrip("/") + "/"
+    entries = set()
+    for file_path in FILES:
+        if file_path.startswith(prefix):
+            rest = file_path[len(prefix):]
+            entries.add(rest.split("/")[0] + "/" if "/" in rest else rest)
+    if not entries:
+        return None
+    rows = "".join('<li class="grid-row"><a href="{}{}"><img src="/icons/{}.png"> {}</a></li>\n'.format(
+        prefix, entry, "dir" if entry.endswith("/") else "file", entry) for entry in sorted(entries))
+    return ('<html><head><title>{}</title></head><body><ul class="resource-grid">\n'
+            '<li><a href="{}../">..</a></li>\n{}</ul></body></html>').format(path, prefix, rows).encode()
+
+
+def _history_page(job, cursor):
+    builds = BUILDS.get(job)
+    if builds is None:
+        return None
+    selected = [build for build in builds if int(build["ID"]) < int(cursor)] if cursor else builds
+    page = selected[:PAGE_SIZE]
+    older = ""
+    if len(selected) > PAGE_SIZE:
+        older = '<a href="/job-history/gs/{}/logs/{}?buildId={}">&lt;- Older Runs</a>'.format(BUCKET, job, page[-1]["ID"])
+    return '''<!DOCTYPE html><html><head><title>{}</title>
+<script type="text/javascript" src="/static/extensions/script.js"></script>
+<script type="text/javascript">
+var allBuilds = {};
+var spyglass = true;
+</script></head><body>
+<table class="mdl-data-table"><tbody><tr><td>{}</td></tr></tbody></table>
+<table id="builds"></table></body></html>'''.format(job, json.dumps(page), older).encode()
+
+
+def _gcs_objects(bucket, query):
+    prefix = query["prefix"][0]
+    start_offset = query.get("startOffset", [""])[0]
+    end_offset = query.get("endOffset", [None])[0]
+    root = "/gcs/{}/{}".format(bucket, prefix)
+    prefixes = set()
+    for file_path in FILES:
+        if file_path.startswith(root) and "/" in file_path[len(root):]:
+            prefixes.add(prefix + file_path[len(root):].split("/")[0] + "/")
+    prefixes = sorted(name for name in prefixes if name >= start_offset and (end_offset is None or name < end_offset))
+    token = int(query.get("pageToken", ["0"])[0])
+    max_results = int(query.get("maxResults", ["1000"])[0])
+    listing = {"kind": "storage#objects", "prefixes": prefixes[token:token + max_results]}
+    if token + max_results < len(prefixes):
+        listing["nextPageToken"] = str(token + max_results)
+    return json.dumps(listing).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = re.sub(r"/+", "/", url.path)
+        with _stats_lock:
+            STATS["requests"] += 1
+            STATS["paths"][path] = STATS["paths"].get(path, 0) + 1
+        content_type = "text/plain; charset=utf-8"
+        body = None
+        job_history = "/job-history/gs/{}/logs/".format(BUCKET)
+        gcs_objects = re.match(r"/storage/v1/b/([^/]+)/o$", path)
+        if path.startswith(job_history):
+            body = _history_page(path[len(job_history):], parse_qs(url.query).get("buildId", [None])[0])
+            content_type = "text/html; charset=utf-8"
+        elif gcs_objects:
+            body = _gcs_objects(gcs_objects.group(1), parse_qs(url.query))
+            content_type = "application/json"
+        elif path in FILES:
+            body = FILES[path]
+            if path.endswith(".json"):
+                content_type = "application/json"
+        elif path.startswith("/gcs/"):
+            body = _listing_page(path)
+            content_type = "text/html; charset=utf-8"
+        if body is None:
+            self._send(404, "text/plain", b"not found")
+            return
+        range_match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if range_match and path in FILES:
+            start = int(range_match.group(1))
+            end = int(range_match.group(2)) if range_match.group(2) else len(body) - 1
+            part = body[start:end + 1]
+            self._send(206, content_type, part, {"Content-Range": "bytes {}-{}/{}".format(start, start + len(part) - 1, len(body))})
+            return
+        self._send(200, content_type, body)
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def requests_to(fragment):
+
+    '''
+    Counts the requests of the paths containing fragment.
+    '''
+
+    with _stats_lock:
+        return sum(count for path, count in STATS["paths"].items() if fragment in path)
+
+
+def reset_stats():
+    with _stats_lock:
+        STATS["requests"] = 0
+        STATS["paths"] = {}
+
+
+def serve(port=0, now=None, **options):
+
+    '''
+    Generates the builds and serves them on a daemon thread.
+
+    Parameter:
+        port (int, optional): Port to listen on, a free port by default.
+        now (datetime, optional): Start time of the newest builds, the current hour (UTC) by default.
+        options: n_builds, log_lines and seed of generate.
+
+    Returns:
+        ThreadingHTTPServer: Server, its base url is http://127.0.0.1:<server_address[1]>.
+    '''
+
+    generate(now or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0, tzinfo=None), **options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    server = serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print("Serving the fake Prow on http://127.0.0.1:{}/".format(server.server_address[1]), flush=True)
+    threading.Event().wait()
@@ -0,0 +1,52 @@
+import gzip
+import os
+
+import pytest
+import requests
+
+import artifact_cache
+import constants
+
+URL = constants.PROW_VIEW_URL + "/origin-ci-test/logs/job/1846295088968241152/build-log.txt"
+
+
+def response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def files(cache_dir):
+    return sorted(name for _, _, names in os.walk(cache_dir) for name in names)
+
+
+def disk_size():
+    return sum(entry.stat().st_size for entry in artifact_cache._iter_entries())
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    artifact_cache.set_cache_dir(str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+    artifact_cache.set_cache_dir(constants.ARTIFACT_CACHE_DIR)
+
+
+def test_store_counts_every_entry_once(cache_dir):
+    artifact_cache.store(URL, response(b"lease\n" * 100))
+    assert artifact_cache._size == disk_size()
+    artifact_cache.store(URL, response(os.urandom(5000)))
+    assert artifact_cache._size == disk_size()
+    artifact_cache.store(URL + ".1", response(b"nightly\n"))
+    assert artifact_cache._size == disk_size()
+    assert artifact_cache.load(URL + ".1").content == b"nightly\n"
+
+
+def test_store_removes_the_temporary_file_of_a_failed_write(cache_dir, monkeypatch):
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(gzip.GzipFile, "write", write)
+    artifact_cache.store(URL, response(b"lease\n"))
+    assert files(cache_dir) == []
+    assert artifact_cache.load(URL) is None
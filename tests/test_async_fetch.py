@@ -0,0 +1,79 @@
+import collections
+import io
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import fake_prow
+import monitor
+
+JOB = list(fake_prow.JOBS)[0]
+
+
+@pytest.fixture
+def builds(prow):
+    monitor.clear_run_caches()
+    builds = monitor.get_n_recent_jobs(JOB, 25)
+    yield builds
+    monitor.clear_run_caches()
+
+
+def evaluate(func, builds, *args):
+    return [monitor.run_captured(func, build, "4.16 libvirt", *args) for build in builds]
+
+
+@pytest.mark.parametrize("evaluation, func", [
+    ("brief", monitor.get_brief_build_info),
+    ("detailed", monitor.get_detailed_build_info),
+])
+@pytest.mark.parametrize("zone, job_filter", [(None, "all"), (["libvirt-ppc64le-s2s-0-1"], "all"), (None, "failure")])
+def test_prefetch_serves_the_evaluation(builds, evaluation, func, zone, job_filter):
+    expected = evaluate(func, builds, zone, job_filter)
+
+    monitor.clear_run_caches()
+    executed = monitor.prefetch_builds(builds, evaluation, zone, job_filter)
+    assert list(executed) == builds
+    fake_prow.reset_stats()
+    assert evaluate(func, builds, zone, job_filter) == expected
+    # The build logs are read in chunks past the prefetched head, everything else is in the fetcher cache.
+    assert fake_prow.STATS["requests"] == fake_prow.requests_to("/build-log.txt")
+
+
+def test_prefetch_skips_builds_out_of_zone(builds):
+    executed = monitor.prefetch_builds(builds, "detailed", ["nowhere"])
+    for build in builds:
+        assert executed[build] == ["finished", "lease"]
+        # The lease is read from the streamed head of the build log, the log is not downloaded.
+        assert build in monitor._build_log_results
+        assert monitor.fetcher.get_cached(build.build_log_url) is None
+
+
+def test_prefetch_skips_builds_listed_as_passed(builds):
+    executed = monitor.prefetch_builds(builds, "brief", None, "failure")
+    passed = [build for build in builds if build.listed_result == "SUCCESS"]
+    assert passed
+    for build in passed:
+        assert executed[build] == []
+    for build in builds:
+        if build.listed_result == "FAILURE":
+            assert executed[build][:2] == ["finished", "install"]
+
+
+def test_prefetch_for_testcases_reads_the_test_results(builds):
+    executed = monitor.prefetch_builds(builds, "testcases")
+    installed = [build for build in builds if monitor.cluster_deploy_status(build) == "SUCCESS"]
+    assert installed
+    for build in builds:
+        assert ("failure_summaries" in executed[build]) == (build in installed)
+        assert "prowjob" not in executed[build] and "build_log" not in executed[build]
+
+
+def test_prefetch_for_counts_the_probes(builds, monkeypatch):
+    monkeypatch.setattr(monitor, "ASYNC_FETCH", True)
+    monkeypatch.setattr(monitor, "PROBE_COUNTS", collections.Counter())
+    monitor._prefetch_for(monitor.get_detailed_build_info, builds, "detailed", ["nowhere"])
+    assert monitor.PROBE_COUNTS == {"finished": len(builds), "lease": len(builds)}
+    output = io.StringIO()
+    monitor.print_probe_counts(output)
+    assert "finished={0} lease={0} install=0 ".format(len(builds)) in output.getvalue()
@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+import monitor
+
+BUILD_PATH = ("/gcs/origin-ci-test/logs/periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-e2e-ovn-remote-libvirt-ppc64le"
+              "/1847061335720857600/artifacts/ocp-e2e-ovn-remote-libvirt-ppc64le/")
+ARTIFACTS_URL = "https://gcsweb.example.com" + BUILD_PATH
+JUNIT_URL = ARTIFACTS_URL + "openshift-e2e-libvirt-test/artifacts/junit/"
+
+
+def parse(read_fixture, name, url):
+    return monitor.DirectoryListing.parse(url, read_fixture(name).decode())
+
+
+def test_parse_artifacts_directory(read_fixture):
+    listing = parse(read_fixture, "gcsweb_artifacts.html", ARTIFACTS_URL)
+    assert listing.entries == (
+        "gather-audit-logs/", "gather-extra/", "gather-libvirt/", "gather-must-gather/",
+        "ipi-conf-debug-kdump-configure-logs/", "ipi-conf-debug-kdump-gather-logs/",
+        "openshift-e2e-libvirt-test/", "upi-install-libvirt/", "build-log.txt")
+    # The parent directory and the breadcrumb links of the header are not entries.
+    assert ".." not in listing
+    assert "artifacts/" not in listing
+
+
+def test_gather_libvirt_lookup_matches_page_search(read_fixture):
+    text = read_fixture("gcsweb_artifacts.html").decode()
+    listing = monitor.DirectoryListing.parse(ARTIFACTS_URL, text)
+    assert ("gather-libvirt/" in listing) == ("gather-libvirt" in text)
+    text = text.replace("gather-libvirt", "gather-ibmcloud")
+    listing = monitor.DirectoryListing.parse(ARTIFACTS_URL, text)
+    assert ("gather-libvirt/" in listing) == ("gather-libvirt" in text) == False
+
+
+@pytest.mark.parametrize("pattern", [
+    monitor._e2e_summary_filename_re,
+    monitor._monitor_summary_filename_re,
+    monitor._monitor_junit_filename_re,
+])
+def test_search_matches_page_regex(read_fixture, pattern):
+    text = read_fixture("gcsweb_junit.html").decode()
+    listing = monitor.DirectoryListing.parse(JUNIT_URL, text)
+    # The file names were searched in the raw page before.
+    expected = re.compile(pattern.pattern).search(text, re.MULTILINE | re.DOTALL)
+    assert listing.search(pattern).group(1) == expected.group(1)
+
+
+def test_search_without_match(read_fixture):
+    listing = parse(read_fixture, "gcsweb_artifacts.html", ARTIFACTS_URL)
+    assert listing.search(monitor._kdump_filename_re) is None
+
+
+def test_parse_links_to_the_bucket():
+    text = ('<a href="/gcs/origin-ci-test/logs/"><img src="/icons/back.png"> ..</a>'
+            '<a href="https://storage.googleapis.com/origin-ci-test/logs/job/1/finished.json">finished.json</a>'
+            '<a href="https://storage.googleapis.com/other-bucket/logs/job/1/started.json">started.json</a>'
+            '<a href="https://cloud.google.com/storage/docs/gsutil">gsutil</a>'
+            '<a href="/gcs/origin-ci-test/logs/job/1/artifacts/">artifacts/</a>')
+    listing = monitor.DirectoryListing.parse("https://gcsweb.example.com/gcs/origin-ci-test/logs/job/1/", text)
+    assert listing.entries == ("finished.json", "artifacts/")
+
+
+def test_parse_unescapes_links():
+    text = '<a href="/gcs/b/logs/job/1/a&amp;b.txt">a&amp;b.txt</a>'
+    listing = monitor.DirectoryListing.parse("https://gcsweb.example.com/gcs/b/logs/job/1", text)
+    assert listing.entries == ("a&b.txt",)
@@ -0,0 +1,99 @@
+import json
+import urllib.parse
+from datetime import datetime, timedelta
+
+import pytest
+
+import constants
+import job_history
+import monitor
+
+# Build ids of the artifact links of monitor.py and the time they were created (UTC).
+BUILD_IDS = [
+    (1820746900182142976, datetime(2024, 8, 6, 9, 1, 3, 502000)),
+    (1846295088968241152, datetime(2024, 10, 15, 21, 0, 26, 371000)),
+    (1846642613847855104, datetime(2024, 10, 16, 20, 1, 22, 759000)),
+    (1847155042210025472, datetime(2024, 10, 18, 5, 57, 35, 201000)),
+]
+
+
+class Response:
+
+    '''
+    Response of fetcher.get with a JSON body.
+    '''
+
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(json.dumps(self._data))
+
+
+@pytest.mark.parametrize("build_id, created", BUILD_IDS)
+def test_build_id_at_orders_like_the_build_ids(build_id, created):
+    assert job_history.build_id_at(created) <= build_id
+    assert build_id < job_history.build_id_at(created + timedelta(milliseconds=1))
+
+
+def test_gcs_build_ids_bounds_the_listing(monkeypatch):
+    prefix = "logs/periodic-ci/"
+    requests = []
+
+    def get(url):
+        requests.append(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query))
+        if len(requests) == 1:
+            return Response({"prefixes": [prefix + "1846295088968241152/"], "nextPageToken": "t"})
+        return Response({"prefixes": [prefix + "1846642613847855104/", prefix + "latest-build.txt/"]})
+
+    monkeypatch.setattr(monitor.fetcher, "get", get)
+    since, until = BUILD_IDS[1][1], BUILD_IDS[2][1]
+    assert monitor._gcs_build_ids("origin-ci-test", prefix, since, until) == ["1846642613847855104", "1846295088968241152"]
+    start_offset, end_offset = requests[0]["startOffset"][0], requests[0]["endOffset"][0]
+    assert start_offset < prefix + "1846295088968241152/" and prefix + "1846642613847855104/" < end_offset
+    assert start_offset > prefix + "1820746900182142976/" and end_offset < prefix + "1847155042210025472/"
+    assert requests[1]["pageToken"] == ["t"] and requests[1]["startOffset"] == [start_offset]
+
+
+def test_gcs_build_ids_without_bounds(monkeypatch):
+    requests = []
+
+    def get(url):
+        requests.append(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query))
+        return Response({})
+
+    monkeypatch.setattr(monitor.fetcher, "get", get)
+    assert monitor._gcs_build_ids("origin-ci-test", "logs/periodic-ci/") == []
+    assert "startOffset" not in requests[0] and "endOffset" not in requests[0]
+
+
+@pytest.mark.parametrize("status, result", [
+    ({"startTime": "2024-10-15T21:00:40Z", "state": "success"}, "SUCCESS"),
+    ({"startTime": "2024-10-15T21:00:40Z", "state": "failure"}, "FAILURE"),
+    ({"startTime": "2024-10-15T21:00:40Z", "state": "pending"}, "PENDING"),
+    ({"state": "triggered"}, None),
+])
+def test_gcs_listed_build_reads_prowjob(monkeypatch, status, result):
+    urls = []
+
+    def get(url):
+        urls.append(url)
+        return Response({"metadata": {}, "status": status})
+
+    monkeypatch.setattr(monitor.fetcher, "get", get)
+    build = monitor._gcs_listed_build("origin-ci-test", "logs/periodic-ci/", "1846295088968241152")
+    assert urls == [constants.PROW_VIEW_URL + "/origin-ci-test/logs/periodic-ci/1846295088968241152/prowjob.json"]
+    if result is None:
+        assert build is None
+    else:
+        assert build == ("1846295088968241152", "/view/gs/origin-ci-test/logs/periodic-ci/1846295088968241152",
+                         datetime(2024, 10, 15, 21, 0, 40), result)
+
+
+def test_gcs_listed_build_without_prowjob(monkeypatch):
+    monkeypatch.setattr(monitor.fetcher, "get", lambda url: Response(None, 404))
+    assert monitor._gcs_listed_build("origin-ci-test", "logs/periodic-ci/", "1846295088968241152") is None
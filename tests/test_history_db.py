@@ -0,0 +1,77 @@
+import importlib
+import os
+from datetime import datetime
+
+import pytest
+
+import fake_prow
+import history_db
+import job_history
+import monitor
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOB = "periodic-ci-openshift-multiarch-master-nightly-4.16-ocp-e2e-ovn-remote-libvirt-ppc64le"
+NIGHTLY = "registry.ci.openshift.org/ocp-ppc64le/release-ppc64le:4.16.0-0.nightly-ppc64le-"
+
+
+def spylink(job_name, build_id):
+    return "/view/gs/origin-ci-test/logs/{}/{}".format(job_name, build_id)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = history_db.HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def test_build_created_inverts_build_id_at():
+    created = datetime(2024, 10, 15, 21, 0, 26, 371000)
+    assert job_history.build_created(job_history.build_id_at(created)) == created
+    assert job_history.build_created("1846295088968241152") == created
+
+
+def test_get_indexed_nightlies(store):
+    builds = [(datetime(2024, 10, 15, 21), "2024-10-15-160000"), (datetime(2024, 10, 16, 3), "2024-10-15-160000"),
+              (datetime(2024, 10, 16, 9), "2024-10-16-040000")]
+    for created, nightly_date in reversed(builds):
+        build_id = job_history.build_id_at(created)
+        store.index_build_log(spylink(JOB, build_id), "libvirt-ppc64le-s2s-0-1", NIGHTLY + nightly_date)
+    store.index_build_log(spylink(JOB.replace("4.16", "4.15"), job_history.build_id_at(builds[1][0])), None, NIGHTLY + "2024-10-15-160000")
+
+    rows = store.get_indexed_nightlies(JOB)
+    assert [row["build_id"] for row in rows] == [job_history.build_id_at(created) for created, _ in builds]
+    assert [row["nightly"] for row in rows] == [NIGHTLY + nightly_date for _, nightly_date in builds]
+    assert [row["build_id"] for row in store.get_indexed_nightlies(JOB, datetime(2024, 10, 16))] == \
+        [job_history.build_id_at(created) for created, _ in builds[1:]]
+    assert store.get_indexed_nightlies(JOB, datetime(2024, 10, 17)) == []
+
+
+def test_index_build_without_listed_start_time(store):
+    build_id = job_history.build_id_at(datetime(2024, 10, 16, 3))
+    store.index_build(spylink(JOB, build_id), {"conformance": ["[sig-network] test 3"], "monitor": []})
+    store.index_build(spylink(JOB, build_id + 1), {"conformance": ["[sig-network] test 3"]}, datetime(2024, 10, 16, 3, 0, 12))
+    rows = store.find_testcase_failures("[SIG-network]  test 3", since=datetime(2024, 10, 16))
+    assert [(row["build_id"], row["started"]) for row in rows] == \
+        [(build_id + 1, "2024-10-16T03:00:12"), (build_id, "2024-10-16T03:00:00")]
+
+
+@pytest.mark.parametrize("zone", [None, ["mad02"]])
+@pytest.mark.parametrize("job_filter", ["all", "failure", "success"])
+def test_use_db_gives_the_totals_of_the_live_run(prow, store, monkeypatch, zone, job_filter):
+    # CI_JobHistory reads config.ini of the working directory on import.
+    monkeypatch.chdir(REPO_DIR)
+    ci_job_history = importlib.import_module("CI_JobHistory")
+    job = list(fake_prow.JOBS)[1]
+    start_date, end_date = datetime(2024, 10, 19), datetime(2024, 10, 1)
+    assert ci_job_history.sync_ci(store, "4.15 powervs", job, end_date) > 0
+
+    def totals():
+        ci_summary = monitor.detailed_ci_summary("4.15 powervs", monitor.get_jobs_with_date(job, start_date, end_date), zone, job_filter)
+        builds = [(build["build_id"], build["filtered"], build["zone_mismatch"]) for build in ci_summary["builds"]]
+        return builds, ci_summary["total"], ci_summary["deploys_succeeded"], ci_summary["e2e_succeeded"]
+
+    live = totals()
+    monkeypatch.setattr(monitor, "BUILD_STORE", store)
+    assert totals() == live
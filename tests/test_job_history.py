@@ -0,0 +1,75 @@
+import json
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+import job_history
+import monitor
+
+
+def soup_all_builds(text):
+
+    '''
+    allBuilds of a job history page as the listing functions of monitor.py extracted it with BeautifulSoup.
+    '''
+
+    soup = BeautifulSoup(text, 'html.parser')
+    for script_element in soup.find_all('script'):
+        script_content = script_element.string
+        if script_content and 'allBuilds' in script_content:
+            match = re.search(r'allBuilds\s*=\s*(.*?);', script_content)
+            return json.loads(match.group(1))
+    return None
+
+
+def soup_next_page_link(text):
+
+    '''
+    Older runs page of a job history page as get_jobs_with_date extracted it with BeautifulSoup.
+    '''
+
+    soup = BeautifulSoup(text, 'html.parser')
+    next_link_match = re.search(r'/job[^>"]*', str(soup.find_all('td')))
+    if next_link_match is None:
+        return None
+    build_match = re.search(r"/([^/?]+)\?.+", next_link_match.group())
+    return build_match.group() if build_match else None
+
+
+@pytest.mark.parametrize("name", ["job_history.html", "job_history_last.html"])
+def test_parse_page_builds_match_soup_extraction(read_fixture, name):
+    raw = read_fixture(name)
+    page = job_history.parse_page(raw)
+    expected = soup_all_builds(raw.decode())
+    assert [(build.id, build.spylink, build.started, build.result) for build in page.builds] == [
+        (ele["ID"], ele["SpyglassLink"], monitor.parse_job_date(ele["Started"]), ele["Result"]) for ele in expected]
+
+
+def test_parse_page_older_link_matches_soup_extraction(read_fixture):
+    raw = read_fixture("job_history.html")
+    page = job_history.parse_page(raw)
+    assert page.older_link.startswith("/job-history/gs/origin-ci-test/logs/")
+    assert monitor._next_page_link(page.older_link) == soup_next_page_link(raw.decode())
+    assert monitor._next_page_link(page.older_link).endswith("?buildId=" + page.builds[-1].id)
+
+
+def test_parse_page_last_page_has_no_older_link(read_fixture):
+    page = job_history.parse_page(read_fixture("job_history_last.html"))
+    assert page.older_link is None
+    assert monitor._next_page_link(page.older_link) is None
+
+
+def test_parse_page_skips_other_mentions_of_all_builds(read_fixture):
+    raw = read_fixture("job_history.html").replace(
+        b'var csrfToken = "";', b'// allBuilds is set below, see job-history_bundle = the renderer\n    var csrfToken = "";')
+    assert job_history.parse_page(raw) == job_history.parse_page(read_fixture("job_history.html"))
+
+
+def test_parse_page_without_builds():
+    assert job_history.parse_page(b"<html><body>No builds</body></html>") is None
+
+
+def test_parse_page_malformed_builds():
+    with pytest.raises(json.JSONDecodeError):
+        job_history.parse_page(b'<script>var allBuilds = [{"ID": };</script>')
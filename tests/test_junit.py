@@ -0,0 +1,66 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import junit
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def tree_failed_testcases(content):
+
+    '''
+    Failed testcases as get_junit_symptom_detection_testcase_failures read them from the whole document.
+    '''
+
+    root = ET.fromstring(content)
+    return [testcase.get('name') for testcase in root.findall('.//testcase') if testcase.find('failure') is not None]
+
+
+def tree_failed_monitor_testcases(content):
+
+    '''
+    Failed monitor testcases as get_failed_monitor_testcases_from_xml read them from the whole document.
+    '''
+
+    failed = []
+    root = ET.fromstring(content)
+    for idx, testcase in enumerate(root.iter('testcase')):
+        if testcase.find('failure') is not None:
+            current_name = testcase.get('name')
+            next_testcase = root[idx+1] if idx+1 < len(root) else None
+            prev_testcase = root[idx-1] if idx-1 >= 0 else None
+            if next_testcase is not None and next_testcase.get('name') != current_name and prev_testcase is not None and prev_testcase.get('name') != current_name:
+                failed.append(current_name)
+    return failed
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 1 << 20])
+def test_failed_testcases_match_tree(read_fixture, chunk_size):
+    content = read_fixture("junit_symptoms.xml")
+    failed = list(junit.iter_failed_testcases(chunked(content, chunk_size)))
+    assert failed == tree_failed_testcases(content)
+    assert failed == ["Kubelet did not start", "Undiagnosed panic detected in pod"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 1 << 20])
+def test_failed_monitor_testcases_match_tree(read_fixture, chunk_size):
+    content = read_fixture("e2e-monitor-tests.xml")
+    failed = list(junit.iter_failed_monitor_testcases(chunked(content, chunk_size)))
+    assert failed == tree_failed_monitor_testcases(content)
+    assert len(failed) > 0
+
+
+def test_failed_monitor_testcases_with_properties_match_tree(read_fixture):
+    # Children of the root which are not testcases shift the neighbours the testcases are compared with.
+    content = read_fixture("e2e-monitor-tests.xml").replace(
+        b'time="4022">', b'time="4022"><property name="TestVersion" value="4.16.0"></property>', 1)
+    assert b"<property" in content
+    assert list(junit.iter_failed_monitor_testcases(chunked(content, 64))) == tree_failed_monitor_testcases(content)
+
+
+def test_malformed_document():
+    with pytest.raises(ET.ParseError):
+        list(junit.iter_failed_testcases([b"<testsuite><testcase name='a'>", b"</testsuite>"]))
@@ -0,0 +1,133 @@
+import collections
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import fake_prow
+import monitor
+import report
+import report_server
+
+CONFIG = {"4.16 libvirt": list(fake_prow.JOBS)[0], "4.15 powervs": list(fake_prow.JOBS)[1]}
+
+
+@pytest.fixture(scope="module")
+def server(prow):
+    with pytest.MonkeyPatch.context() as patch:
+        # generate_daily_report sets the Prow url and loads the CIs of the job type.
+        patch.setattr(monitor, "set_prow_url", lambda job_type: monitor.PROW_URL)
+        patch.setattr(monitor, "load_config", lambda config_file: CONFIG)
+        patch.setattr(report_server, "CONFIG_DATA", CONFIG)
+        patch.setattr(report_server, "REPORTS", report_server.ReportCache(3600))
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), report_server.ReportHandler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        yield "http://127.0.0.1:{}".format(httpd.server_address[1])
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def get(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def get_json(url):
+    status, _, body = get(url)
+    return status, json.loads(body)
+
+
+def expected_results(data):
+    return json.loads(json.dumps(data))
+
+
+def test_report_cache_expiry_clears_the_run_caches(monkeypatch):
+    monkeypatch.setattr(monitor, "_build_log_results", collections.OrderedDict())
+    cache = report_server.ReportCache(0)
+    computed = []
+    monitor._remember_build_log("/view/gs/origin-ci-test/logs/job/1", {"analysis": {"lease": "syd04"}, "complete": False})
+    _, body, _ = cache.get(("/",), lambda: computed.append(1) or {"builds": 1})
+    assert body == b'{\n "builds": 1\n}'
+    assert monitor._build_log_results == {}
+    cache.get(("/",), lambda: computed.append(1) or {"builds": 1})
+    assert computed == [1, 1]
+
+
+def test_index_lists_the_endpoints(server):
+    status, data = get_json(server + "/")
+    assert status == 200
+    assert data["endpoints"] == ["/brief", "/detailed", "/frequency", "/nightly"]
+    assert isinstance(data["probes"], dict)
+
+
+def test_unknown_endpoint(server):
+    assert get_json(server + "/weekly") == (404, {"error": "Unknown endpoint /weekly"})
+
+
+@pytest.mark.parametrize("path, error", [
+    ("/frequency?builds=x", "builds must be an integer"),
+    ("/frequency?builds=0", "builds must be at least 1"),
+    ("/nightly", "image is required"),
+    ("/nightly?image=", "image is required"),
+])
+def test_invalid_arguments(server, path, error):
+    assert get_json(server + path) == (400, {"error": error})
+
+
+@pytest.mark.parametrize("info_type, query, zone, job_filter", [
+    ("brief", "", None, "All"),
+    ("brief", "?zone=mad02,syd04&job_install_status=failure", ("mad02", "syd04"), "failure"),
+    ("detailed", "?job_install_status=success", None, "success"),
+])
+def test_daily_reports(server, info_type, query, zone, job_filter):
+    status, data = get_json(server + "/" + info_type + query)
+    assert status == 200
+    assert (data["report"], data["job_type"]) == (info_type, "p")
+    rows = report.generate_daily_report("p", info_type, zone, job_filter).rows
+    assert rows
+    assert data["results"] == expected_results(rows)
+    if info_type == "detailed":
+        assert [ci_summary["ci"] for ci_summary in data["results"]] == list(CONFIG)
+        assert {"build_id", "job_link", "filtered", "zone_mismatch", "report"} <= set(data["results"][0]["builds"][0])
+
+
+def test_frequency_report(server):
+    status, data = get_json(server + "/frequency?builds=5")
+    assert status == 200
+    assert data["report"] == "frequency"
+    assert list(data["results"]) == list(CONFIG)
+    for ci_name, ci_link in CONFIG.items():
+        expected = monitor.get_testcase_frequency(monitor.get_n_recent_jobs(ci_link, 5))
+        assert data["results"][ci_name] == expected_results(expected)
+
+
+def test_nightly_report(server):
+    build = monitor.get_n_recent_jobs(CONFIG["4.16 libvirt"], 5)[-1]
+    _, nightly = monitor.get_quota_and_nightly(build)
+    image = nightly.split(":")[-1]
+    status, data = get_json(server + "/nightly?image=" + image)
+    assert status == 200
+    libvirt, powervs = data["results"]
+    assert libvirt["ci"] == "4.16 libvirt" and powervs["ci"] == "4.15 powervs"
+    assert build.build_id in [build_info["build_id"] for build_info in libvirt["builds"]]
+    assert powervs["builds"] == []
+
+
+def test_etag_revalidation(server):
+    status, headers, body = get(server + "/frequency?builds=3")
+    assert status == 200
+    etag = headers["ETag"]
+    assert headers["Content-Type"] == "application/json" and headers["Last-Modified"]
+    for if_none_match in (etag, "W/" + etag, '"other", ' + etag):
+        status, headers, body = get(server + "/frequency?builds=3", {"If-None-Match": if_none_match})
+        assert (status, headers["ETag"], body) == (304, etag, b"")
+    status, _, body = get(server + "/frequency?builds=3", {"If-None-Match": '"other"'})
+    assert status == 200 and body
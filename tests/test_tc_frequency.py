@@ -0,0 +1,56 @@
+import numpy as np
+
+from tc_frequency import FailureMatrix
+
+FAILURES = [
+    ("b5", {"conformance": ["tc-a", "tc-b"], "monitor": ["tc-a"]}),
+    ("b4", {}),
+    ("b3", {"conformance": ["tc-b"], "symptom_detection": ["tc-c"]}),
+    ("b2", {"conformance": ["tc-a"]}),
+    ("b1", {"monitor": ["tc-b"]}),
+]
+LABELS = {"ci": ["4.16 libvirt"] * 5, "zone": ["syd04", "syd05", "syd04", None, "syd05"]}
+
+
+def dict_frequency(failures):
+
+    '''
+    Testcase frequency as the dict loop of get_testcase_frequency counted it.
+    '''
+
+    frequency = {}
+    for _, failed_tc in failures:
+        for testcases in failed_tc.values():
+            for tc in testcases:
+                frequency[tc] = frequency.get(tc, 0) + 1
+    return dict(sorted(frequency.items(), key=lambda item: item[1], reverse=True))
+
+
+def test_frequency_matches_dict_loop():
+    matrix = FailureMatrix.from_failures(FAILURES, LABELS)
+    assert list(matrix.frequency().items()) == list(dict_frequency(FAILURES).items())
+    assert matrix.frequency(distinct=True) == {"tc-a": 2, "tc-b": 3, "tc-c": 1}
+    assert matrix.frequency(["tc-c", "tc-a", "tc-x"]) == {"tc-c": 1, "tc-a": 3}
+
+
+def test_frequency_min_count():
+    matrix = FailureMatrix.from_failures(FAILURES, LABELS)
+    expected = {tc: count for tc, count in dict_frequency(FAILURES).items() if count >= 3}
+    assert matrix.frequency(min_count=3) == expected
+    assert matrix.frequency(["tc-c", "tc-b"], min_count=2) == {"tc-b": 3}
+
+
+def test_frequency_by_zone():
+    matrix = FailureMatrix.from_failures(FAILURES, LABELS)
+    assert matrix.frequency_by("zone") == {
+        "syd04": {"tc-a": 2, "tc-b": 2, "tc-c": 1},
+        "syd05": {"tc-b": 1},
+        "None": {"tc-a": 1},
+    }
+    assert matrix.frequency_by("ci", ["tc-c"]) == {"4.16 libvirt": {"tc-c": 1}}
+
+
+def test_window_counts():
+    matrix = FailureMatrix.from_failures(FAILURES, LABELS)
+    np.testing.assert_array_equal(matrix.window_counts(["tc-a", "tc-b"], 2), [[1, 1], [0, 1], [1, 1], [1, 1]])
+    np.testing.assert_array_equal(matrix.window_counts(["tc-b", "tc-x"], 10), [[3, 0]])
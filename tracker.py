@@ -25,20 +25,48 @@ def filter_latest_ci_lv1(config_data,n_build):
         updated_ci_dict[ci_name] = final_tc_failure_jobs
     return updated_ci_dict
 
-def get_tc_frequency(tc_list,frequency):
-    li=monitor.get_testcase_frequency(tc_list)
-    filtered_dict = {key: value for key, value in li.items() if value >=frequency }
-    return filtered_dict
+def get_tc_frequency(failure_matrix,frequency):
+    return failure_matrix.frequency(min_count=frequency)
+
+def get_tc_breakdown(failure_matrix,tc_names,by_zone,window):
+    """
+    Breaks the failures of the reported testcases down by zone and by window of consecutive builds.
+
+    Args:
+        failure_matrix (FailureMatrix): Failures of the builds of a CI.
+        tc_names (list): Reported testcases.
+        by_zone (bool): Count the failures per zone/lease of the builds.
+        window (int): Number of consecutive builds counted together, None to skip.
+
+    Returns:
+        dict: Zone and the frequency dict of its builds, empty unless by_zone.
+        dict: Testcase and its most failures in window consecutive builds, None unless window.
+    """
+    zone_frequency = failure_matrix.frequency_by("zone", tc_names) if by_zone else {}
+    window_counts = None
+    if window:
+        counts = failure_matrix.window_counts(tc_names, window).max(axis=0)
+        window_counts = dict(zip(tc_names, counts.tolist()))
+    return zone_frequency, window_counts
+
+def print_tc_breakdown(testcase,zone_frequency,window_counts,window):
+    for zone,frequency in zone_frequency.items():
+        if testcase in frequency:
+            print("   {}: failed {} times".format(zone, frequency[testcase]))
+    if window_counts is not None:
+        print("   Failed in at most {} of {} consecutive builds".format(window_counts[testcase], window))
 
 def main():
     parser = argparse.ArgumentParser(description='Get the daily buid updates')
-    parser.add_argument('--builds', type=int, default=10, help='Number of recent builds to check for test failure occurrence. Please provide any value in the range of 2 to 20')
+    parser.add_argument('--builds', type=int, default=10, help='Number of recent builds to check for test failure occurrence. Please provide a value of at least 2')
     parser.add_argument('--frequency', type=int, default=3, help='Minimum count of test failure occurrence. Please provide any value in the range of 2 to 20')
     parser.add_argument('--job_type', default='p', choices=['p','z','pa'], help='Specify the CI job type (Power(p) or s390x(z) or Power Auxillary(pa)), default is p')
+    parser.add_argument('--by_zone', action='store_true', help='Break the failures of every reported testcase down by the zone/lease of the builds')
+    parser.add_argument('--window', type=int, help='Report the most failures of every reported testcase in this many consecutive builds')
     args = parser.parse_args()
 
-    if not 2 <= args.builds <= 20:
-        parser.error("Number of recent builds to check for testcase failure occurrence must be in the range of 2 to 20")
+    if args.builds < 2:
+        parser.error("Number of recent builds to check for testcase failure occurrence must be at least 2")
     else:
         n_build = args.builds
     
@@ -46,6 +74,9 @@ def main():
         parser.error("Minimum count of testcase failure occurrence must be in range of 2 to 10")
     else:
         frequency1 = args.frequency
+
+    if args.window is not None and args.window < 1:
+        parser.error("Window must be at least 1 build")
     
     if args.job_type == 'p':
         config_file = 'p_periodic.json'
@@ -63,9 +94,11 @@ def main():
         flag1=False
         flag2=False
         if len(tc_list[0]) > 0:
-            frequency_tc_list = get_tc_frequency(tc_list[0],frequency1)
+            failure_matrix = monitor.get_failure_matrix(tc_list[0], ci_name=ci_name)
+            frequency_tc_list = get_tc_frequency(failure_matrix,frequency1)
             if len(frequency_tc_list) > 0:
                 flag1=True
+                zone_frequency, window_counts = get_tc_breakdown(failure_matrix,list(frequency_tc_list),args.by_zone,args.window)
 
         if len(tc_list[1]) > 0:
             flag2=True
@@ -78,6 +111,7 @@ def main():
                 i=i+1
                 print(i,". ",testcase)
                 print("Failed in {}/{} builds".format(fail_freq, n_build))
+                print_tc_breakdown(testcase,zone_frequency,window_counts,args.window)
                 print("\n")
             for i in tc_list[1]:
                 match = re.search(pattern_job_id, i)
@@ -92,6 +126,7 @@ def main():
                 i=i+1
                 print(i,". ",testcase)
                 print("Failed in {}/{} builds".format(fail_freq, n_build))
+                print_tc_breakdown(testcase,zone_frequency,window_counts,args.window)
                 print("\n")
             print("---------------------------------------------------------------------------")
         elif (not flag1) and flag2: